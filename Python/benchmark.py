@@ -0,0 +1,248 @@
+"""Benchmark suite of the hot paths: VarDbl operators, VarDbl.ulp() of large
+ints against the bit-by-bit reference, Taylor.exp/log/sin/pow at several input
+precisions, FFT.transform per order and SinSource,
+matrix.adjugate per size, movingLineFit per FitType, and the construction of
+analytic.StatTaylor.  The timings are saved as a JSON baseline, and a later
+run is compared against the baseline to flag the regressions:
+
+    python benchmark.py run                     # saved as the baseline BASELINE_PATH
+    python benchmark.py run --filter "^Taylor" --baseline Output/benchmark.json
+    python benchmark.py run --output Output/benchmark.new.json
+    python benchmark.py compare Output/benchmark.new.json
+"""
+import argparse
+import datetime
+import functools
+import json
+import math
+import platform
+import random
+import re
+import sys
+import timeit
+import typing
+
+import sympy
+
+import analytic
+from fft import FFT
+from indexSin import OUTDIR, SinSource
+import matrix
+from movingLineFit import FitType, movingLineFit
+from taylor import Taylor
+from varDbl import VarDbl, ulpByBit
+
+BASELINE_PATH = f'{OUTDIR}/Python/Output/benchmark.json'
+THRESHOLD = 0.2
+    # the relative slowdown to be a regression
+MIN_SECONDS = 0.2
+    # the minimal total time of each repeat
+REPEAT = 5
+
+_sCase:dict[str, typing.Callable[[], typing.Callable[[], object]]] = {}
+
+
+def case(name:str):
+    '''
+    Register a benchmark of {name}, which is a function preparing the inputs and returning the call to be timed.
+    '''
+    def register(setup):
+        if name in _sCase:
+            raise ValueError(f'Duplicated benchmark {name}')
+        _sCase[name] = setup
+        return setup
+    return register
+
+
+def cases(filter:str=None) -> list[str]:
+    '''
+    The names of the benchmarks matching the regular expression {filter}
+    '''
+    pattern = re.compile(filter) if filter else None
+    return [name for name in _sCase if (pattern is None) or pattern.search(name)]
+
+
+def _register():
+    for op, call in (('add', lambda x, y: x + y), ('sub', lambda x, y: x - y),
+                     ('mul', lambda x, y: x * y), ('div', lambda x, y: x / y)):
+        case(f'VarDbl.{op}')(lambda call=call: functools.partial(call, VarDbl(1.5, 1e-3), VarDbl(2.5, 1e-3)))
+
+    for bits in (64, 1024, 16384):
+        for name, ulp in (('VarDbl.ulp', VarDbl.ulp), ('VarDbl.ulp by bit', ulpByBit)):
+            def setup(bits=bits, ulp=ulp):
+                rng = random.Random(bits)
+                sValue = [rng.getrandbits(bits) | (1 << (bits - 1)) for i in range(20)]
+                return lambda: [ulp(value) for value in sValue]
+            case(f'{name} bits={bits}')(setup)
+
+    for prec in (1e-6, 1e-3, 1e-1):
+        case(f'Taylor.exp prec={prec}')(lambda prec=prec: functools.partial(Taylor.exp, VarDbl(1, prec)))
+        case(f'Taylor.log prec={prec}')(lambda prec=prec: functools.partial(Taylor.log, VarDbl(2, 2*prec)))
+        case(f'Taylor.sin prec={prec}')(lambda prec=prec: functools.partial(Taylor.sin, VarDbl(1, prec)))
+        case(f'Taylor.pow prec={prec}')(lambda prec=prec: functools.partial(Taylor.pow, VarDbl(2, 2*prec), 0.5))
+
+    for sinSource in (SinSource.Quart, SinSource.Lib):
+        for order in (4, 6, 8):
+            def setup(sinSource=sinSource, order=order):
+                fft = FFT(sinSource)
+                rng = random.Random(order)
+                sInput = [VarDbl(rng.uniform(-1, 1), 1e-3) for i in range(2 << order)]
+                return functools.partial(fft.transform, sInput, True)
+            case(f'FFT.transform {sinSource} order={order}')(setup)
+
+    for size in (3, 4, 5, 6):
+        def setup(size=size):
+            state = random.getstate()
+            random.seed(size)
+            ssMatrix = matrix.addNoise(matrix.createIntMatrix(size, randRange=1 << 16), 1e-3)
+            random.setstate(state)
+            return functools.partial(matrix.adjugate, ssMatrix)
+        case(f'matrix.adjugate size={size}')(setup)
+
+    for fitType in (FitType.LOCAL, FitType.MOVING, FitType.MOVING_NO_VAR_ADJ):
+        def setup(fitType=fitType):
+            rng = random.Random(1)
+            sInput = [VarDbl(rng.uniform(-1, 1), 1e-3) for i in range(1000)]
+            return functools.partial(movingLineFit, sInput, 4, fitType)
+        case(f'movingLineFit {fitType.name}')(setup)
+
+    def setup():
+        x, dx, y, dy = sympy.symbols('x dx y dy')
+        sVar = (analytic.ImPrecise(x, dx, analytic.EDistrType.Gaussian),
+                analytic.ImPrecise(y, dy, analytic.EDistrType.Gaussian))
+        return functools.partial(analytic.StatTaylor, sympy.sin(x) * sympy.exp(y), sVar, 4)
+    case('analytic.StatTaylor')(setup)
+
+
+def measure(name:str, minSeconds:float=MIN_SECONDS, repeat:int=REPEAT) -> dict:
+    '''
+    Time the benchmark {name} by the best of {repeat} repeats, each of which lasts at least {minSeconds},
+        and return the record of "seconds" per call, "number" of calls per repeat and "repeat".
+    '''
+    call = _sCase[name]()
+    timer = timeit.Timer(call)
+    number = 1
+    while True:
+        seconds = timer.timeit(number)
+        if seconds >= minSeconds:
+            break
+        number = max(number * 2, math.ceil(number * minSeconds / seconds * 1.2) if seconds > 0 else number * 10)
+    sSeconds = [seconds] + timer.repeat(repeat - 1, number) if repeat > 1 else [seconds]
+    return {'seconds': min(sSeconds) / number, 'number': number, 'repeat': len(sSeconds)}
+
+
+def run(filter:str=None, minSeconds:float=MIN_SECONDS, repeat:int=REPEAT, output:str=None) -> dict:
+    '''
+    Run the benchmarks matching {filter}, and return the results, which is also saved to {output} when provided.
+    '''
+    results = {'time': datetime.datetime.now().isoformat(timespec='seconds'),
+               'python': platform.python_version(), 'machine': platform.machine(), 'platform': platform.platform(),
+               'cases': {}}
+    for name in cases(filter):
+        results['cases'][name] = measure(name, minSeconds, repeat)
+    if output:
+        save(results, output)
+    return results
+
+
+def save(results:dict, path:str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+
+
+def load(path:str) -> dict:
+    with open(path) as f:
+        results = json.load(f)
+    if not isinstance(results.get('cases'), dict):
+        raise ValueError(f'Invalid benchmark results in {path}')
+    return results
+
+
+def compare(baseline:dict, current:dict, threshold:float=THRESHOLD) -> tuple[list[tuple], list[str]]:
+    '''
+    Compare the {current} results with the {baseline} results,
+        and return the rows of (name, baseline seconds, current seconds, ratio, status) for all the names,
+        with the names of the regressions, whose ratio is more than 1 + {threshold}.
+    The status is "regression", "improvement" for the ratio less than 1/(1 + {threshold}),
+        "ok", "new" without baseline, or "missing" without current.
+    '''
+    sRow = []
+    sRegression = []
+    sBase, sCurr = baseline['cases'], current['cases']
+    for name in list(sBase) + [name for name in sCurr if name not in sBase]:
+        base = sBase[name]['seconds'] if name in sBase else None
+        curr = sCurr[name]['seconds'] if name in sCurr else None
+        if base is None:
+            sRow.append((name, base, curr, None, 'new'))
+            continue
+        if curr is None:
+            sRow.append((name, base, curr, None, 'missing'))
+            continue
+        ratio = curr / base if base > 0 else math.inf
+        if ratio > 1 + threshold:
+            status = 'regression'
+            sRegression.append(name)
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        sRow.append((name, base, curr, ratio, status))
+    return sRow, sRegression
+
+
+def report(sRow:list[tuple]) -> str:
+    sLine = ['Name\tBaseline\tCurrent\tRatio\tStatus\n']
+    for name, base, curr, ratio, status in sRow:
+        sLine.append(f'{name}\t{"" if base is None else f"{base:.6g}"}\t{"" if curr is None else f"{curr:.6g}"}'
+                     f'\t{"" if ratio is None else f"{ratio:.3f}"}\t{status}\n')
+    return ''.join(sLine)
+
+
+def main(sArg:list[str]=None) -> int:
+    '''
+    The command line, which returns 1 when any regression is found, otherwise 0.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmarks with JSON baselines')
+    sCommand = parser.add_subparsers(dest='command', required=True)
+    cmdList = sCommand.add_parser('list', help='list the benchmarks')
+    cmdList.add_argument('--filter', help='regular expression of the benchmark names')
+    cmdRun = sCommand.add_parser('run', help='run the benchmarks')
+    cmdRun.add_argument('--filter', help='regular expression of the benchmark names')
+    cmdRun.add_argument('--output', help=f'the JSON file of the results, by default {BASELINE_PATH} without --baseline')
+    cmdRun.add_argument('--baseline', help='the JSON file of the baseline to compare with')
+    cmdRun.add_argument('--threshold', type=float, default=THRESHOLD, help='the relative slowdown of a regression')
+    cmdRun.add_argument('--min-seconds', type=float, default=MIN_SECONDS, help='the minimal time of each repeat')
+    cmdRun.add_argument('--repeat', type=int, default=REPEAT, help='the count of repeats')
+    cmdCompare = sCommand.add_parser('compare', help='compare the results with a baseline')
+    cmdCompare.add_argument('current', help='the JSON file of the results')
+    cmdCompare.add_argument('--baseline', default=BASELINE_PATH, help=f'the JSON file of the baseline, by default {BASELINE_PATH}')
+    cmdCompare.add_argument('--threshold', type=float, default=THRESHOLD, help='the relative slowdown of a regression')
+    args = parser.parse_args(sArg)
+
+    match args.command:
+        case 'list':
+            print('\n'.join(cases(args.filter)))
+            return 0
+        case 'run':
+            baseline = load(args.baseline) if args.baseline else None
+            current = run(args.filter, args.min_seconds, args.repeat, 
+                          args.output if (args.output or baseline) else BASELINE_PATH)
+            if not baseline:
+                print(report(compare({'cases': {}}, current)[0]), end='')
+                return 0
+        case 'compare':
+            baseline, current = load(args.baseline), load(args.current)
+    sRow, sRegression = compare(baseline, current, args.threshold)
+    print(report(sRow), end='')
+    if sRegression:
+        print(f'{len(sRegression)} regressions: {", ".join(sRegression)}', file=sys.stderr)
+        return 1
+    return 0
+
+
+_register()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,15 +3,21 @@ sequences using IndexSin for trig accuracy. Defines FFT_Signal/FFT_Order/
 FFT_Step harness and SignalType/NoiseType/TestType enums for analysis runs.
 """
 
+import contextlib
 import datetime
 import enum
+import json
 import math
 import os
 import random
 import shutil
+import sys
+import time
 import typing
 import unittest
 
+import numpy
+
 from indexSin import SinSource, IndexSin
 from interval import Interval
 import histo
@@ -57,6 +63,9 @@ class FFT:
     order + 4: error
     '''
 
+    MAX_BIT_REVERSED_ORDERS = 4
+        # the count of the cached bit reversed indices, as a sweep changes the order slowly
+
     _bitReversedIndex = {}
 
     def __init__(self, sinSource:SinSource):
@@ -68,6 +77,7 @@ class FFT:
         '''
         Return bit reversed indices
         from NumericalRecipesinC.pdf
+        Only the latest FFT.MAX_BIT_REVERSED_ORDERS orders are cached.
         '''
         if sRes := FFT._bitReversedIndex.get(order):
             return sRes
@@ -83,6 +93,8 @@ class FFT:
                 k >>= 1
             j += k
         sRes = tuple(sRes)
+        while len(FFT._bitReversedIndex) >= FFT.MAX_BIT_REVERSED_ORDERS:
+            FFT._bitReversedIndex.pop(next(iter(FFT._bitReversedIndex)), None)
         FFT._bitReversedIndex[order] = sRes
         return sRes
     
@@ -91,6 +103,10 @@ class FFT:
         FFT over T in {VarDbl, Interval}.  Same butterfly body for both;
         traceSteps is honored only when sInput[0] is a VarDbl.
         sInput: array of size (2<<order), interleaved (real, imag) pairs.
+        traceSteps: 
+         *) True: copy every step to self.ssStep.
+         *) A callable such as FFT_Trace: call traceSteps(step, sData) for every step without copying,
+            in which sData is only valid during the call.
         '''
         order = IndexSin.validateSize(len(sInput) >> 1)
         size = 1 << order
@@ -107,22 +123,26 @@ class FFT:
 
         sRes = [zero] * (size << 1)
         self.ssStep = []
-        if traceSteps:
-            self.ssStep.append(tuple([varDbl.VarDbl(var) for var in sInput]))
+        if traceSteps is True:
+            trace = lambda step, sData: self.ssStep.append(tuple([varDbl.VarDbl(var) for var in sData]))
+        else:
+            trace = traceSteps
+        if trace:
+            trace(0, sInput)
 
         sIndex = FFT.bitReversedIndices(order)
         for i in range(len(sIndex)):
             j = sIndex[i]
             sRes[i << 1], sRes[(i << 1) + 1] = sInput[j << 1], sInput[(j << 1) + 1]
-        if traceSteps:
-            self.ssStep.append(tuple([varDbl.VarDbl(var) for var in sRes]))
+        if trace:
+            trace(1, sRes)
 
         for i in range(0, len(sIndex), 2):
             j = i << 1
             sRes[j], sRes[j + 2] = sRes[j] + sRes[j + 2], sRes[j] - sRes[j + 2]
             sRes[j + 1], sRes[j + 3] = sRes[j + 1] + sRes[j + 3], sRes[j + 1] - sRes[j + 3]
-        if traceSteps:
-            self.ssStep.append(tuple([varDbl.VarDbl(var) for var in sRes]))
+        if trace:
+            trace(2, sRes)
 
         for o in range(1, order):
             k = 2 << o
@@ -136,18 +156,114 @@ class FFT:
                     id = sRes[i1] * sin + sRes[i1 + 1] * cos
                     sRes[i0], sRes[i1] = sRes[i0] + rd, sRes[i0] - rd
                     sRes[i0 + 1], sRes[i1 + 1] = sRes[i0 + 1] + id, sRes[i0 + 1] - id
-            if traceSteps:
-                self.ssStep.append(tuple([varDbl.VarDbl(var) for var in sRes]))
+            if trace:
+                trace(o + 2, sRes)
 
         if not forward:
             sz = 1/len(sIndex)
             for i in range(len(sRes)):
                 sRes[i] = sRes[i] * sz
-        if traceSteps:
-            self.ssStep.append(tuple([varDbl.VarDbl(var) for var in sRes]))
+        if trace:
+            trace(order + 2, sRes)
+        return sRes
+
+    def transformReal(self, sInput, forward:bool):
+        '''
+        FFT of a real signal over T in {VarDbl, Interval}, with the same output as transform().
+        sInput: array of size (2<<order), interleaved (real, imag) pairs, whose imaginary parts are assumed zero and not read.
+
+        The real signal x[] is packed as the complex signal z[n] = x[2n] + i x[2n+1] of half size, so that
+            Z[k] = E[k] + i O[k] for the spectrums E[] and O[] of the even and odd x[].
+        The split step X[k] = (E[k] + w^k O[k]) is expanded so that each component of Z[k] and Z[half - k] 
+            appears only once in each output:
+            Re(X[k]) = (a (1 + sin) + c (1 - sin) + (b + d) cos) / 2
+            Im(X[k]) = (b (1 + sin) - d (1 - sin) + (c - a) cos) / 2
+            in which Z[k] = a + i b, Z[half - k] = c + i d, and w^k = cos + i sin.
+        Z[k] and Z[half - k] come from the same packed input, so that they are correlated,
+            while VarDbl adds them as if independent.
+        So the result uncertainty is not exact, but it matches the propagation of transform(),
+            which makes the same independence assumption between its butterfly terms.
+        The upper half of the spectrum is the conjugate of the lower half.
+        '''
+        order = IndexSin.validateSize(len(sInput) >> 1)
+        if order < IndexSin.MIN_ORDER + 1:
+            return self.transform(sInput, forward)
+        size = 1 << order
+        half = size >> 1
+        if isinstance(sInput[0], Interval):
+            zero = Interval(0.0)
+            wrap = Interval.from_varDbl
+        else:
+            zero = varDbl.VarDbl(0)
+            wrap = lambda v: v
+        scale = 0.5 if forward else 0.25
+
+        sZ = self.transform(sInput[::2], forward)
+        sRes = [zero] * (size << 1)
+        a, b = sZ[0], sZ[1]
+        sRes[0] = a + b if forward else (a + b) * 0.5
+        sRes[size] = a - b if forward else (a - b) * 0.5
+        a, b = sZ[half], sZ[half + 1]
+        sRes[half], sRes[half + 1] = (a, b) if forward else (a * 0.5, - b * 0.5)
+        sRes[(size << 1) - half], sRes[(size << 1) - half + 1] = sRes[half], - sRes[half + 1]
+        for k in range(1, half):
+            if (k << 1) == half:
+                continue
+            a, b = sZ[k << 1], sZ[(k << 1) + 1]
+            c, d = sZ[(half - k) << 1], sZ[((half - k) << 1) + 1]
+            cos = wrap(self.idxSin.cos(k, order - 1))
+            sin = wrap(self.idxSin.sin(k if forward else -k, order - 1))
+            sRes[k << 1] = (a * (1 + sin) + c * (1 - sin) + (b + d) * cos) * scale
+            sRes[(k << 1) + 1] = (b * (1 + sin) - d * (1 - sin) + (c - a) * cos) * scale
+            sRes[(size - k) << 1] = sRes[k << 1]
+            sRes[((size - k) << 1) + 1] = - sRes[(k << 1) + 1]
         return sRes
     
 
+class FFT_Trace:
+    '''
+    A sink for FFT.transform(traceSteps=...), which keeps only
+     *) the steps in {sStep}, or all steps if {sStep} is None,
+     *) the indices of the interleaved (real, imag) data in {sIndex}, or all indices if {sIndex} is None.
+    The kept data is in self.ssStep as {step: tuple[VarDbl]}.
+    '''
+
+    def __init__(self, sStep=None, sIndex=None):
+        self.sStep = None if sStep is None else frozenset(sStep)
+        self.sIndex = None if sIndex is None else tuple(sIndex)
+        self.ssStep = {}
+
+    def __call__(self, step:int, sData):
+        if (self.sStep is not None) and (step not in self.sStep):
+            return
+        self.record(step, sData if self.sIndex is None else [sData[i] for i in self.sIndex])
+
+    def record(self, step:int, sData):
+        self.ssStep[step] = tuple([varDbl.VarDbl(var) for var in sData])
+
+
+class FFT_TraceWriter (FFT_Trace):
+    '''
+    A FFT_Trace which writes each kept step as a line to the file writer {fw}, instead of keeping it.
+    The line is the step followed by the value and the uncertainty of each kept index.
+    '''
+
+    def __init__(self, fw, sStep=None, sIndex=None):
+        super().__init__(sStep, sIndex)
+        self.fw = fw
+
+    @staticmethod
+    def header(sIndex:tuple[int]) -> str:
+        return 'Step\t' + '\t'.join([f'{i} Value\t{i} Uncertainty' for i in sIndex]) + '\n'
+
+    def record(self, step:int, sData):
+        self.fw.write(f'{step}')
+        for var in sData:
+            var = varDbl.VarDbl(var)
+            self.fw.write(f'\t{var.value()}\t{var.uncertainty()}')
+        self.fw.write('\n')
+
+
 class Measure:
     def __init__(self, divids=5, devs=3) -> None:
         self.sUncStat = {t: histo.Stat() for t in TestType}
@@ -233,12 +349,322 @@ class FFT_Signal (FFT):
 
 
 
+class FFT_Order_Index:
+    '''
+    Key index of a FFT_Order dump file {dumpPath}, saved as {dumpPath}.idx when {write} is true.
+
+    Each line of the dump file is keyed by (order, sinSource, noiseType, noise, signalType, freq, test),
+        and the index keeps the byte offset of the first line for the key, so that
+     *) FFT_Order.dump() appends a line and its key in O(1),
+     *) FFT_Order.dump() checks for an existing calculation by key lookup,
+     *) FFT_Order.compare() reads only the matched lines from two dump files.
+    The index is rebuilt from the dump file when it is missing or out of date,
+        which is only saved when {write} is true, so that reading a dump file never writes next to it.
+    '''
+    HEADER = 'Order\tSinSource\tNoiseType\tNoise\tSignal\tFreq\tTest\tOffset\n'
+
+    def __init__(self, dumpPath:str, write=False):
+        self.dumpPath = dumpPath
+        self.indexPath = FFT_Order_Index.path(dumpPath)
+        self.write = write
+        self.sOffset = {}
+        self.lastKey = None
+        self._fr = None
+        self._fw = None
+        if not os.path.isfile(dumpPath):
+            if write and os.path.isfile(self.indexPath):
+                os.remove(self.indexPath)
+            return
+        if not self._load():
+            self._rebuild()
+
+    @staticmethod
+    def path(dumpPath:str) -> str:
+        return dumpPath + '.idx'
+
+    @staticmethod
+    def remove(dumpPath:str):
+        if os.path.isfile(FFT_Order_Index.path(dumpPath)):
+            os.remove(FFT_Order_Index.path(dumpPath))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.sOffset)
+
+    def __contains__(self, key:tuple) -> bool:
+        return key in self.sOffset
+
+    def close(self):
+        if self._fr:
+            self._fr.close()
+            self._fr = None
+        if self._fw:
+            self._fw.close()
+            self._fw = None
+
+    def _load(self) -> bool:
+        '''
+        Load the index file, and return False if it is missing or does not match the dump file.
+        '''
+        if not os.path.isfile(self.indexPath):
+            return False
+        try:
+            with open(self.indexPath) as f:
+                if next(f) != FFT_Order_Index.HEADER:
+                    return False
+                for line in f:
+                    sWord = line.rstrip('\n').split('\t')
+                    key = (int(sWord[0]), SinSource(sWord[1]), NoiseType(sWord[2]), float(sWord[3]),
+                           SignalType(sWord[4]), int(sWord[5]), TestType(sWord[6]))
+                    self.sOffset.setdefault(key, int(sWord[7]))
+                    self.lastKey = key
+        except (StopIteration, ValueError, IndexError):
+            self.sOffset = {}
+            self.lastKey = None
+            return False
+        if not self.sOffset:
+            return os.path.getsize(self.dumpPath) == self._titleSize()
+        # the last indexed line should be the last line of the dump file
+        with open(self.dumpPath, 'rb') as f:
+            f.seek(max(self.sOffset.values()))
+            line = f.readline()
+            if f.tell() != os.path.getsize(self.dumpPath):
+                self.sOffset = {}
+                self.lastKey = None
+                return False
+        try:
+            if FFT_Order_Index.key(line.decode(), 0, self.dumpPath) != self.lastKey:
+                raise ValueError
+        except (RuntimeError, ValueError):
+            self.sOffset = {}
+            self.lastKey = None
+            return False
+        return True
+
+    def _titleSize(self) -> int:
+        with open(self.dumpPath, 'rb') as f:
+            f.readline()
+            return f.tell()
+
+    def _rebuild(self):
+        '''
+        Index the dump file in memory, and save the index file when {self.write} is true.
+        '''
+        self.sOffset = {}
+        self.lastKey = None
+        with open(self.dumpPath, 'rb') as f, \
+                open(self.indexPath, 'w') if self.write else contextlib.nullcontext() as fw:
+            if fw:
+                fw.write(FFT_Order_Index.HEADER)
+            hdr = f.readline().decode()
+            if not hdr:
+                return
+            if not FFT_Order.is_title(hdr, self.dumpPath):
+                raise RuntimeError(f'Invalid title line in {self.dumpPath}: {hdr}')
+            ln = 0
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                key = FFT_Order_Index.key(line.decode(), ln, self.dumpPath)
+                if key not in self.sOffset:
+                    self.sOffset[key] = offset
+                    if fw:
+                        fw.write(FFT_Order_Index.line(key, offset))
+                self.lastKey = key
+                ln += 1
+
+    @staticmethod
+    def key(line:str, ln:int, dumpPath:str) -> tuple[int, SinSource, NoiseType, float, SignalType, int, TestType]:
+        sinSource,noiseType,noise,signalType,order,freq,test = FFT_Order.readLine(line, ln, dumpPath)
+        return (order, sinSource, noiseType, noise, signalType, freq, test)
+
+    @staticmethod
+    def line(key:tuple, offset:int) -> str:
+        return '\t'.join([f'{k}' for k in key]) + f'\t{offset}\n'
+
+    def clear(self):
+        '''
+        Empty the index when the dump file is rewritten from the beginning.
+        '''
+        if not self.write:
+            raise RuntimeError(f'Invalid clearing of read-only {self.indexPath}')
+        self.close()
+        self.sOffset = {}
+        self.lastKey = None
+        with open(self.indexPath, 'w') as fw:
+            fw.write(FFT_Order_Index.HEADER)
+
+    def append(self, key:tuple, offset:int):
+        '''
+        Add {key} for the line starting at {offset} of the dump file.
+        '''
+        if not self.write:
+            raise RuntimeError(f'Invalid appending to read-only {self.indexPath}')
+        self.lastKey = key
+        if key in self.sOffset:
+            return
+        self.sOffset[key] = offset
+        if not self._fw:
+            if not os.path.isfile(self.indexPath):
+                with open(self.indexPath, 'w') as fw:
+                    fw.write(FFT_Order_Index.HEADER)
+            self._fw = open(self.indexPath, 'a')
+        self._fw.write(FFT_Order_Index.line(key, offset))
+
+    def flush(self):
+        if self._fw:
+            self._fw.flush()
+
+    def hasAggr(self, order:int, sinSource:SinSource, noiseType:NoiseType, noise:float) -> bool:
+        '''
+        If the aggregated result for all tests has been dumped
+        '''
+        return all([(order, sinSource, noiseType, noise, SignalType.Aggr, 0, test) in self.sOffset
+                    for test in TestType])
+
+    def keys(self, filterSignalType:SignalType=None, filterFreq:int=None):
+        return [key for key in self.sOffset
+                if ((filterSignalType is None) or (key[4] == filterSignalType)) and
+                   ((filterFreq is None) or (key[5] == filterFreq))]
+
+    def readLine(self, key:tuple) -> str:
+        '''
+        Read the dump line for {key} by seeking to its offset.
+        '''
+        if not self._fr:
+            self._fr = open(self.dumpPath, 'rb')
+        self._fr.seek(self.sOffset[key])
+        line = self._fr.readline().decode()
+        if FFT_Order_Index.key(line, 0, self.dumpPath) != key:
+            raise RuntimeError(f'Invalid index {self.sOffset[key]} for {key} in {self.indexPath}: {line}')
+        return line
+
+
+class FFT_Timing:
+    '''
+    Durations of the phases of FFT_Order for each (order, sinSource, noiseType, noise), 
+        which FFT_Order.dump() appends as JSON lines to {dumpPath}.time.jsonl.
+
+    The phases are:
+     *) "signal": generating the FFT_Signal and the noisy inputs,
+     *) "varDbl": the FFT transforms of VarDbl,
+     *) "interval": the FFT transforms of Interval,
+     *) "measure": accumulating the measures,
+     *) "write": writing the dump file and its index.
+    Each record also contains the count of FFT_Order.calc() as "calcs", 
+        and the current and the peak resident memory in bytes as "rss" and "maxRss".
+    '''
+    PHASES = ('signal', 'varDbl', 'interval', 'measure', 'write')
+
+    def __init__(self):
+        self.sSeconds = dict.fromkeys(FFT_Timing.PHASES, 0.0)
+        self.calcs = 0
+
+    @staticmethod
+    def path(dumpPath:str) -> str:
+        return dumpPath + '.time.jsonl'
+
+    @contextlib.contextmanager
+    def phase(self, name:str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sSeconds[name] += time.perf_counter() - start
+
+    def record(self, order:int, sinSource:SinSource, noiseType:NoiseType, noise:float) -> dict:
+        rss, maxRss = FFT_Timing.rss()
+        return {'time': datetime.datetime.now().isoformat(), 
+                'order': order, 'sinSource': str(sinSource), 'noiseType': str(noiseType), 'noise': noise,
+                'calcs': self.calcs, 'seconds': dict(self.sSeconds), 'total': sum(self.sSeconds.values()),
+                'rss': rss, 'maxRss': maxRss}
+
+    def dump(self, fw, order:int, sinSource:SinSource, noiseType:NoiseType, noise:float):
+        fw.write(json.dumps(self.record(order, sinSource, noiseType, noise)) + '\n')
+        fw.flush()
+
+    @staticmethod
+    def rss() -> tuple[int, int]:
+        '''
+        The current and the peak resident memory of this process in bytes, or None if unknown on the platform.
+        '''
+        rss = maxRss = None
+        try:
+            with open('/proc/self/statm') as f:
+                rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        try:
+            import resource
+            maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform != 'darwin':
+                maxRss *= 1024
+        except ImportError:
+            pass
+        return rss, maxRss
+
+    @staticmethod
+    def read(path:str) -> list[dict]:
+        '''
+        Read the JSON lines of {path}, skipping the incomplete last line of an interrupted dump.
+        '''
+        sRecord = []
+        with open(path) as f:
+            for line in f:
+                try:
+                    sRecord.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return sRecord
+
+
+class FFT_Order_Aggr:
+    '''
+    The aggregated Measure of the non-linear signals of FFT_Order for one sweep, 
+        keyed by (order, sinSource, noiseType, noise).
+    
+    An instance is passed to each FFT_Order of the sweep, which accumulates into the Measure of its key.
+    After all the signals of a key are calculated, pop() releases its Measure to be dumped,
+        so that the memory stays flat over a long sweep, and separate sweeps do not share any state.
+    '''
+
+    def __init__(self, divids=5, devs=3):
+        self.divids = divids
+        self.devs = devs
+        self.sMeasure:dict[tuple, Measure] = {}
+
+    def __len__(self):
+        return len(self.sMeasure)
+
+    def __contains__(self, key:tuple) -> bool:
+        return key in self.sMeasure
+
+    def measure(self, order:int, sinSource:SinSource, noiseType:NoiseType, noise:float) -> Measure:
+        key = (order, sinSource, noiseType, noise)
+        if (measure := self.sMeasure.get(key)) is None:
+            measure = self.sMeasure[key] = Measure(self.divids, self.devs)
+        return measure
+
+    def pop(self, order:int, sinSource:SinSource, noiseType:NoiseType, noise:float) -> Measure:
+        key = (order, sinSource, noiseType, noise)
+        if key not in self.sMeasure:
+            raise RuntimeError(f'No aggregation for order={order}, sinSource={sinSource}, noiseType={noiseType}, noise={noise}')
+        return self.sMeasure.pop(key)
+
+
 class FFT_Order (FFT_Signal):
     '''
     Perform FFT for a FFT_Signal, with noise of {noiseType} and {noise}.
 
     FFT_Order.dump() dumps the result to file.  
-        Due to FFT_Order.read(), FFT_Order.dump() can continue to append the result to existing file.
+        Due to FFT_Order_Index, FFT_Order.dump() can continue to append the result to existing file.
     FFT_Order.read() reads the result from file.
     FFT_Order.sort() sorts the result in the file in a standard order.
     FFT_Order.compare() compares two result files 
@@ -249,16 +675,26 @@ class FFT_Order (FFT_Signal):
     MIN_COUNT = 64
     NORMALIZED_ERROR_OUTLIER = 1e14
 
-    ssssAggr = {}
-
     def __init__(self, signal:FFT_Signal, noiseType:NoiseType, noise:float,
                  sCosSin:tuple[varDbl.VarDbl]=None,
                  sWave:tuple[varDbl.VarDbl]=None, sFreq:tuple[varDbl.VarDbl]=None,
                  sFrwd:tuple[varDbl.VarDbl]=None, sBack:tuple[varDbl.VarDbl]=None,
-                 traceSteps=False, minCount=MIN_COUNT):
-        super().__init__(SinSource.Limit if sCosSin else signal.sinSource, 
-                         signal.signalType, signal.order, signal.freq,
-                         sCosSin=sCosSin, sWave=sWave, sFreq=sFreq)
+                 traceSteps=False, minCount=MIN_COUNT, realInput=False, timing:FFT_Timing=None,
+                 aggrCtx:FFT_Order_Aggr=None):
+        '''
+        When {realInput} is true, the noise is only added to the real part of the forward input,
+            so that the forward transform is done by transformReal() instead of transform().
+            Without the noise of the imaginary part, the forward and the roundtrip tests measure
+            a real signal with half of the input noise power, which differs from the default experiment.
+        When {timing} is provided, the durations of the phases are accumulated into it.
+        When {aggrCtx} is provided, a non-linear signal is also accumulated into its aggregated Measure.
+        '''
+        self.timing = timing if timing else FFT_Timing()
+        self.aggrCtx = aggrCtx
+        with self.timing.phase('signal'):
+            super().__init__(SinSource.Limit if sCosSin else signal.sinSource, 
+                             signal.signalType, signal.order, signal.freq,
+                             sCosSin=sCosSin, sWave=sWave, sFreq=sFreq)
 
         self.noiseType = noiseType
         self.noise = abs(noise)
@@ -269,26 +705,33 @@ class FFT_Order (FFT_Signal):
                 pass
             case _:
                 raise ValueError(f'Invalid noiseType={noiseType}')
-
-        if sFrwd:
-            if len(sFrwd) != (self.size << 1):
-                raise RuntimeError(f'Invalid forward input size {len(sFrwd)} for order {self.order}: {sFrwd}')
+        if realInput and traceSteps:
+            raise ValueError(f'Invalid realInput={realInput} with traceSteps={traceSteps}')
+        self.realInput = realInput
+
+        with self.timing.phase('signal'):
+            if sFrwd:
+                if len(sFrwd) != (self.size << 1):
+                    raise RuntimeError(f'Invalid forward input size {len(sFrwd)} for order {self.order}: {sFrwd}')
+                else:
+                    self.sFrwd = sFrwd
+            elif self.noise == 0:
+                self.sFrwd = [varDbl.VarDbl(self.sWave[i]) for i in range(self.size << 1)]
+            elif realInput:
+                self.sFrwd = [varDbl.VarDbl(self.sWave[i]) + varDbl.VarDbl(self.getNoise(), self.noise) if not (i & 1) 
+                              else varDbl.VarDbl(self.sWave[i]) for i in range(self.size << 1)]
             else:
-                self.sFrwd = sFrwd
-        elif self.noise == 0:
-            self.sFrwd = [varDbl.VarDbl(self.sWave[i]) for i in range(self.size << 1)]
-        else:
-            self.sFrwd = [varDbl.VarDbl(self.sWave[i]) + varDbl.VarDbl(self.getNoise(), self.noise) for i in range(self.size << 1)]
+                self.sFrwd = [varDbl.VarDbl(self.sWave[i]) + varDbl.VarDbl(self.getNoise(), self.noise) for i in range(self.size << 1)]
 
-        if sBack:
-            if len(sBack) != (self.size << 1):
-                raise RuntimeError(f'Invalid backward input size {len(sBack)} for order {self.order}: {sBack}')
+            if sBack:
+                if len(sBack) != (self.size << 1):
+                    raise RuntimeError(f'Invalid backward input size {len(sBack)} for order {self.order}: {sBack}')
+                else:
+                    self.sBack = sBack
+            elif self.noise == 0:
+                self.sBack = [varDbl.VarDbl(self.sFreq[i]) for i in range(self.size << 1)]
             else:
-                self.sBack = sBack
-        elif self.noise == 0:
-            self.sBack = [varDbl.VarDbl(self.sFreq[i]) for i in range(self.size << 1)]
-        else:
-            self.sBack = [varDbl.VarDbl(self.sFreq[i]) + varDbl.VarDbl(self.getNoise(), self.noise) for i in range(self.size << 1)]
+                self.sBack = [varDbl.VarDbl(self.sFreq[i]) + varDbl.VarDbl(self.getNoise(), self.noise) for i in range(self.size << 1)]
 
         self.measure = Measure(FFT_Order.DIVIDS, FFT_Order.DEVS)
         self.calc(traceSteps)
@@ -305,35 +748,40 @@ class FFT_Order (FFT_Signal):
 
     def calc(self, traceSteps:bool):
         # Deterministic interval-arithmetic FFT: clean-wave centered with bound by noise model.
-        sFrwd_intv = [None] * (self.size << 1)
-        sBack_intv = [None] * (self.size << 1)
-        for i in range(self.size << 1):
-            w = self.sWave[i].value()
-            s = self.sFreq[i].value()
-            bw = _interval_bound(self.noiseType, self.noise, w)
-            bs = _interval_bound(self.noiseType, self.noise, s)
-            sFrwd_intv[i] = Interval(w - bw, w + bw)
-            sBack_intv[i] = Interval(s - bs, s + bs)
-        self.sSpec_intv  = self.transform(sFrwd_intv, True)
-        self.sRev_intv   = self.transform(sBack_intv, False)
-        self.sRound_intv = self.transform(self.sSpec_intv, False)
-
-        self.sSpec = self.transform(self.sFrwd, True, traceSteps=traceSteps)
-        self.ssSpecStep = self.ssStep
-        self.sRound = self.transform(self.sSpec, False, traceSteps=traceSteps)
-        self.ssRoundStep = self.ssStep
-        self.sRev = self.transform(self.sBack, False, traceSteps=traceSteps)
-        self.ssRevStep = self.ssStep
-
-        if self.signalType == SignalType.Linear:
+        self.timing.calcs += 1
+        with self.timing.phase('interval'):
+            sFrwd_intv = [None] * (self.size << 1)
+            sBack_intv = [None] * (self.size << 1)
+            for i in range(self.size << 1):
+                w = self.sWave[i].value()
+                s = self.sFreq[i].value()
+                bw = 0 if self.realInput and (i & 1) else _interval_bound(self.noiseType, self.noise, w)
+                bs = _interval_bound(self.noiseType, self.noise, s)
+                sFrwd_intv[i] = Interval(w - bw, w + bw)
+                sBack_intv[i] = Interval(s - bs, s + bs)
+            self.sSpec_intv  = self.transformReal(sFrwd_intv, True) if self.realInput else self.transform(sFrwd_intv, True)
+            self.sRev_intv   = self.transform(sBack_intv, False)
+            self.sRound_intv = self.transform(self.sSpec_intv, False)
+
+        with self.timing.phase('varDbl'):
+            if self.realInput:
+                self.sSpec = self.transformReal(self.sFrwd, True)
+            else:
+                self.sSpec = self.transform(self.sFrwd, True, traceSteps=traceSteps)
+            self.ssSpecStep = self.ssStep
+            self.sRound = self.transform(self.sSpec, False, traceSteps=traceSteps)
+            self.ssRoundStep = self.ssStep
+            self.sRev = self.transform(self.sBack, False, traceSteps=traceSteps)
+            self.ssRevStep = self.ssStep
+
+        if (self.aggrCtx is None) or (self.signalType == SignalType.Linear):
             self.aggr = None
         else:
-            self.aggr = FFT_Order.ssssAggr.setdefault(self.order, {}).setdefault(self.sinSource, {})\
-                            .setdefault(self.noiseType, {}).setdefault(self.noise, Measure(FFT_Order.DIVIDS, FFT_Order.DEVS))
-        for i in range(self.size << 1):
-            self.accum(TestType.Forward, i, self.sSpec[i], self.sFreq[i], self.sSpec_intv[i].rad())
-            self.accum(TestType.Roundtrip, i, self.sRound[i], self.sFrwd[i], self.sRound_intv[i].rad())
-            self.accum(TestType.Reverse, i, self.sRev[i], self.sWave[i], self.sRev_intv[i].rad())
+            self.aggr = self.aggrCtx.measure(self.order, self.sinSource, self.noiseType, self.noise)
+        with self.timing.phase('measure'):
+            self.accumMany(TestType.Forward, self.sSpec, self.sFreq, [intv.rad() for intv in self.sSpec_intv])
+            self.accumMany(TestType.Roundtrip, self.sRound, self.sFrwd, [intv.rad() for intv in self.sRound_intv])
+            self.accumMany(TestType.Reverse, self.sRev, self.sWave, [intv.rad() for intv in self.sRev_intv])
 
     def getNoise(self) -> float:
         match self.noiseType:
@@ -371,7 +819,41 @@ class FFT_Order (FFT_Signal):
                 if self.aggr:
                     self.aggr.sHisto[test].accum(norm, index)
             else:
-                print(f'For signal={self.signalType} freq={self.freq} noiseType={self.noiseType} noise={self.noise} test={test} index={index}, normalized error outlier {norm} between {actual} and {expected}')
+                self.reportOutlier(test, index, norm, actual, expected)
+
+    def reportOutlier(self, test:TestType, index:int, norm:float, actual:varDbl.VarDbl, expected:varDbl.VarDbl):
+        '''
+        Report the normalized error {norm} beyond FFT_Order.NORMALIZED_ERROR_OUTLIER, which is not accumulated.
+        '''
+        print(f'For signal={self.signalType} freq={self.freq} noiseType={self.noiseType} noise={self.noise} test={test} index={index}, normalized error outlier {norm} between {actual} and {expected}')
+
+    def accumMany(self, test:TestType, sActual:list[varDbl.VarDbl], sExpected:list[varDbl.VarDbl], sRange:list[float]):
+        '''
+        The same as calling accum() for each index, but with the statistics accumulated by accum_many().
+        '''
+        sErr = [actual - expected for actual, expected in zip(sActual, sExpected)]
+        sIndex = numpy.arange(len(sErr))
+        sUnc = numpy.array([actual.uncertainty() for actual in sActual])
+        sErrVal = numpy.array([err.value() for err in sErr])
+        sErrUnc = numpy.array([err.uncertainty() for err in sErr])
+        sRange = numpy.array(sRange, dtype=float)
+        sUncPos = sUnc > 0
+        sRangePos = sRange > 0
+        with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            sUncRatio = sRange[sUncPos] / sUnc[sUncPos]
+            sRangeRatio = numpy.abs(sErrVal[sRangePos]) / sRange[sRangePos]
+            sNormAt = numpy.flatnonzero(sErrUnc > 0)
+            sNorm = sErrVal[sNormAt] / sErrUnc[sNormAt]
+        sInlier = numpy.abs(sNorm) < FFT_Order.NORMALIZED_ERROR_OUTLIER
+        for index, norm in zip(sNormAt[~sInlier], sNorm[~sInlier]):
+            self.reportOutlier(test, index, norm, sActual[index], sExpected[index])
+        for measure in (self.measure, self.aggr) if self.aggr else (self.measure,):
+            measure.sUncStat[test].accum_many(sUnc, sIndex)
+            measure.sValStat[test].accum_many(sErrVal, sIndex)
+            measure.sRangeStat[test].accum_many(sRange, sIndex)
+            measure.sUncRatioStat[test].accum_many(sUncRatio, sIndex[sUncPos])
+            measure.sRangeRatioStat[test].accum_many(sRangeRatio, sIndex[sRangePos])
+            measure.sHisto[test].accum_many(sNorm[sInlier], sNormAt[sInlier])
 
     @staticmethod
     def title(divids, devs) -> str:
@@ -418,9 +900,14 @@ class FFT_Order (FFT_Signal):
         # 7 metadata + 6 Stat sections * 7 + 2 (lowers/uppers) = 51
         return 51
 
-    def dumpMeasure(self, fw, signalType:SignalType, measure:Measure):
+    def dumpMeasure(self, fw, signalType:SignalType, measure:Measure, index:FFT_Order_Index=None):
+        '''
+        Dump {measure} for each test as a line to {fw}.
+        When {index} is provided, add the offset of each line to {index}.
+        '''
         for test in TestType:
             try:
+                offset = fw.tell() if index is not None else None
                 fw.write(f'{self.sinSource}\t{self.noiseType}\t{self.noise}\t{signalType}\t{self.order}\t{self.freq}\t{test}')
                 # Order matches title(): Uncertainty, Value, [Error=histo stats], Range, UncRatio, RangeRatio.
                 for stat in (
@@ -439,6 +926,8 @@ class FFT_Order (FFT_Signal):
                     else:
                         fw.write(f'\t{c}')
                 fw.write('\n')
+                if index is not None:
+                    index.append((self.order, self.sinSource, self.noiseType, self.noise, signalType, self.freq, test), offset)
             except BaseException as ex:
                 print(f'{self.sinSource}\t{self.noiseType}\t{self.noise}\t{self.signalType}\t{self.order}\t{self.freq}\t{test}: {ex}')
                 raise ex
@@ -474,6 +963,28 @@ class FFT_Order (FFT_Signal):
         test = TestType(sWord[6])
         return sinSource,noiseType,noise,signalType,order,freq,test
 
+    @staticmethod
+    def readRecord(line:str, where:str, order:int, noise:float, minOrder=3, minNoise=1e-15) -> tuple[float, float, int]:
+        '''
+        Read the error deviation, the uncertainty mean, and the error count from a dump {line},
+            after checking the counts.
+        {where} locates {line} in the error messages, such as "#<line number>" or "offset <byte offset>".
+        '''
+        sWord = line.split('\t')
+        cntUnc = int(sWord[FFT_Order.uncertainty_offset()])
+        if cntUnc < (2 << order):
+            raise AssertionError(f'Invalid Uncertainty Count {cntUnc} < {(2 << order)} for order {order} at {where}: {line}')
+        cntErr = int(sWord[FFT_Order.error_offset()])
+        if (minNoise < noise) and (minOrder < order):
+            if cntErr != cntUnc:
+                raise AssertionError(f'Invalid Error Count {cntErr} vs Uncertainty Count {cntUnc} for order {order} at {where} with offset {FFT_Order.error_offset()}: {line}')
+        else:
+            if cntErr > cntUnc:
+                raise AssertionError(f'Invalid Error Count {cntErr} vs Uncertainty Count {cntUnc} for order {order} at {where}: {line}')
+        uncMean = float(sWord[FFT_Order.uncertainty_offset() + 1])
+        errDev = float(sWord[FFT_Order.error_offset() + 2])
+        return errDev, uncMean, cntErr
+
     @staticmethod
     def read(dumpPath:str, filterSignalType=SignalType.Aggr, filterFreq=0, 
              checkEnding=True, minOrder=3, minNoise=1e-15) \
@@ -501,28 +1012,57 @@ class FFT_Order (FFT_Signal):
                 except BaseException as ex:
                    raise ex
                 if signalType == filterSignalType and freq == filterFreq:
-                    sWord = line.split('\t')
-                    cntUnc = int(sWord[FFT_Order.uncertainty_offset()])
-                    if cntUnc < (2 << order):
-                        raise AssertionError(f'Invalid Uncertainty Count {cntUnc} < {(2 << order)} for order {order} at #{ln}: {line}')
-                    cntErr = int(sWord[FFT_Order.error_offset()])
-                    if (minNoise < noise) and (minOrder < order):
-                        if cntErr != cntUnc:
-                            raise AssertionError(f'Invalid Error Count {cntErr} vs Uncertainty Count {cntUnc} for order {order} at #{ln} with offset {FFT_Order.error_offset()}: {line}')
-                    else:
-                        if cntErr > cntUnc:
-                            raise AssertionError(f'Invalid Error Count {cntErr} vs Uncertainty Count {cntUnc} for order {order} at #{ln}: {line}')
-                    uncMean = float(sWord[FFT_Order.uncertainty_offset() + 1])
-                    errDev = float(sWord[FFT_Order.error_offset() + 2])
+                    record = FFT_Order.readRecord(line, f'#{ln}', order, noise, minOrder, minNoise)
                     sssssAggr.setdefault(order, {}).setdefault(sinSource, {})\
                              .setdefault(noiseType, {}).setdefault(noise, {})\
-                             .setdefault(test, (errDev, uncMean, cntErr))
+                             .setdefault(test, record)
                     n += 1     
             if checkEnding and signalType != SignalType.Aggr:
                 raise RuntimeError(f'Invalid end line of {dumpPath}: {line}')
         print(f'Finish reading {ln} lines for {n} {filterSignalType} records from {dumpPath}')
         return sssssAggr
 
+    COLUMNS = [('order', 'i8'), ('sinSource', 'U8'), ('noiseType', 'U8'), ('noise', 'f8'), ('test', 'U16'),
+               ('errDev', 'f8'), ('uncMean', 'f8'), ('cntErr', 'i8'), ('cntUnc', 'i8')]
+    KEY_COLUMNS = ['order', 'sinSource', 'noiseType', 'noise', 'test']
+
+    @staticmethod
+    def readColumns(dumpPath:str, filterSignalType=SignalType.Aggr, filterFreq=0, 
+                    minOrder=3, minNoise=1e-15) -> numpy.ndarray:
+        '''
+        Read the error deviation, the uncertainty mean, and the counts
+            of a particular {filterSignalType} and {filterFreq}
+            from file {dumpPath} as a numpy structured array of FFT_Order.COLUMNS, one row per line.
+        Only the leading columns of each line are split, and the count checks of readRecord() are vectorized.
+        '''
+        if not os.path.isfile(dumpPath):
+            return
+        sRow = []
+        maxsplit = FFT_Order.error_offset() + 3
+        with open(dumpPath) as f:
+            hdr = next(f)
+            if not FFT_Order.is_title(hdr, dumpPath):
+                raise RuntimeError(f'Invalid title line in {dumpPath}: {hdr}')
+            for ln, line in enumerate(f):
+                sinSource,noiseType,noise,signalType,order,freq,test = FFT_Order.readLine(line, ln, dumpPath)
+                if order <= 1 or signalType != filterSignalType or freq != filterFreq:
+                    continue
+                sWord = line.split('\t', maxsplit)
+                sRow.append((order, sinSource, noiseType, noise, test,
+                             sWord[FFT_Order.error_offset() + 2], sWord[FFT_Order.uncertainty_offset() + 1],
+                             sWord[FFT_Order.error_offset()], sWord[FFT_Order.uncertainty_offset()]))
+        sColumn = numpy.array(sRow, dtype=FFT_Order.COLUMNS)
+        sInvalid = numpy.flatnonzero(sColumn['cntUnc'] < (2 << sColumn['order']))
+        if len(sInvalid):
+            raise AssertionError(f'Invalid Uncertainty Count for {len(sInvalid)} records of {dumpPath}: {sColumn[sInvalid[0]]}')
+        sStrict = (minNoise < sColumn['noise']) & (minOrder < sColumn['order'])
+        sInvalid = numpy.flatnonzero(numpy.where(sStrict, sColumn['cntErr'] != sColumn['cntUnc'], 
+                                                 sColumn['cntErr'] > sColumn['cntUnc']))
+        if len(sInvalid):
+            raise AssertionError(f'Invalid Error Count for {len(sInvalid)} records of {dumpPath}: {sColumn[sInvalid[0]]}')
+        print(f'Finish reading {len(sColumn)} {filterSignalType} records from {dumpPath}')
+        return sColumn
+
     @staticmethod
     def dump(sOrder=range(2, IndexSin.MAX_ORDER + 1), 
              sSinSource=(SinSource.Quart, SinSource.Lib, SinSource.Prec),
@@ -533,12 +1073,20 @@ class FFT_Order (FFT_Signal):
         Dump the FFT for order between [ndexSin.MIN_ORDER, IndexSin.MAX_ORDER), freq between [1, MAX_FREQ)
             noise of type (NoiseType.Gaussian, NoiseType.White) and level between [0, 1e-17, ... 1]
         For statistical significancy, the minimal count is FFT_Order.MIN_COUNT
+        The durations of the phases for each (order, sinSource, noiseType, noise) are appended to
+            FFT_Timing.path(dumpPath) as JSON lines, to be read by FFT_Timing.read().
         '''
         dumpPath = FFT_Order.dumpPath(sOrder)
-        sssssAggr = FFT_Order.read(dumpPath)
-
-        with open(dumpPath, 'a' if sssssAggr else 'w') as fw, open(dumpPath + '.log', 'w') as fl:
-            if not sssssAggr:
+        index = FFT_Order_Index(dumpPath, write=True)
+        if len(index) and (index.lastKey[4] != SignalType.Aggr):
+            index.close()
+            raise RuntimeError(f'Invalid end line of {dumpPath}: {index.lastKey}')
+
+        aggrCtx = FFT_Order_Aggr(FFT_Order.DIVIDS, FFT_Order.DEVS)
+        with index, open(dumpPath, 'a' if len(index) else 'w') as fw, open(dumpPath + '.log', 'w') as fl, \
+                open(FFT_Timing.path(dumpPath), 'a' if len(index) else 'w') as ft:
+            if not len(index):
+                index.clear()
                 fw.write(FFT_Order.title(FFT_Order.DIVIDS, FFT_Order.DEVS))
             for noiseType in sNoiseType:
                 for order in sOrder:
@@ -546,23 +1094,28 @@ class FFT_Order (FFT_Signal):
                     for sinSource in sSinSource:
                         sSignal = None
                         for noise in sNoise:
-                            if sssssAggr and (ssssAggr := sssssAggr.get(order)) and (sssAggr := ssssAggr.get(sinSource)) \
-                                    and (ssAggr := sssAggr.get(noiseType)) and (sAggr := ssAggr.get(noise)) and (len(sAggr) == 3):
+                            if index.hasAggr(order, sinSource, noiseType, noise):
                                 continue
                             fl.write(f'{datetime.datetime.now()}: Start calulation order={order}, sinSource={sinSource}, noiseType={noiseType}, noise={noise}\n')
                             fl.flush()
+                            timing = FFT_Timing()
                             if not sSignal:
-                                sSignal = [FFT_Signal(sinSource, SignalType.Sin, order, freq) for freq in sFreq if freq < half] +\
-                                          [FFT_Signal(sinSource, SignalType.Cos, order, freq) for freq in sFreq if freq < half] +\
-                                          [FFT_Signal(sinSource, SignalType.Linear, order, 0)]
+                                with timing.phase('signal'):
+                                    sSignal = [FFT_Signal(sinSource, SignalType.Sin, order, freq) for freq in sFreq if freq < half] +\
+                                              [FFT_Signal(sinSource, SignalType.Cos, order, freq) for freq in sFreq if freq < half] +\
+                                              [FFT_Signal(sinSource, SignalType.Linear, order, 0)]
                                 fl.write(f'{datetime.datetime.now()}: Finish create signal for order={order}, sinSource={sinSource}\n')
                                 fl.flush()
                             for signal in sSignal:
-                                calc = FFT_Order(signal, noiseType, noise)
-                                calc.dumpMeasure(fw, calc.signalType, calc.measure)
+                                calc = FFT_Order(signal, noiseType, noise, timing=timing, aggrCtx=aggrCtx)
+                                with timing.phase('write'):
+                                    calc.dumpMeasure(fw, calc.signalType, calc.measure, index)
                             # the last one is linear   
-                            calc.dumpMeasure(fw, SignalType.Aggr, FFT_Order.ssssAggr[order][sinSource][noiseType][noise])
-                            fw.flush()
+                            with timing.phase('write'):
+                                calc.dumpMeasure(fw, SignalType.Aggr, aggrCtx.pop(order, sinSource, noiseType, noise), index)
+                                fw.flush()
+                                index.flush()
+                            timing.dump(ft, order, sinSource, noiseType, noise)
 
     @staticmethod
     def sort(dumpPath:str=None, 
@@ -575,6 +1128,7 @@ class FFT_Order (FFT_Signal):
         if not os.path.isfile(dumpPath):
            return
         shutil.copy(dumpPath, dumpPath + '.bak')
+        FFT_Order_Index.remove(dumpPath)
         
         sssssssSort = {}
         with open(dumpPath) as f:
@@ -616,7 +1170,7 @@ class FFT_Order (FFT_Signal):
     @staticmethod
     def compare(testCase:unittest.TestCase, thisPath:str, thatPath:str, 
                 filterSignalType=SignalType.Aggr, filterFreq=0,
-                minNoise=0, minCount=MIN_COUNT, minOrder=4) \
+                minNoise=0, minCount=MIN_COUNT, minOrder=4, columnar=False) \
             -> dict[SinSource, dict[TestType, list[float]]]:
         '''
         Compare two FFT dump files {thisPath} and {thatPath} for uncertainty mean and error deviation.
@@ -624,67 +1178,130 @@ class FFT_Order (FFT_Signal):
         Only compare the error deviation for noise >= {minNoise}.
         Only compare the error deviation for uncertainty count >= {minCount}
         Return the max differences of error deviation for each SinSource as a dictionary.
+
+        When {columnar} is true, both files are read by readColumns(), joined on FFT_Order.KEY_COLUMNS,
+            and reduced by numpy for each SinSource and TestType.
+        Otherwise, the matched lines are read through FFT_Order_Index of each file, without loading either file.
+        {testCase} fails if either file is missing.
         ''' 
+        for path in (thisPath, thatPath):
+            if not os.path.isfile(path):
+                testCase.fail(f'Missing FFT dump file {path}')
+        if columnar:
+            return FFT_Order.compareColumns(thisPath, thatPath, filterSignalType, filterFreq, minNoise, minCount, minOrder)
         sssDiff = {sinSource: {test: (histo.Stat(), histo.Stat(), histo.Stat()) 
                                for test in TestType} 
                    for sinSource in (SinSource.Prec, SinSource.Quart, SinSource.Lib)}
-        sKey = []
-        sssssThis = FFT_Order.read(thisPath, filterSignalType, filterFreq, checkEnding=False)
-        sssssThat = FFT_Order.read(thatPath, filterSignalType, filterFreq, checkEnding=False)
-        sThis = set(sssssThis.keys())
-        sThat = set(sssssThat.keys())
-        if sThis != sThat:
-            print(f'Diff orders:'
-                  f' {sThis - sThat} only in {thisPath}, {sThat - sThis} only in {thatPath}')
-        for order in sorted(sThis & sThat):
-            if order <= minOrder:
-                continue
-            ssssThis = sssssThis[order]
-            ssssThat = sssssThat[order]
-            sThis = set(ssssThis.keys())
-            sThat = set(ssssThat.keys())
+        with FFT_Order_Index(thisPath) as sThisIdx, FFT_Order_Index(thatPath) as sThatIdx:
+            sThis = set([key for key in sThisIdx.keys(filterSignalType, filterFreq) if key[0] > 1])
+            sThat = set([key for key in sThatIdx.keys(filterSignalType, filterFreq) if key[0] > 1])
             if sThis != sThat:
-                sKey.append(f'Diff sinSource for order={order}: '
-                            f'{sThis - sThat} only in {thisPath}, {sThat - sThis} only in {thatPath}')
-            for sinSource in sorted(sThis & sThat):
-                sssThis = ssssThis[sinSource]
-                sssThat = ssssThat[sinSource]
-                sThis = set(sssThis.keys())
-                sThat = set(sssThat.keys())
-                if sThis != sThat: 
-                    sKey.append(f'Diff noiseType for order={order} sinSource={sinSource}: '
-                                f'{sThis - sThat} only in {thisPath}, {sThat - sThis} only in {thatPath}')
-                for noiseType in sorted(sThis & sThat):
-                    ssThis = sssThis[noiseType]
-                    ssThat = sssThat[noiseType]
-                    sThis = set(ssThis.keys())
-                    sThat = set(ssThat.keys())
-                    if sThis != sThat: 
-                        sKey.append(f'Diff noise for order={order} sinSource={sinSource} noiseType={noiseType}: '
-                                    f'{sThis - sThat} only in {thisPath}, {sThat - sThis} only in {thatPath}')
-                    for noise in sorted(sThis & sThat):
-                        if noise < minNoise:
-                            continue
-                        sThis = set(ssThis[noise].keys())
-                        sThat = set(ssThat[noise].keys())
-                        if sThis != sThat:
-                            sKey.append(f'Diff test for order={order} sinSource={sinSource} noiseType={noiseType} noise={noise}: '
-                                        f'{sThis - sThat} only in {thisPath}, {sThat - sThis} only in {thatPath}')
-                        sCommon = sThis & sThat
-                        sThis = ssThis[noise]
-                        sThat = ssThat[noise]
-                        for test in sCommon:
-                            this = sThis[test]
-                            that = sThat[test]
-                            if this[2] < minCount or that[2] < minCount:
-                                continue
-                            if this[1] <= 0 or that[1] < 0:
-                                continue
-                            for i in range(3):
-                                sssDiff[sinSource][test][i].accum((this[i] - that[i]) / max(this[i], that[i]),
-                                                    (noiseType, noise, order, this[i], that[i]))
+                FFT_Order.reportDiffKeys({key[:4] + key[6:] for key in sThis}, {key[:4] + key[6:] for key in sThat}, 
+                                         thisPath, thatPath, minOrder, minNoise)
+            for key in sorted(sThis & sThat):
+                order, sinSource, noiseType, noise, signalType, freq, test = key
+                if order <= minOrder:
+                    continue
+                if noise < minNoise:
+                    continue
+                this = FFT_Order.readRecord(sThisIdx.readLine(key), f'offset {sThisIdx.sOffset[key]}', order, noise)
+                that = FFT_Order.readRecord(sThatIdx.readLine(key), f'offset {sThatIdx.sOffset[key]}', order, noise)
+                if this[2] < minCount or that[2] < minCount:
+                    continue
+                if this[1] <= 0 or that[1] < 0:
+                    continue
+                for i in range(3):
+                    sssDiff[sinSource][test][i].accum((this[i] - that[i]) / max(this[i], that[i]),
+                                        (noiseType, noise, order, this[i], that[i]))
         return sssDiff
-        
+
+    @staticmethod
+    def reportDiffKeys(sThis:set[tuple], sThat:set[tuple], thisPath:str, thatPath:str, minOrder=4, minNoise=0):
+        '''
+        Print the differences between the keys {sThis} of {thisPath} and the keys {sThat} of {thatPath},
+            each as (order, sinSource, noiseType, noise, test), level by level:
+            the orders, then the sinSources for each common order, and so on down to the tests.
+        As compare(), the orders <= {minOrder} and the noises < {minNoise} are not reported further.
+        '''
+        sLevel = ('order', 'sinSource', 'noiseType', 'noise', 'test')
+
+        def report(sThis:set[tuple], sThat:set[tuple], depth:int, sPrefix:tuple):
+            ssThis, ssThat = {}, {}
+            for sKey, ssKey in ((sThis, ssThis), (sThat, ssThat)):
+                for key in sKey:
+                    ssKey.setdefault(key[depth], set()).add(key)
+            if ssThis.keys() != ssThat.keys():
+                where = ' '.join([f'{sLevel[i]}={val}' for i, val in enumerate(sPrefix)])
+                print(f'Diff {sLevel[depth]}{" for " + where if where else ""}: '
+                      f'{sorted(ssThis.keys() - ssThat.keys())} only in {thisPath}, '
+                      f'{sorted(ssThat.keys() - ssThis.keys())} only in {thatPath}')
+            if depth + 1 == len(sLevel):
+                return
+            for val in sorted(ssThis.keys() & ssThat.keys()):
+                if (sLevel[depth] == 'order' and val <= minOrder) or (sLevel[depth] == 'noise' and val < minNoise):
+                    continue
+                report(ssThis[val], ssThat[val], depth + 1, sPrefix + (val,))
+
+        report(sThis, sThat, 0, ())
+
+    @staticmethod
+    def compareColumns(thisPath:str, thatPath:str, 
+                       filterSignalType=SignalType.Aggr, filterFreq=0,
+                       minNoise=0, minCount=MIN_COUNT, minOrder=4) \
+            -> dict[SinSource, dict[TestType, list[float]]]:
+        '''
+        The columnar implementation of compare() with the same filters and the same return structure.
+        The duplicated keys in each file are ignored except the first one, as FFT_Order_Index.
+        The non-finite relative differences are skipped, as histo.Stat.accum().
+        '''
+        sssDiff = {sinSource: {test: (histo.Stat(), histo.Stat(), histo.Stat()) 
+                               for test in TestType} 
+                   for sinSource in (SinSource.Prec, SinSource.Quart, SinSource.Lib)}
+        sThisCol = FFT_Order.readColumns(thisPath, filterSignalType, filterFreq)
+        sThatCol = FFT_Order.readColumns(thatPath, filterSignalType, filterFreq)
+        for path, sCol in ((thisPath, sThisCol), (thatPath, sThatCol)):
+            if sCol is None:
+                raise FileNotFoundError(f'Missing FFT dump file {path}')
+        sThisKey, sThisFirst = numpy.unique(sThisCol[FFT_Order.KEY_COLUMNS], return_index=True)
+        sThatKey, sThatFirst = numpy.unique(sThatCol[FFT_Order.KEY_COLUMNS], return_index=True)
+        sKey, sThisAt, sThatAt = numpy.intersect1d(sThisKey, sThatKey, assume_unique=True, return_indices=True)
+        if len(sKey) != len(sThisKey) or len(sKey) != len(sThatKey):
+            FFT_Order.reportDiffKeys(set(sThisKey.tolist()), set(sThatKey.tolist()), 
+                                     thisPath, thatPath, minOrder, minNoise)
+        sThis = sThisCol[sThisFirst[sThisAt]]
+        sThat = sThatCol[sThatFirst[sThatAt]]
+        sValid = (sKey['order'] > minOrder) & (sKey['noise'] >= minNoise) \
+                 & (sThis['cntErr'] >= minCount) & (sThat['cntErr'] >= minCount) \
+                 & (sThis['uncMean'] > 0) & (sThat['uncMean'] >= 0)
+        sKey, sThis, sThat = sKey[sValid], sThis[sValid], sThat[sValid]
+        sThisVal = numpy.stack([sThis[col].astype(float) for col in ('errDev', 'uncMean', 'cntErr')])
+        sThatVal = numpy.stack([sThat[col].astype(float) for col in ('errDev', 'uncMean', 'cntErr')])
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            sDiff = (sThisVal - sThatVal) / numpy.maximum(sThisVal, sThatVal)
+        for sinSource in sssDiff:
+            for test in TestType:
+                sGroup = (sKey['sinSource'] == sinSource) & (sKey['test'] == test)
+                sssDiff[sinSource][test] = tuple(
+                    FFT_Order._reduceDiff(sKey, sThisVal[i], sThatVal[i], sDiff[i], sGroup) for i in range(3))
+        return sssDiff
+
+    @staticmethod
+    def _reduceDiff(sKey:numpy.ndarray, sThis:numpy.ndarray, sThat:numpy.ndarray, sDiff:numpy.ndarray, 
+                    sGroup:numpy.ndarray) -> histo.Stat:
+        sAt = numpy.flatnonzero(sGroup & numpy.isfinite(sDiff))
+        if not len(sAt):
+            return histo.Stat()
+        sValue = sDiff[sAt]
+        minAt = sAt[numpy.argmin(sValue)]
+        maxAt = sAt[numpy.argmax(sValue)]
+        mean = numpy.mean(sValue)
+        return histo.Stat.fromSummary(len(sAt), sDiff[minAt], sDiff[maxAt], 
+                    mean, numpy.sum(numpy.square(sValue - mean)),
+                    (NoiseType(sKey[minAt]['noiseType']), float(sKey[minAt]['noise']), int(sKey[minAt]['order']), 
+                     float(sThis[minAt]), float(sThat[minAt])),
+                    (NoiseType(sKey[maxAt]['noiseType']), float(sKey[maxAt]['noise']), int(sKey[maxAt]['order']), 
+                     float(sThis[maxAt]), float(sThat[maxAt])))
+
 
 class FFT_Signal_Param: 
     def __init__(self, sinSource:SinSource, signalType:SignalType, order:int, freq:int):
@@ -702,6 +1319,94 @@ class FFT_Order_Param:
         self.noise = noise
 
 
+class FFT_Step_Trace:
+    '''
+    Binary dump of FFT_Step at {path}, with a directory file {path}.dir.
+
+    Each record is a float64 block of shape (steps, 2 * size, 2) in {path}, 
+        in which the last dimension is (value, uncertainty), and the middle dimension is the interleaved (real, imag) data.
+    The directory file has one line of HEADER for each record, with the byte offset of the block.
+    The block is memory-mapped only when read, so that a reader touches only the steps to be asserted.
+    '''
+    HEADER = 'SinSource\tNoiseType\tNoise\tSignal\tOrder\tFreq\tTest\tSteps\tOffset\n'
+    SUFFIX = '.bin'
+
+    def __init__(self, path:str, write=False):
+        self.path = path
+        self.ssWord = []
+        self.sSteps = []
+        self.sOffset = []
+        self._fw = None
+        self._fd = None
+        if write:
+            self._fw = open(path, 'wb')
+            self._fd = open(FFT_Step_Trace.dirPath(path), 'w')
+            self._fd.write(FFT_Step_Trace.HEADER)
+            return
+        with open(FFT_Step_Trace.dirPath(path)) as f:
+            hdr = next(f)
+            if hdr != FFT_Step_Trace.HEADER:
+                raise RuntimeError(f'Invalid directory header of {path}: {hdr}')
+            for line in f:
+                sWord = line.rstrip('\n').split('\t')
+                self.ssWord.append(tuple(sWord[:7]))
+                self.sSteps.append(int(sWord[7]))
+                self.sOffset.append(int(sWord[8]))
+
+    @staticmethod
+    def dirPath(path:str) -> str:
+        return path + '.dir'
+
+    @staticmethod
+    def isTrace(path:str) -> bool:
+        return path.endswith(FFT_Step_Trace.SUFFIX)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.ssWord)
+
+    def close(self):
+        if self._fw:
+            self._fw.close()
+            self._fw = None
+        if self._fd:
+            self._fd.close()
+            self._fd = None
+
+    def write(self, sWord:tuple, ssStep:tuple[tuple[varDbl.VarDbl]]):
+        '''
+        Append {ssStep} as a block, with {sWord} as (sinSource, noiseType, noise, signal, order, freq, test).
+        '''
+        sBlock = numpy.array([[(d.value(), d.uncertainty()) for d in sStep] for sStep in ssStep], dtype=numpy.float64)
+        offset = self._fw.tell()
+        self._fw.write(sBlock.tobytes())
+        self._fd.write('\t'.join([f'{word}' for word in sWord]) + f'\t{len(ssStep)}\t{offset}\n')
+        self.ssWord.append(tuple([f'{word}' for word in sWord]))
+        self.sSteps.append(len(ssStep))
+        self.sOffset.append(offset)
+
+    def flush(self):
+        self._fw.flush()
+        self._fd.flush()
+
+    def steps(self, i:int) -> numpy.ndarray:
+        '''
+        Memory-map the block of the {i}th record, without reading it.
+        '''
+        size = 1 << int(self.ssWord[i][4])
+        return numpy.memmap(self.path, dtype=numpy.float64, mode='r', offset=self.sOffset[i],
+                            shape=(self.sSteps[i], size << 1, 2))
+
+    @staticmethod
+    def toVarDbl(sBlock:numpy.ndarray) -> tuple[varDbl.VarDbl]:
+        return tuple([varDbl.VarDbl(float(value), float(unc)) for value, unc in sBlock])
+
+
 class FFT_Step (FFT_Order):
     '''
     Test the FFT step by step.
@@ -727,11 +1432,12 @@ class FFT_Step (FFT_Order):
         return 10
 
     @staticmethod
-    def dumpPath(order, sinSource):
+    def dumpPath(order, sinSource, binary=False):
+        suffix = FFT_Step_Trace.SUFFIX if binary else '.txt'
         if os.getcwd().endswith('VarianceArithmetic'):
-            return f'./Python/Output/FFT_Step_{order}_{sinSource}.txt'
+            return f'./Python/Output/FFT_Step_{order}_{sinSource}{suffix}'
         elif os.getcwd().endswith('Python'):
-            return f'./Output/FFT_Step_{order}_{sinSource}.txt'
+            return f'./Output/FFT_Step_{order}_{sinSource}{suffix}'
         else:
             raise ValueError(f'Invalid cwd {os.getcwd()}')
 
@@ -740,7 +1446,11 @@ class FFT_Step (FFT_Order):
              sNoiseType = (NoiseType.Gaussian,),
              sNoise:tuple[float]=(0,), 
              sFreq=range(1, FFT_Order.MAX_FREQ),
-             dumpStepPath:str=None):
+             dumpStepPath:str=None, binary=False):
+        '''
+        Dump all the steps of FFT_Step to {dumpStepPath}.
+        When {binary} is true, dump as FFT_Step_Trace instead of text.
+        '''
         if not IndexSin.MIN_ORDER <= order < IndexSin.MAX_ORDER:
             raise RuntimeError(f'Invalid order {order}')
         size = 1 << order
@@ -748,7 +1458,7 @@ class FFT_Step (FFT_Order):
         if dumpStepPath:
             dumpPath = dumpStepPath
         else:
-            dumpPath = FFT_Step.dumpPath(order, sinSource) 
+            dumpPath = FFT_Step.dumpPath(order, sinSource, binary) 
         if os.path.isfile(dumpPath):
             os.remove(dumpPath)
 
@@ -763,13 +1473,16 @@ class FFT_Step (FFT_Order):
                 fw.flush()
 
         print(f'{datetime.datetime.now()}: Start dump to {dumpPath}')
-        with open(dumpPath, 'w') as fw:
-            fw.write(FFT_Step.header(order))
+        with (FFT_Step_Trace(dumpPath, write=True) if binary else open(dumpPath, 'w')) as fw:
             sCosSin = []
             for i in range(size):
                 sCosSin.append(fft.idxSin.cos(i, order))
                 sCosSin.append(fft.idxSin.sin(i, order))
-            writeData(fw, sCosSin, '', 0, '', '', 'CosSin', '')
+            if binary:
+                fw.write((sinSource, '', 0, '', order, '', 'CosSin'), (sCosSin,))
+            else:
+                fw.write(FFT_Step.header(order))
+                writeData(fw, sCosSin, '', 0, '', '', 'CosSin', '')
 
             half = size >> 1
             sSignal = [FFT_Signal(sinSource, SignalType.Sin, order, freq) for freq in sFreq if freq < half] +\
@@ -782,12 +1495,30 @@ class FFT_Step (FFT_Order):
                         for test, ssStep in ((TestType.Forward, calc.ssSpecStep),
                                             (TestType.Roundtrip, calc.ssRoundStep),
                                             (TestType.Reverse, calc.ssRevStep)):
+                            if binary:
+                                fw.write((sinSource, noiseType, noise, calc.signalType, order, calc.freq, test), ssStep)
+                                fw.flush()
+                                continue
                             for step, sStep in enumerate(ssStep):
                                 writeData(fw, sStep, noiseType, noise, calc.signalType, calc.freq, test, step)
 
     @staticmethod
     def readCosSin(testCase:unittest.TestCase, order:int, sinSource:SinSource, fr) -> tuple[varDbl.VarDbl]:
+        '''
+        Read the cosine and sine table from {fr}, which is either the text file reader or FFT_Step_Trace.
+        '''
         size = 1 << order
+        if isinstance(fr, FFT_Step_Trace):
+            testCase.assertLess(0, len(fr))
+            sWord = fr.ssWord[0]
+            testCase.assertEqual(sinSource, SinSource(sWord[0]))
+            testCase.assertEqual(0, float(sWord[2]))
+            testCase.assertEqual(order, int(sWord[4]))
+            testCase.assertEqual('CosSin', sWord[6])
+            for i in (1,3,5):
+                testCase.assertEqual('', sWord[i])
+            testCase.assertEqual(1, fr.sSteps[0])
+            return list(FFT_Step_Trace.toVarDbl(fr.steps(0)[0]))
         sStep = [0] * (size << 1)
         for imag in (0, 1):
             for val in (1, 0):
@@ -964,6 +1695,9 @@ class FFT_Step (FFT_Order):
          *) When the sinSource is SinSource.Prec, only compare the value.
         '''
         print(f'{datetime.datetime.now()}: Start compare {dumpStepPath1} vs {dumpStepPath2} with precDiff={precDiff}')
+        if FFT_Step_Trace.isTrace(dumpStepPath1) or FFT_Step_Trace.isTrace(dumpStepPath2):
+            FFT_Step.compareTrace(testCase, sinSource, order, dumpStepPath1, dumpStepPath2, precDiff)
+            return
         with open(dumpStepPath1) as f1, open(dumpStepPath2) as f2:
             hdr = next(f1)      
             size = len(hdr.split('\t')) - FFT_Step.dataOffset()
@@ -1004,6 +1738,76 @@ class FFT_Step (FFT_Order):
                 FFT_Step.assertFFTOrderParam(testCase, forward2, reverse2)
                 FFT_Step.assertSteps(testCase, context, order, ssRevStep1, ssRevStep2, precDiff=precDiff)
 
+    @staticmethod
+    def compareTrace(testCase:unittest.TestCase, sinSource:SinSource, order:int,
+                     tracePath1:str, tracePath2:str, precDiff=-1):
+        '''
+        compare() for two FFT_Step_Trace files at {tracePath1} and {tracePath2}.
+        Each step is checked by assertStepBlock() on the memory-mapped blocks.
+        The comparison stops at the first record with noise, whose data is random.
+        '''
+        testCase.assertTrue(FFT_Step_Trace.isTrace(tracePath1) and FFT_Step_Trace.isTrace(tracePath2),
+                            f'Both {tracePath1} and {tracePath2} should be FFT_Step_Trace')
+        with FFT_Step_Trace(tracePath1) as t1, FFT_Step_Trace(tracePath2) as t2:
+            sCosSin1 = FFT_Step.readCosSin(testCase, order, sinSource, t1)
+            sCosSin2 = FFT_Step.readCosSin(testCase, order, sinSource, t2)
+            FFT_Step.assertStep(testCase, 'CosSin', order, 'CosSin', sCosSin1, sCosSin2, 
+                                precDiff=-1 if sinSource == SinSource.Prec else precDiff)
+            for i in range(1, len(t1)):
+                testCase.assertLess(i, len(t2))
+                sWord1 = t1.ssWord[i]
+                sWord2 = t2.ssWord[i]
+                testCase.assertEqual(float(sWord1[2]), float(sWord2[2]))
+                if float(sWord1[2]):
+                    break
+                testCase.assertEqual(sWord1[:2] + sWord1[3:], sWord2[:2] + sWord2[3:])
+                testCase.assertEqual(order, int(sWord1[4]))
+                testCase.assertEqual(order + FFT.EXTRA_STEPS, t1.sSteps[i])
+                testCase.assertEqual(order + FFT.EXTRA_STEPS, t2.sSteps[i])
+                context = f'signal={sWord1[3]} freq={sWord1[5]} noise={sWord1[2]} {sWord1[6].lower()}'
+                ssStep1 = t1.steps(i)
+                ssStep2 = t2.steps(i)
+                for step in range(order + FFT.EXTRA_STEPS):
+                    FFT_Step.assertStepBlock(testCase, context, order, step, ssStep1[step], ssStep2[step], precDiff=precDiff)
+            else:
+                testCase.assertEqual(len(t1), len(t2))
 
+    @staticmethod
+    def assertStepBlock(testCase:unittest.TestCase, context:str, order:int, step:int,
+                        sBlock1:numpy.ndarray, sBlock2:numpy.ndarray, precDiff=0):
+        '''
+        assertStep() for two blocks of (value, uncertainty) from FFT_Step_Trace.
+        The blocks are checked by numpy first, and only converted to VarDbl for assertStep() when the check fails.
+        '''
+        testCase.assertEqual(sBlock1.shape, sBlock2.shape)
+        value1, unc1 = sBlock1[:, 0], sBlock1[:, 1]
+        value2, unc2 = sBlock2[:, 0], sBlock2[:, 1]
+        if precDiff < 0:
+            sOk = ((value1 == value2) | (numpy.abs(value1 - value2) <= math.ulp(1) * (value1 + value2))) & \
+                  ((unc1 == unc2) | (numpy.abs(unc1 - unc2) <= math.ulp(1) * (numpy.abs(value1) + numpy.abs(value2) + 1.0)))
+        elif precDiff == 0:
+            sOk = (value1 == value2) & (unc1 == unc2)
+        else:
+            sOk = numpy.abs(value1 - value2) <= precDiff * numpy.sqrt(unc1 * unc1 + unc2 * unc2)
+        if numpy.all(sOk):
+            return
+        FFT_Step.assertStep(testCase, context, order, step, 
+                            FFT_Step_Trace.toVarDbl(sBlock1), FFT_Step_Trace.toVarDbl(sBlock2), precDiff=precDiff)
 
-
+    @staticmethod
+    def convert(testCase:unittest.TestCase, order:int, sinSource:SinSource, dumpStepPath:str, tracePath:str):
+        '''
+        Convert the text dump at {dumpStepPath}, such as from other languages, to FFT_Step_Trace at {tracePath}.
+        '''
+        with open(dumpStepPath) as fr, FFT_Step_Trace(tracePath, write=True) as fw:
+            hdr = next(fr)
+            testCase.assertEqual(order, IndexSin.validateSize(len(hdr.split('\t')) - FFT_Step.dataOffset()))
+            sCosSin = FFT_Step.readCosSin(testCase, order, sinSource, fr)
+            fw.write((sinSource, '', 0, '', order, '', 'CosSin'), (sCosSin,))
+            while True:
+                for test in (TestType.Forward, TestType.Roundtrip, TestType.Reverse):
+                    param, ssStep = FFT_Step.readSteps(testCase, order, sinSource, dumpStepPath, fr, test)
+                    if not param:
+                        return
+                    fw.write((param.signal.sinSource, param.noiseType, param.noise, param.signal.signalType, 
+                              order, param.signal.freq, test), ssStep)
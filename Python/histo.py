@@ -4,10 +4,16 @@ distribution analysis. Used by tests and notebook-driven analysis pipelines.
 """
 
 import math
+import numpy
 import typing
 
 class Stat:
-    __slots__ = ['_count', '_min', '_max', '_minAt', '_maxAt', '_sum', '_sum2']
+    '''
+    Streaming statistics of count, min, max, mean and deviation.
+    The mean and the sum of squared deviations {_m2} are accumulated by Welford's method,
+        and combined by Chan's method in merge(), so that partial Stat can be reduced in any order.
+    '''
+    __slots__ = ['_count', '_min', '_max', '_minAt', '_maxAt', '_mean', '_m2']
 
     def __init__(self) -> None:
         self._count = 0
@@ -15,17 +21,23 @@ class Stat:
         self._minAt = None
         self._max = 0.0
         self._maxAt = None
-        self._sum = 0.0
-        self._sum2 = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
 
     def __str__(self) -> str:
         match self._count:
             case 0:
                 return '"Stat: 0"'
             case 1:
-                return f'"Stat: 1, {self._sum}"'
+                return f'"Stat: 1, {self._mean}"'
             case _:
                 return f'"Stat: {self._count}, {self.mean()}+/-{self.dev()}"'
+
+    def __getstate__(self):
+        return (self._count, self._min, self._max, self._minAt, self._maxAt, self._mean, self._m2)
+
+    def __setstate__(self, state):
+        self._count, self._min, self._max, self._minAt, self._maxAt, self._mean, self._m2 = state
             
     def accum(self, value:float, at=None) ->bool:
         value = float(value)
@@ -40,10 +52,73 @@ class Stat:
             if at is not None:
                 self._maxAt = at
         self._count += 1
-        self._sum += value
-        self._sum2 += value * value
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
         return True
 
+    def merge(self, other:'Stat') -> 'Stat':
+        '''
+        Combine {other} into self, as if all the values of {other} are accumulated after the values of self.
+        '''
+        if not other._count:
+            return self
+        if (not self._count) or (self._min > other._min):
+            self._min = other._min
+            self._minAt = other._minAt
+        if (not self._count) or (self._max < other._max):
+            self._max = other._max
+            self._maxAt = other._maxAt
+        count = self._count + other._count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * (self._count * other._count / count)
+        self._mean += delta * (other._count / count)
+        self._count = count
+        return self
+
+    def __iadd__(self, other:'Stat') -> 'Stat':
+        return self.merge(other)
+
+    def accum_many(self, values, at=None) -> int:
+        '''
+        Accumulate an array of {values} at once, and return the count of the accumulated values.
+         *) The non-finite values are skipped, as accum().
+         *) {at} is the positions parallel to {values}, default to the indices of {values}.
+        '''
+        sValue = numpy.asarray(values, dtype=float).ravel()
+        sAt = numpy.flatnonzero(numpy.isfinite(sValue))
+        if not len(sAt):
+            return 0
+        if at is None:
+            at = numpy.arange(len(sValue))
+        sValue = sValue[sAt]
+        minAt = at[sAt[numpy.argmin(sValue)]]
+        maxAt = at[sAt[numpy.argmax(sValue)]]
+        with numpy.errstate(over='ignore', invalid='ignore'):
+            mean = numpy.mean(sValue)
+            m2 = numpy.sum(numpy.square(sValue - mean))
+        self.merge(Stat.fromSummary(len(sValue), numpy.min(sValue), numpy.max(sValue), mean, m2,
+                        minAt.item() if isinstance(minAt, numpy.generic) else minAt,
+                        maxAt.item() if isinstance(maxAt, numpy.generic) else maxAt))
+        return len(sValue)
+
+    @staticmethod
+    def fromSummary(count:int, min:float, max:float, mean:float, m2:float, minAt=None, maxAt=None):
+        '''
+        Construct a Stat from the summary of values already reduced elsewhere, such as by numpy,
+            in which {m2} is the sum of the squared deviations from {mean}.
+        '''
+        stat = Stat()
+        if count:
+            stat._count = int(count)
+            stat._min = float(min)
+            stat._max = float(max)
+            stat._minAt = minAt
+            stat._maxAt = maxAt
+            stat._mean = float(mean)
+            stat._m2 = float(m2)
+        return stat
+
     def count(self):
         return self._count
     
@@ -60,13 +135,13 @@ class Stat:
         return self._maxAt
 
     def mean(self):
-        return self._sum / self._count if self._count else float('nan')
+        return self._mean if self._count else float('nan')
 
     def dev(self):
         if not self._count:
             return float('nan')
         try:
-            var = self._sum2 / self._count - self.mean()**2
+            var = self._m2 / self._count
             return math.sqrt(var) if var >= 0 else 0.0
         except OverflowError:
             return float('inf')
@@ -91,6 +166,31 @@ class Histo:
 
     def __str__(self) -> str:
         return str(self._stat)
+
+    def __getstate__(self):
+        return (self._stat.__getstate__(), self._divids, self._devs, self._half, 
+                self._less, self._more, self._sHisto)
+
+    def __setstate__(self, state):
+        self._stat = Stat()
+        stat, self._divids, self._devs, self._half, self._less, self._more, self._sHisto = state
+        self._stat.__setstate__(stat)
+
+    def merge(self, other:'Histo') -> 'Histo':
+        '''
+        Combine {other} of the same "divids" and "devs" into self.
+        '''
+        if (self._divids != other._divids) or (self._half != other._half):
+            raise ValueError(f'Invalid histogram to merge with divids={other._divids} half={other._half}'
+                             f' vs divids={self._divids} half={self._half}')
+        self._stat.merge(other._stat)
+        self._less += other._less
+        self._more += other._more
+        self._sHisto = [count + otherCount for count, otherCount in zip(self._sHisto, other._sHisto)]
+        return self
+
+    def __iadd__(self, other:'Histo') -> 'Histo':
+        return self.merge(other)
     
     def range(self):
         return self._devs
@@ -115,6 +215,24 @@ class Histo:
             self._sHisto[self._half + round(value*self._divids)] += 1
         return True
 
+    def accum_many(self, values, at=None) -> int:
+        '''
+        Accumulate an array of {values} at once, as Stat.accum_many(), 
+            and return the count of the accumulated values.
+        '''
+        count = self._stat.accum_many(values, at)
+        if not count:
+            return 0
+        sValue = numpy.asarray(values, dtype=float).ravel()
+        sValue = sValue[numpy.isfinite(sValue)]
+        self._less += int(numpy.count_nonzero(sValue < -self._devs))
+        self._more += int(numpy.count_nonzero(sValue > self._devs))
+        sValue = sValue[numpy.abs(sValue) <= self._devs]
+        sIndex = self._half + numpy.round(sValue * self._divids).astype(int)
+        sCount = numpy.bincount(sIndex, minlength=len(self._sHisto))
+        self._sHisto = [c + int(n) for c, n in zip(self._sHisto, sCount)]
+        return count
+
     def histogram(self):
         return self._sHisto
     
@@ -7,10 +7,13 @@ is asymmetric (all odd central moments are nonzero).
 import abc
 import datetime
 import math
+import mpmath
+import numpy
 import os
 import scipy.special
 import scipy.stats
 import sympy
+import typing
 
 from indexSin import OUTDIR
 
@@ -83,6 +86,65 @@ class Normal (Moment):
                 for i, mmt in enumerate(sMoment):
                     f.write(f'{i*2}\t{mmt}\n')
 
+    PRECISE_NORM_DIGITS = 20
+
+    @staticmethod
+    def _recurNorm(bounding:float, maxOrder:int, dps:int) -> typing.Iterator[tuple[int, mpmath.mpf, float]]:
+        '''
+        Yield the order n, the normalized moment at the working precision {dps}, 
+            and the digits lost by the cancellation of the recurrence so far,
+            until the moment is no longer finite as float.
+        '''
+        with mpmath.workdps(dps):
+            b = mpmath.mpf(bounding)
+            boundary = 2 * mpmath.npdf(b) / mpmath.erf(b / mpmath.sqrt(2)) * b
+            mmt = mpmath.mpf(1)
+            amplify = 0.0
+            yield 0, mmt, 0.0
+            for n in range(2, maxOrder, 2):
+                mmt = (n - 1) * mmt - boundary
+                boundary *= b * b
+                amplify += math.log10(n - 1)
+                if (mmt <= 0) or (not math.isfinite(float(mmt))):
+                    break
+                yield n, mmt, amplify - float(mpmath.log10(mmt))
+
+    @staticmethod
+    def calcRecurNorm(bounding:float=5.0, maxOrder:int=1000000, digits:int=PRECISE_NORM_DIGITS, 
+                      filePath:str=None) -> list[mpmath.mpf]:
+        '''
+        The same normalized moments as calcPreciseNorm(), but by the closed-form recurrence in mpmath:
+            ζ(n) = (n-1) ζ(n-2) - 2 {bounding}^(n-1) ρ({bounding}) / ∫ρ dz,
+            in which the working precision covers both {digits} and the digits lost by the cancellation.
+        The moments are appended to {filePath} in the format of readPreciseNorm() as each is calculated,
+            resuming after the last order of an existing {filePath} for the same {bounding}.
+        '''
+        if filePath is None:
+            filePath = f'{OUTDIR}/Python/NormalMoment_{bounding}.txt'
+        dps, lost = digits, 0
+        while dps < digits + lost + 10:
+            dps = digits + math.ceil(lost) + 30
+            lost = max(lost for n, mmt, lost in Normal._recurNorm(bounding, maxOrder, dps))
+        written = 0
+        if os.path.isfile(filePath):
+            try:
+                b, sWritten = Normal.readPreciseNorm(filePath)
+                if b == bounding:
+                    written = len(sWritten)
+            except ValueError:
+                pass
+        sMoment = []
+        with open(filePath, 'a' if written else 'w') as f:
+            if not written:
+                f.write(f'n\tMoment\tBounding:\t{bounding}\n')
+            for n, mmt, _ in Normal._recurNorm(bounding, maxOrder, dps):
+                sMoment.append(mmt)
+                if (n // 2) < written:
+                    continue
+                f.write(f'{n}\t{mpmath.nstr(mmt, digits)}\n')
+                f.flush()
+        return sMoment
+
     def __init__(self, bounding:float=5, maxOrder:int=1000000):
         self._bounding = bounding
         filePath = f'{OUTDIR}/Python/Output/NormalMoment_{bounding}.txt'
@@ -153,6 +215,46 @@ class Normal (Moment):
                 mmt = self[n]
                 f.write(f'{n}\t{mmt}\n')
 
+    @staticmethod
+    def sweep(sBounding:tuple[float], maxOrder:int=1000000) -> tuple['NormalView']:
+        '''
+        The same moments as Normal(bounding, maxOrder) for each of {sBounding}, 
+            but calculated in one vectorized pass over the orders, and without the moment files.
+        Each returned NormalView is a row of one shared moment array.
+        '''
+        sBounding = numpy.asarray(sBounding, dtype=float)
+        bounding2 = sBounding**2
+        term = 2 * scipy.stats.norm.pdf(sBounding) * sBounding
+        sCount = numpy.full(len(sBounding), -1)
+        ssTerm = []
+        with numpy.errstate(over='ignore', invalid='ignore'):
+            for n in range(maxOrder):
+                sTerm = term * (1/(2*n + 1))
+                sCount[(sCount < 0) & ~numpy.isfinite(sTerm)] = n
+                if numpy.all(0 <= sCount):
+                    break
+                ssTerm.append(numpy.where(numpy.isfinite(sTerm), sTerm, 0))
+                term = term * bounding2
+            sLimit = numpy.where(sCount < 0, n, sCount)
+            sCount = numpy.where(sCount < 0, len(ssTerm), sCount)
+            ssTerm = numpy.array(ssTerm).T
+            ssMoment = ssTerm.copy()
+            sOrder = numpy.arange(ssTerm.shape[1])
+            # The moments converge from the high orders, so as Normal.__init__(), 
+            #   stop updating from the first order whose moment no longer changes.
+            for j in range(2, maxOrder):
+                ssActive = sOrder < sLimit[:, numpy.newaxis]
+                ssTerm = numpy.where(ssActive, 
+                            ssTerm * ((1/(2*sOrder - 1 + 2*j))[numpy.newaxis, :] * bounding2[:, numpy.newaxis]), ssTerm)
+                ssNew = ssMoment + ssTerm
+                ssSame = ssActive & (ssNew == ssMoment)
+                sLimit = numpy.where(ssSame.any(axis=1), numpy.argmax(ssSame, axis=1), sLimit)
+                ssMoment = numpy.where(sOrder < sLimit[:, numpy.newaxis], ssNew, ssMoment)
+                if not numpy.any(sLimit):
+                    break
+        ssMoment /= ssMoment[:, :1]
+        return tuple(NormalView(bounding, ssMoment[k, :sCount[k]]) for k, bounding in enumerate(sBounding.tolist()))
+
     @property
     def bounding(self):
         return self._bounding
@@ -176,6 +278,22 @@ class Normal (Moment):
         return self._sMoment[n]
 
 
+class NormalView (Normal):
+    '''
+    Normal moment for {bounding} as a view of the moment array {sMoment} shared by Normal.sweep().
+    '''
+    __slots__ = ()
+
+    def __init__(self, bounding:float, sMoment:numpy.ndarray):
+        self._bounding = bounding
+        self._sMoment = sMoment
+        self._maxOrder = len(sMoment) * 2
+
+    def __getitem__(self, n:int) -> float:
+        mmt = super().__getitem__(n)
+        return float(mmt) if isinstance(mmt, numpy.floating) else mmt
+
+
 class Uniform:
     '''
     Pre-calculated variance moment for uniform distribution [-1, 1].
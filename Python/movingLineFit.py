@@ -4,6 +4,9 @@ fitting strategies used to estimate uncertainty propagation in noisy data.
 """
 import enum
 import math
+import typing
+
+import numpy
 
 import varDbl
 
@@ -13,6 +16,9 @@ class FitType (enum.Enum):
     MOVING_NO_VAR_ADJ = -1,
 
 
+RESYNC_STEPS = 1 << 10
+    # the steps between the exact re-summation of the progressive variances in FitType.MOVING
+
 
 def movingLineFit(sInput, half:int, fitType:FitType) ->tuple[tuple[tuple[varDbl.VarDbl]]]:
     '''
@@ -21,6 +27,11 @@ def movingLineFit(sInput, half:int, fitType:FitType) ->tuple[tuple[tuple[varDbl.
      *) LOCAL: not progressively, as a testing standard
      *) MOVING_ADJUST: progressive moving window with adjusting the variance
      *) MOVING_NO_ADJUST: progressive moving window without adjusting the variance,
+
+    For FitType.MOVING, the variances are also progressive, using the variance sums 
+        t0 = Σvar[k], t1 = Σk*var[k], t2 = Σk^2*var[k] with k relative to the window center:
+     *) When the window moves by 1, k becomes k - 1, so t2 -= 2*t1 - t0, t1 -= t0.
+     *) Every RESYNC_STEPS, the sums are recalculated to bound the rounding drift.
     '''
     full = 2 * half + 1
     denom0 = 1 /full
@@ -29,6 +40,9 @@ def movingLineFit(sInput, half:int, fitType:FitType) ->tuple[tuple[tuple[varDbl.
     def value(val):
         return val.value() if type(val) == varDbl.VarDbl else val
 
+    def variance(val):
+        return val.variance() if type(val) == varDbl.VarDbl else 0
+
     match fitType:
         case FitType.LOCAL:
             return tuple([(sum(sInput[j - half: j + half + 1])*denom0,
@@ -47,28 +61,207 @@ def movingLineFit(sInput, half:int, fitType:FitType) ->tuple[tuple[tuple[varDbl.
         case FitType.MOVING:
             denom0sq = denom0**2
             denom1sq = denom1**2
+            sq = half**2
+
+            def resync(center):
+                sVar = [variance(sInput[center + k]) for k in range(-half, half + 1)]
+                return sum(sVar), \
+                       sum([k * var for k, var in zip(range(-half, half + 1), sVar)]), \
+                       sum([k**2 * var for k, var in zip(range(-half, half + 1), sVar)])
+
             c0 = sum([value(sInput[k]) for k in range(1, full)])
             c1 = sum([k * value(sInput[half + k])for k in range(-half, half + 1)])
-            v0 = sum([sInput[k].variance() for k in range(full) if type(sInput[k]) == varDbl.VarDbl])
-            v1 = sum([k**2 * sInput[half + k].variance()
-                      for k in range(-half, half + 1) if type(sInput[half + k]) == varDbl.VarDbl])
-            sFit = [(varDbl.VarDbl((value(sInput[0]) + c0)*denom0, math.sqrt(v0 *denom0sq)),
-                     varDbl.VarDbl(c1 *denom1, math.sqrt(v1 *denom1sq)))]
+            t0, t1, t2 = resync(half)
+            sFit = [(varDbl.VarDbl((value(sInput[0]) + c0)*denom0, math.sqrt(t0 *denom0sq)),
+                     varDbl.VarDbl(c1 *denom1, math.sqrt(t2 *denom1sq)))]
             for j in range(full, len(sInput)):
                 c1 += half*(value(sInput[j - full]) + value(sInput[j])) - c0
-                v1 = sum([k**2 * sInput[j - half + k].variance()
-                          for k in range(-half, half + 1) if type(sInput[j - half + k]) == varDbl.VarDbl])
-                
                 c0 += value(sInput[j]) - value(sInput[j - full + 1])
-                if (type(sInput[j]) == varDbl.VarDbl):
-                    v0 += sInput[j].variance()
-                if (type(sInput[j - full + 1]) == varDbl.VarDbl):
-                    v0 -= sInput[j - full + 1].variance()
+                if (j - full + 1) % RESYNC_STEPS:
+                    var = variance(sInput[j - full])
+                    t0 -= var
+                    t1 += half * var
+                    t2 -= sq * var
+                    t2 -= 2*t1 - t0
+                    t1 -= t0
+                    var = variance(sInput[j])
+                    t0 += var
+                    t1 += half * var
+                    t2 += sq * var
+                else:
+                    t0, t1, t2 = resync(j - half)
 
-                sFit.append((varDbl.VarDbl((value(sInput[j - full + 1]) + c0)*denom0, math.sqrt(v0 *denom0sq)), 
-                             varDbl.VarDbl(c1 *denom1, math.sqrt(v1 *denom1sq))))
+                sFit.append((varDbl.VarDbl((value(sInput[j - full + 1]) + c0)*denom0, math.sqrt(max(t0, 0) *denom0sq)), 
+                             varDbl.VarDbl(c1 *denom1, math.sqrt(max(t2, 0) *denom1sq))))
             return tuple(sFit)
         
         case _:
             raise NotImplemented()
     
+
+
+def movingLineFitArray(sValue:numpy.ndarray, sVariance:numpy.ndarray, half:int, fitType:FitType) \
+        -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    '''
+    Vectorized movingLineFit() for many timeseries of the same length n at once,
+        whose values and variances are the last axis of {sValue} and {sVariance}, such as (channels, n).
+    Return the arrays of (value, value uncertainty, slope, slope uncertainty), each of shape (..., n - 2*"half"),
+        according to "fitType":
+     *) LOCAL: each window is summed by the matrix product of the sliding window with the fitting kernel.
+     *) MOVING: each window is the difference of the cumulative sums, 
+            which restart every ("half"*2 + 1) windows to bound the rounding errors.
+    '''
+    sValue = numpy.asarray(sValue, dtype=numpy.float64)
+    sVariance = numpy.asarray(sVariance, dtype=numpy.float64)
+    if sValue.shape != sVariance.shape:
+        raise ValueError(f'Invalid variance shape {sVariance.shape} for value shape {sValue.shape}')
+    full = 2 * half + 1
+    denom0 = 1 /full
+    denom1 = 3 /half /(half + 1) /full
+    sK = numpy.arange(-half, half + 1, dtype=numpy.float64)
+
+    match fitType:
+        case FitType.LOCAL:
+            ssValue = numpy.lib.stride_tricks.sliding_window_view(sValue, full, axis=-1)
+            ssVariance = numpy.lib.stride_tricks.sliding_window_view(sVariance, full, axis=-1)
+            return ssValue.sum(axis=-1) *denom0, numpy.sqrt(ssVariance.sum(axis=-1)) *denom0, \
+                   (ssValue @ sK) *denom1, numpy.sqrt(ssVariance @ (sK * sK)) *denom1
+
+        case FitType.MOVING:
+            count = sValue.shape[-1] - 2 * half
+            block = -(-count // full)
+            sPad = [(0, 0)] * (sValue.ndim - 1) + [(0, block * full - count)]
+            sP = numpy.arange(2 * full - 1, dtype=numpy.float64)
+            sC = numpy.arange(half, half + full, dtype=numpy.float64)
+
+            def segments(sData):
+                return numpy.lib.stride_tricks.sliding_window_view(
+                            numpy.pad(sData, sPad), 2 * full - 1, axis=-1)[..., ::full, :]
+
+            def windows(ssSeg):
+                ssCum = numpy.cumsum(ssSeg, axis=-1)
+                ssCum = numpy.concatenate((numpy.zeros(ssCum.shape[:-1] + (1,)), ssCum), axis=-1)
+                return ssCum[..., full:] - ssCum[..., :-full]
+
+            def flatten(ssWin):
+                return ssWin.reshape(ssWin.shape[:-2] + (block * full,))[..., :count]
+
+            ssVal = segments(sValue)
+            ssVar = segments(sVariance)
+            c0 = windows(ssVal)
+            c1 = windows(ssVal * sP) - sC * c0
+            t0 = windows(ssVar)
+            t1 = windows(ssVar * sP)
+            t2 = windows(ssVar * sP * sP) - 2 * sC * t1 + sC * sC * t0
+            return flatten(c0) *denom0, numpy.sqrt(numpy.maximum(flatten(t0), 0)) *denom0, \
+                   flatten(c1) *denom1, numpy.sqrt(numpy.maximum(flatten(t2), 0)) *denom1
+
+        case _:
+            raise ValueError(f'Invalid fitType={fitType}')
+
+
+class MovingLineFit:
+    '''
+    Streaming movingLineFit() with the same results, which consumes the samples one at a time by add(),
+        or from an iterable by fit(), and keeps only the latest ("half"*2 + 1) samples in a ring buffer.
+    Each fit (value, slope) is for the center of the window, and is available as soon as the window is complete.
+    '''
+
+    def __init__(self, half:int, fitType:FitType) -> None:
+        if fitType not in (FitType.LOCAL, FitType.MOVING, FitType.MOVING_NO_VAR_ADJ):
+            raise ValueError(f'Invalid fitType={fitType}')
+        self.half = half
+        self.full = 2 * half + 1
+        self.fitType = fitType
+        self.denom0 = 1 /self.full
+        self.denom1 = 3 /half /(half + 1) /self.full
+        self.sBuffer = [None] * self.full
+        self.count = 0
+
+    @staticmethod
+    def value(val):
+        return val.value() if type(val) == varDbl.VarDbl else val
+
+    @staticmethod
+    def variance(val):
+        return val.variance() if type(val) == varDbl.VarDbl else 0
+
+    def window(self) -> list:
+        '''
+        The latest ("half"*2 + 1) samples in time order.
+        '''
+        start = self.count % self.full
+        return self.sBuffer[start:] + self.sBuffer[:start]
+
+    def add(self, sample) -> typing.Optional[tuple]:
+        '''
+        Add {sample}, and return the fit of the window ending at {sample}, or None if the window is not complete.
+        '''
+        half = self.half
+        full = self.full
+        j = self.count
+        at = j % full
+        leaving = self.sBuffer[at]
+        self.sBuffer[at] = sample
+        self.count += 1
+        if self.count < full:
+            return None
+        first = self.sBuffer[self.count % full]
+        match self.fitType:
+            case FitType.LOCAL:
+                sWindow = self.window()
+                return (sum(sWindow)*self.denom0,
+                        sum([k * sWindow[half + k] for k in range(-half, half + 1)])*self.denom1)
+            case FitType.MOVING_NO_VAR_ADJ:
+                if j == full - 1:
+                    sWindow = self.window()
+                    self.c0 = sum(sWindow[1:])
+                    self.c1 = sum([k * sWindow[half + k] for k in range(-half, half + 1)])
+                    return ((sWindow[0] + self.c0)*self.denom0, self.c1*self.denom1)
+                self.c1 += half*(leaving + sample) - self.c0
+                self.c0 += sample - first
+                return ((first + self.c0)*self.denom0, self.c1*self.denom1)
+            case FitType.MOVING:
+                value = MovingLineFit.value
+                variance = MovingLineFit.variance
+                if j == full - 1:
+                    sWindow = self.window()
+                    self.c0 = sum([value(sWindow[k]) for k in range(1, full)])
+                    self.c1 = sum([k * value(sWindow[half + k])for k in range(-half, half + 1)])
+                    self._resync()
+                    return (varDbl.VarDbl((value(sWindow[0]) + self.c0)*self.denom0, math.sqrt(self.t0 *self.denom0**2)),
+                            varDbl.VarDbl(self.c1 *self.denom1, math.sqrt(self.t2 *self.denom1**2)))
+                self.c1 += half*(value(leaving) + value(sample)) - self.c0
+                self.c0 += value(sample) - value(first)
+                if (j - full + 1) % RESYNC_STEPS:
+                    var = variance(leaving)
+                    self.t0 -= var
+                    self.t1 += half * var
+                    self.t2 -= half**2 * var
+                    self.t2 -= 2*self.t1 - self.t0
+                    self.t1 -= self.t0
+                    var = variance(sample)
+                    self.t0 += var
+                    self.t1 += half * var
+                    self.t2 += half**2 * var
+                else:
+                    self._resync()
+                return (varDbl.VarDbl((value(first) + self.c0)*self.denom0, math.sqrt(max(self.t0, 0) *self.denom0**2)), 
+                        varDbl.VarDbl(self.c1 *self.denom1, math.sqrt(max(self.t2, 0) *self.denom1**2)))
+
+    def _resync(self):
+        sVar = [MovingLineFit.variance(val) for val in self.window()]
+        sK = range(-self.half, self.half + 1)
+        self.t0 = sum(sVar)
+        self.t1 = sum([k * var for k, var in zip(sK, sVar)])
+        self.t2 = sum([k**2 * var for k, var in zip(sK, sVar)])
+
+    def fit(self, sInput:typing.Iterable) -> typing.Iterator[tuple]:
+        '''
+        Add the samples from {sInput} one by one, and yield each fit as soon as it is available.
+        {sInput} can be a chunk of a longer timeseries, and the next chunk can be fitted by another call.
+        '''
+        for sample in sInput:
+            fit = self.add(sample)
+            if fit is not None:
+                yield fit
@@ -3,8 +3,11 @@ Recursive calculation of sine and cosine from sin(0) = 0 and sin(PI/2) = 1
 '''
 import os
 
+import numpy
+
 from indexSin import IndexSin, SinSource
 import varDbl
+from varTrace import VarTrace
 
 
 class RecursiveSin:
@@ -27,10 +30,13 @@ class RecursiveSin:
     def sin(self, freq:int) -> varDbl.VarDbl:
         return self._indexSin.sin(freq, self._order)
 
-    def calc(self):
+    def calc(self, byLevel:bool=False):
         '''
         Return None for successfully calculating the fsin which contain sin with uncertainty.
         Otherwise return error string
+
+        When {byLevel} is true, the midpoints of each recursion order are calculated together,
+            and written once per order, so that the lines are sorted by the order instead of depth-first.
         '''
         self._sSin[0] = RecursiveSin.ZERO
         self._sSin[self._half] = RecursiveSin.ONE
@@ -52,12 +58,60 @@ class RecursiveSin:
                         f'0\t{self._half}\t1\t0\t1\t0\t0\t0\n')
             ferr.write("Order\tSin Index\tCos Index\tRegr Error\tRegr Uncertainty\tRegr Normalized\tQuart Error\tQuart Uncertainty\tQuart Normalized\n")
             ferr.write(f'0\t0\t{self._half}\t0\t0\t\t0\t0\t\n')
-            self._calc(0, self._half, 1, fsin, ferr)
+            if byLevel:
+                self._calcByLevel(fsin, ferr)
+            else:
+                self._calc(0, self._half, 1, fsin, ferr)
         sMissing = [i for i,s in enumerate(self._sSin) if s is None]
         if sMissing:
             raise RuntimeError(f'order {self._order} missing {len(sMissing)} indices: {sMissing}')
 
 
+    @staticmethod
+    def _sinLine(order, i, quart:float, quartUnc:float, regr:float, regrUnc:float) -> str:
+        '''
+        The line of the sin file for index {i} at the recursion {order}.
+        '''
+        err = regr - quart
+        norm = f'{err/regrUnc}' if regrUnc else ''
+        return f'{order}\t{i}\t{quart}\t{quartUnc}\t{regr}\t{regrUnc}\t{err}\t{norm}\n'
+
+    @staticmethod
+    def _errLine(order, smid, cmid, regrErr:float, regrErrUnc:float, quartErr:float, quartErrUnc:float) -> str:
+        '''
+        The line of the error file of sin^2 + cos^2 - 1 for {smid} and {cmid} at the recursion {order}.
+        '''
+        regrNorm = f'{regrErr/regrErrUnc}' if regrErrUnc else ''
+        quartNorm = f'{quartErr/quartErrUnc}' if quartErrUnc else ''
+        return f'{order}\t{smid}\t{cmid}\t{regrErr}\t{regrErrUnc}\t{regrNorm}\t{quartErr}\t{quartErrUnc}\t{quartNorm}\n'
+
+    @staticmethod
+    def _unitErr(sin:varDbl.VarDbl, cos:varDbl.VarDbl) -> varDbl.VarDbl:
+        return sin **2 + cos **2 - 1
+
+    @staticmethod
+    def _sinMid(cosBegin:varDbl.VarDbl, cosEnd:varDbl.VarDbl, sinBegin:varDbl.VarDbl, sinEnd:varDbl.VarDbl) -> varDbl.VarDbl:
+        x = cosBegin * cosEnd - sinBegin * sinEnd
+        return ((RecursiveSin.ONE - x) *RecursiveSin.HALF) ** 0.5
+
+    @staticmethod
+    def _cosMid(cosBegin:varDbl.VarDbl, cosEnd:varDbl.VarDbl, sinBegin:varDbl.VarDbl, sinEnd:varDbl.VarDbl) -> varDbl.VarDbl:
+        x = cosBegin * cosEnd - sinBegin * sinEnd
+        return ((RecursiveSin.ONE + x) *RecursiveSin.HALF) ** 0.5
+
+    def _record(self, order, smid, cmid) -> tuple[str, str]:
+        '''
+        The lines of the sin file and the error file for {smid} and {cmid} at the recursion {order}.
+        '''
+        sLine = []
+        for i in ((smid,) if smid == cmid else (smid, cmid)):
+            sLine.append(RecursiveSin._sinLine(order, i, self.sin(i).value(), self.sin(i).uncertainty(),
+                                               self._sSin[i].value(), self._sSin[i].uncertainty()))
+        regrErr = RecursiveSin._unitErr(self._sSin[smid], self._sSin[cmid])
+        quartErr = RecursiveSin._unitErr(self.sin(smid), self.sin(cmid))
+        return ''.join(sLine), RecursiveSin._errLine(order, smid, cmid, regrErr.value(), regrErr.uncertainty(),
+                                                     quartErr.value(), quartErr.uncertainty())
+
     def _calc(self, begin, end, order, fsin, ferr):
         if order > self._order:
             return None
@@ -69,37 +123,44 @@ class RecursiveSin:
                 self._sSin[smid] = ((RecursiveSin.ONE - x) *RecursiveSin.HALF) ** 0.5
             if self._sSin[cmid] is None:
                 self._sSin[cmid] = ((RecursiveSin.ONE + x) *RecursiveSin.HALF) ** 0.5
-            err = self._sSin[smid].value() - self.sin(smid).value()
-            fsin.write(f'{order}\t{smid}\t{self.sin(smid).value()}\t{self.sin(smid).uncertainty()}\t{self._sSin[smid].value()}\t{self._sSin[smid].uncertainty()}\t{err}')
-            if self._sSin[smid].uncertainty():
-                fsin.write(f'\t{err/self._sSin[smid].uncertainty()}\n')
-            else:
-                fsin.write(f'\t\n')
-            if smid != cmid:
-                err = self._sSin[cmid].value() - self.sin(cmid).value()
-                fsin.write(f'{order}\t{cmid}\t{self.sin(cmid).value()}\t{self.sin(cmid).uncertainty()}\t{self._sSin[cmid].value()}\t{self._sSin[cmid].uncertainty()}\t{err}')
-                if self._sSin[cmid].uncertainty():
-                    fsin.write(f'\t{err/self._sSin[cmid].uncertainty()}\n')
-                else:
-                    fsin.write(f'\t\n')
+            sinLine, errLine = self._record(order, smid, cmid)
+            fsin.write(sinLine)
             fsin.flush()
-            ferr.write(f'{order}\t{smid}\t{cmid}')
-            err = self._sSin[smid] **2 + self._sSin[cmid] **2 - 1   
-            ferr.write(f'\t{err.value()}\t{err.uncertainty()}')
-            if err.uncertainty():
-                ferr.write(f'\t{err.value()/err.uncertainty()}')
-            else:
-                ferr.write('\t')
-            err = self.sin(smid) **2 + self.sin(cmid) **2 - 1   
-            ferr.write(f'\t{err.value()}\t{err.uncertainty()}')
-            if err.uncertainty():
-                ferr.write(f'\t{err.value()/err.uncertainty()}\n')
-            else:
-                ferr.write('\t\n')
+            ferr.write(errLine)
         self._calc(begin, smid, order + 1, fsin, ferr)
         self._calc(smid, end, order + 1, fsin, ferr)
-        
-
-    
-
 
+    def _calcByLevel(self, fsin, ferr):
+        '''
+        The same as _calc() but for all the midpoints of each recursion order together,
+            which only depend on the midpoints of the lower orders.
+        At the recursion {order}, the new midpoints are the odd multiples of half the interval {step}, 
+            in which {smid} up to a quarter determines both itself and {cmid} as in _calc().
+        The midpoints, the error check and the record of an order are replayed by VarTrace as arrays.
+        '''
+        sinTrace, cosTrace = VarTrace(RecursiveSin._sinMid, 4), VarTrace(RecursiveSin._cosMid, 4)
+        errTrace = VarTrace(RecursiveSin._unitErr, 2)
+        sQuart = [self.sin(i) for i in range(self._half + 1)]
+        sQuartValue = numpy.array([s.value() for s in sQuart])
+        sQuartUnc = numpy.array([s.uncertainty() for s in sQuart])
+        sValue, sUnc = numpy.zeros(self._half + 1), numpy.zeros(self._half + 1)
+        sValue[self._half] = 1
+        for order in range(1, self._order):
+            step = self._half >> (order - 1)
+            sSmid = numpy.arange(step >> 1, (self._half >> 1) + 1, step)
+            sCmid = self._half - sSmid
+            sBegin, sEnd = sSmid - (step >> 1), sSmid + (step >> 1)
+            sInput = [(sValue[sIdx], sUnc[sIdx]) for sIdx in (self._half - sBegin, self._half - sEnd, sBegin, sEnd)]
+            sValue[sCmid], sUnc[sCmid] = cosTrace.replay(*sInput)
+            sValue[sSmid], sUnc[sSmid] = sinTrace.replay(*sInput)
+            sRegrErr, sRegrErrUnc = errTrace.replay((sValue[sSmid], sUnc[sSmid]), (sValue[sCmid], sUnc[sCmid]))
+            sQuartErr, sQuartErrUnc = errTrace.replay((sQuartValue[sSmid], sQuartUnc[sSmid]), 
+                                                      (sQuartValue[sCmid], sQuartUnc[sCmid]))
+            sIdx = numpy.unique(numpy.concatenate((sSmid, sCmid)))
+            ssRow = [sIdx.tolist()] + [s[sIdx].tolist() for s in (sQuartValue, sQuartUnc, sValue, sUnc)]
+            for i, quart, quartUnc, regr, regrUnc in zip(*ssRow):
+                self._sSin[i] = varDbl.VarDbl(regr, regrUnc)
+            fsin.write(''.join(RecursiveSin._sinLine(order, *sRow) for sRow in zip(*ssRow)))
+            ferr.write(''.join(RecursiveSin._errLine(order, *sRow) for sRow in 
+                               zip(sSmid.tolist(), sCmid.tolist(), sRegrErr.tolist(), sRegrErrUnc.tolist(), 
+                                   sQuartErr.tolist(), sQuartErrUnc.tolist())))
@@ -0,0 +1,89 @@
+"""Vectorized sampling study of the bounding leakage and the linear leakage
+of normal samples, which replaces the per-sample Python loops of
+testManual.TestNormal: the samples are grouped as (count × samples) views,
+the sample mean and deviation are reduced along the group axis, and the
+leakage of all bounding factors kappa is evaluated as one broadcast array.
+The samples can be generated chunk by chunk, so that the whole sample
+buffer never sits in memory.
+"""
+import math
+import typing
+
+import numpy
+import scipy
+
+INV_SQRT2 = 1.0 / math.sqrt(2)
+
+MAX_COUNT = 100000
+CHUNK_SIZE = 1 << 24
+    # the count of samples generated at once
+
+
+def groupStat(sSample:numpy.ndarray, samples:int, maxCount:int=MAX_COUNT) -> tuple[numpy.ndarray, numpy.ndarray]:
+    '''
+    The sample means and the sample standard deviations of the groups of {samples} in {sSample},
+        as a (count × samples) view of {sSample} without copying.
+    The count of the groups is limited by {maxCount}, and the trailing partial group is dropped.
+    '''
+    count = min(len(sSample) // samples, maxCount)
+    ssSample = sSample[:count * samples].reshape(count, samples)
+    return ssSample.mean(axis=1), ssSample.std(axis=1)
+
+
+def chunkedGroupStat(samples:int, count:int=MAX_COUNT, chunkSize:int=CHUNK_SIZE,
+                     rng:numpy.random.Generator=None) -> tuple[numpy.ndarray, numpy.ndarray]:
+    '''
+    The same as groupStat() for {count} groups of {samples} standard normal samples from {rng},
+        which are generated at most {chunkSize} samples at a time.
+    '''
+    if rng is None:
+        rng = numpy.random.default_rng()
+    sMean = numpy.empty(count)
+    sDev = numpy.empty(count)
+    groups = max(1, chunkSize // samples)
+    for start in range(0, count, groups):
+        end = min(start + groups, count)
+        sMean[start:end], sDev[start:end] = groupStat(
+                rng.standard_normal((end - start) * samples), samples, end - start)
+    return sMean, sDev
+
+
+def boundingLeakage(sMean:numpy.ndarray, sDev:numpy.ndarray, sKappa:typing.Sequence[float]) -> numpy.ndarray:
+    '''
+    The sample bounding leakage of normal distribution,
+        with the rows for the bounding factors {sKappa} and the columns for the sample means {sMean}
+        and the sample standard deviations {sDev}.
+    '''
+    mu = numpy.asarray(sMean)[numpy.newaxis, :]
+    ssBound = numpy.asarray(sKappa, dtype=float)[:, numpy.newaxis] * numpy.asarray(sDev)[numpy.newaxis, :]
+    return 1 - scipy.special.erf(numpy.abs(ssBound - mu) * INV_SQRT2)*0.5 \
+             - scipy.special.erf(numpy.abs(ssBound + mu) * INV_SQRT2)*0.5
+
+
+def linearLeakage(sMean:numpy.ndarray, sDev:numpy.ndarray, sKappa:typing.Sequence[float]) -> numpy.ndarray:
+    '''
+    The result leakage of normal distribution, in the same layout as boundingLeakage().
+    '''
+    mu = numpy.asarray(sMean)[numpy.newaxis, :]
+    ssBound = numpy.asarray(sKappa, dtype=float)[:, numpy.newaxis] * numpy.asarray(sDev)[numpy.newaxis, :]
+    k1 = numpy.abs(mu + ssBound)
+    k2 = numpy.abs(mu - ssBound)
+    return k1*scipy.stats.norm.pdf(k1) / scipy.special.erf(k1 * INV_SQRT2) + \
+           k2*scipy.stats.norm.pdf(k2) / scipy.special.erf(k2 * INV_SQRT2)
+
+
+def linearKappa(leak:float, kappa:float, minKappa:float, resolution:int) -> typing.Optional[float]:
+    '''
+    The largest bounding factor on the grid of 1/{resolution} between {minKappa} and {kappa} exclusively,
+        whose linear leakage of the standard normal distribution is still more than {leak}.
+    Return None if it is at either end of the grid, as the bisection in testManual.TestNormal.
+    '''
+    leftest = int(minKappa * resolution)
+    rightest = int(kappa * resolution)
+    if leftest + 1 >= rightest:
+        return None
+    sLeak = linearLeakage((0,), (1,), numpy.arange(leftest + 1, rightest) / resolution)[:, 0]
+    more = int(numpy.count_nonzero(sLeak > leak))
+    if (more == 0) or (more == len(sLeak)):
+        return None
+    return (leftest + more) / resolution
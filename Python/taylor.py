@@ -5,11 +5,20 @@ Thus, each function needs to be calculated independently
 
 '''
 import collections
+import concurrent.futures
+import contextlib
+import functools
+import inspect
 import math
 import logging
+import re
+import time
 import typing
 import unittest
 
+import numpy
+
+from histo import Stat
 import moment
 from varDbl import VarDbl, InitException
 
@@ -57,9 +66,250 @@ class NotStableException (Taylor1dException):
 class NotFiniteException (Taylor1dException):
     pass
 
+class Convergence:
+    '''
+    Convergence policy for Taylor.taylor1d() to stop the expansion before {moment.maxOrder}
+        once {consecutive} successive expansion terms are all below the ULP of the accumulated totals, 
+        i.e., both abs(newValue) < ulp(value) and abs(newVariance) < ulp(variance).
+    The expansion still stops only after the monotonic count reaches {Taylor.MIN_MONOTONIC_COUNT} when checkMinMonotonic=True,
+        and the stability check is still applied to the last expansion term.
+    After each Taylor.taylor1d(), {orders} is the max expansion order used.
+    '''
+    __slots__ = ('consecutive', 'orders')
+
+    def __init__(self, consecutive:int=8) -> None:
+        if consecutive < 1:
+            raise ValueError(f'Invalid consecutive={consecutive} for convergence')
+        self.consecutive = consecutive
+        self.orders = 0
+
+    def __str__(self) -> str:
+        return f'Convergence(consecutive={self.consecutive}, orders={self.orders})'
+
+
+class TaylorProfile:
+    '''
+    Opt-in profiling counters of Taylor.taylor1d(), which is enabled by setting {Taylor.profile}.
+    The key is {name} of taylor1d() with the arguments in the parenthesis removed, such as "exp()" or "()**-1.5".
+    For each key:
+     *) "calls": the count of calls.
+     *) "orders": Stat of the max expansion orders evaluated.
+     *) "time": Stat of the wall time in seconds.
+     *) "timeHisto": the count of calls by the decade of the wall time, such as -4 for [1e-4, 1e-3) seconds.
+     *) "exceptions": the count of calls by the exception type name.
+    '''
+    MIN_SECONDS = 1e-9
+    HEADER = 'Name\tCalls\tOrders Mean\tOrders Maximum\tTime Total\tTime Mean\tTime Maximum\tTime Histogram\tExceptions\n'
+
+    def __init__(self) -> None:
+        self.sCounter = {}
+
+    def clear(self):
+        self.sCounter.clear()
+
+    @staticmethod
+    def key(name:str) -> str:
+        return re.sub(r'\([^()]*\)', '()', name)
+
+    def record(self, name:str, seconds:float, orders:int=None, exception:BaseException=None):
+        counter = self.sCounter.get(key := TaylorProfile.key(name))
+        if counter is None:
+            counter = self.sCounter[key] = \
+                    {'calls': 0, 'orders': Stat(), 'time': Stat(), 'timeHisto': {}, 'exceptions': {}}
+        counter['calls'] += 1
+        if orders is not None:
+            counter['orders'].accum(orders)
+        counter['time'].accum(seconds)
+        decade = math.floor(math.log10(max(seconds, TaylorProfile.MIN_SECONDS)))
+        counter['timeHisto'][decade] = counter['timeHisto'].get(decade, 0) + 1
+        if exception is not None:
+            exName = type(exception).__name__
+            counter['exceptions'][exName] = counter['exceptions'].get(exName, 0) + 1
+
+    def asDict(self) -> dict[str, dict]:
+        return {key: {'calls': counter['calls'], 
+                      'orders': {'mean': counter['orders'].mean(), 'max': counter['orders'].max()},
+                      'time': {'total': counter['time'].mean() * counter['time'].count(),
+                               'mean': counter['time'].mean(), 'max': counter['time'].max()},
+                      'timeHisto': dict(sorted(counter['timeHisto'].items())),
+                      'exceptions': dict(counter['exceptions'])}
+                for key, counter in self.sCounter.items()}
+
+    def table(self) -> str:
+        sLine = [TaylorProfile.HEADER]
+        for key, counter in sorted(self.asDict().items()):
+            sLine.append(f"{key}\t{counter['calls']}\t{counter['orders']['mean']}\t{counter['orders']['max']}"
+                         f"\t{counter['time']['total']}\t{counter['time']['mean']}\t{counter['time']['max']}"
+                         f"\t{' '.join(f'{d}:{c}' for d, c in counter['timeHisto'].items())}"
+                         f"\t{' '.join(f'{e}:{c}' for e, c in sorted(counter['exceptions'].items()))}\n")
+        return ''.join(sLine)
+
+
+class TaylorCache:
+    '''
+    Opt-in bounded LRU cache of the results of Taylor.exp(), log(), sin() and pow(), 
+        which is enabled by setting {Taylor.cache}.
+    The key is the function name, the exponent, the exact bits of the input value and uncertainty, 
+        and the identity of the moment, because VarDbl can not be a key.
+    Calls with {dumpPath} or {convergence} are not cached, and neither are the exceptions.
+    '''
+    __slots__ = ('maxSize', 'hits', 'misses', '_sResult')
+
+    def __init__(self, maxSize:int=1024) -> None:
+        if maxSize < 1:
+            raise ValueError(f'Invalid maxSize={maxSize} for cache')
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self._sResult = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sResult)
+
+    def __str__(self) -> str:
+        return f'TaylorCache: {len(self)}/{self.maxSize}, hits={self.hits}, misses={self.misses}'
+
+    def clear(self):
+        self._sResult.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key:tuple, calc:typing.Callable[[], VarDbl]) -> VarDbl:
+        '''
+        Return the cached result for {key}, otherwise the result of {calc}() after caching it
+        '''
+        ret = self._sResult.get(key)
+        if ret is not None:
+            self._sResult.move_to_end(key)
+            self.hits += 1
+            return ret
+        self.misses += 1
+        ret = calc()
+        self._sResult[key] = ret
+        if len(self._sResult) > self.maxSize:
+            self._sResult.popitem(last=False)
+        return ret
+
+
+def _traceable(func):
+    '''
+    When {input} of {func} is an instance of {Taylor.tracer}, 
+        return {input}.taylor() of the name and the bound arguments of {func} instead of calling {func}.
+    '''
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = Taylor.tracer
+        if tracer is not None:
+            input = args[0] if args else kwargs.get('input')
+            if isinstance(input, tracer):
+                sArg = signature.bind(*args, **kwargs)
+                sArg.apply_defaults()
+                return input.taylor(func.__name__, sArg.arguments)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _cacheable(func):
+    '''
+    Look up {Taylor.cache} before calling {func}, which has the arguments of 
+        {input}, an optional {exp}, {moment}, {dumpPath} and {convergence}.
+    '''
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = Taylor.cache
+        if cache is None:
+            return func(*args, **kwargs)
+        sArg = signature.bind(*args, **kwargs)
+        sArg.apply_defaults()
+        sArg = sArg.arguments
+        input = sArg['input']
+        if sArg['dumpPath'] or sArg['convergence'] or (type(input) != VarDbl):
+            return func(*args, **kwargs)
+        key = (func.__name__, sArg.get('exp'), input.value().hex(), input.uncertainty().hex(), sArg['moment'])
+        return cache.lookup(key, lambda: func(*args, **kwargs))
+    return wrapper
+
+
 Expansion = collections.namedtuple('Expansion', ('order', 'taylor', 'exp', 'moment', 'monotonics', 'val', 'var', 'newVal', 'newVar'))
 
 
+class TaylorDump:
+    '''
+    Binary dump of Taylor.taylor1d() into a NumPy ".npz" file, which is selected by {SUFFIX} of {dumpPath}.
+     *) "input": the words of the input line of the text dump.
+     *) "expansion": the rows for Taylor.DUMP_PATH_EXPANSION_HEADER, collected in a preallocated array.
+     *) "output": the words of the output line of the text dump.
+    The file is written only once by close().
+    '''
+    SUFFIX = '.npz'
+
+    def __init__(self, path:str, sInput:list[str], maxOrder:int) -> None:
+        self.path = path
+        self.sInput = sInput
+        self.ssExpansion = numpy.empty((maxOrder, len(Taylor.DUMP_PATH_EXPANSION_HEADER.split('\t'))))
+        self.count = 0
+
+    @staticmethod
+    def isBinary(path:str) -> bool:
+        return path.endswith(TaylorDump.SUFFIX)
+
+    def append(self, *sRow):
+        self.ssExpansion[self.count] = sRow
+        self.count += 1
+
+    def close(self, sOutput:list[str]):
+        numpy.savez(self.path, input=numpy.array(self.sInput), 
+                    expansion=self.ssExpansion[:self.count], output=numpy.array(sOutput))
+
+    @staticmethod
+    def lines(path:str) -> typing.Iterator[str]:
+        '''
+        The lines of the text dump for the binary dump at {path}
+        '''
+        with numpy.load(path) as data:
+            yield Taylor.DUMP_PATH_INPUT_HEADER
+            yield '\t'.join(data['input'].tolist()) + '\n'
+            yield Taylor.DUMP_PATH_EXPANSION_HEADER
+            for sRow in data['expansion'].tolist():
+                yield f'{int(sRow[0])}\t' + '\t'.join(map(str, sRow[1:5])) + f'\t{int(sRow[5])}\t'\
+                      + '\t'.join(map(str, sRow[6:])) + '\n'
+            yield Taylor.DUMP_PATH_OUTPUT_HEADER
+            yield '\t'.join(data['output'].tolist()) + '\n'
+
+    @staticmethod
+    def toText(path:str, textPath:str):
+        '''
+        Convert the binary dump at {path} to the text dump at {textPath}, which can be read by verifyDumpFile().
+        '''
+        with open(textPath, 'w') as fw:
+            fw.writelines(TaylorDump.lines(path))
+
+    @staticmethod
+    def read(path:str) -> tuple[list[str], list[Expansion], list[str]]:
+        '''
+        Read the binary dump at {path} as the input words, the expansions and the output words.
+        As verifyDumpFile(), the expansions are indexed by the order, with [0] as a place holder.
+        The expansion stops before the first row with non-finite value.
+        '''
+        with numpy.load(path) as data:
+            sInput = data['input'].tolist()
+            ssExpansion = data['expansion'].tolist()
+            sOutput = data['output'].tolist()
+        sExpansion = [0]
+        for sRow in ssExpansion:
+            try:
+                sExpansion.append(Expansion(int(sRow[0]), VarDbl(sRow[1], sRow[2]), sRow[3], sRow[4], int(sRow[5]),
+                        VarDbl(sRow[6], sRow[7]), VarDbl(sRow[8], sRow[9]), 
+                        VarDbl(sRow[10], sRow[11]), VarDbl(sRow[12], sRow[13])))
+            except InitException:
+                break
+        return sInput, sExpansion, sOutput
+
+
 
 class Taylor:
     def __new__(cls):
@@ -67,6 +317,35 @@ class Taylor:
     
     MIN_MONOTONIC_COUNT = 20
 
+    # The checks of taylor1d() on either floats or numpy arrays, so that PowKernel and varTrace share them
+    @staticmethod
+    def _monotonic(newVariance, prevVariance, monotonics, monotonicPrev):
+        '''
+        The monotonic count and whether it can still be kept once, after {newVariance} following {prevVariance}
+        '''
+        less = numpy.abs(newVariance) <= numpy.abs(prevVariance)
+        keep = numpy.logical_not(less) & (monotonics >= Taylor.MIN_MONOTONIC_COUNT) & monotonicPrev
+        return numpy.where(less, monotonics + 1, numpy.where(keep, monotonics, 0)), \
+               monotonicPrev & numpy.logical_not(keep)
+
+    @staticmethod
+    def _notMonotonic(uncN, monotonics):
+        return (uncN > 0) & (monotonics < Taylor.MIN_MONOTONIC_COUNT)
+
+    @staticmethod
+    def _notStable(newValue, valueVariance, variance, leakage:float):
+        unc = numpy.sqrt(valueVariance + variance) * leakage
+        return (unc > 0) & (numpy.abs(newValue) >= unc)
+
+    @staticmethod
+    def _notReliable(variance, varianceUncertainty, bounding:float):
+        return variance * bounding < varianceUncertainty
+
+    profile:TaylorProfile = None
+    cache:TaylorCache = None
+    tracer:type = None
+        # the type of input recording the calls instead, such as varTrace.TraceVar within varTrace.tracing()
+
     DUMP_PATH_INPUT_HEADER = (
         "result\tvalue\tuncertainty\tinPrec\toutPrec\tbounding\tmaxOrder\tMinMonotonic"
         "\tcheckMonotonic\tcheckStability\tcheckReliablity\tcheckPositive\tName\n")
@@ -105,6 +384,10 @@ class Taylor:
     def _writeResult(fw, value:VarDbl, variance:VarDbl, exception:str):
         if not fw:
             return
+        if isinstance(fw, TaylorDump):
+            fw.close([f"{value.value()}", f"{value.uncertainty()}", f"{variance.value()}", f"{variance.uncertainty()}", 
+                      exception])
+            return
         fw.write(Taylor.DUMP_PATH_OUTPUT_HEADER)
         fw.write(f"{value.value()}\t{value.uncertainty()}\t{variance.value()}\t{variance.uncertainty()}\t{exception}\n")
         fw.close()
@@ -115,7 +398,7 @@ class Taylor:
                  inPrec:bool, outPrec:bool, 
                  moment=moment.NORMAL,
                  checkMinMonotonic=True, checkStability=True, checkReliablity=True, checkPositive=True, checkLSB=False,
-                 dumpPath:str=None):
+                 dumpPath:str=None, convergence:Convergence=None):
         '''
         1d Taylor expansion for differential series {s1dTaylor} at {input}, with {name} for logging.
         When {inPrec} is true, calculate Taylor expnasion against the precision of {input}.
@@ -149,6 +432,42 @@ class Taylor:
 
         Dump the expansion to {dumpPath} when it is provided.
         {dumpPath} can be read back and tested using verifyDumpFile()
+        When {dumpPath} ends with TaylorDump.SUFFIX, the dump is binary, and it is written once at the end.
+
+        When {convergence} is provided, the expansion may stop early according to Convergence, 
+            and {convergence.orders} reports the orders used.
+
+        When {Taylor.profile} is set, the call is counted in it by {name}.
+        '''
+        profile = Taylor.profile
+        if profile is None:
+            ret, n = Taylor._taylor1d(input, name, s1dTaylor, inPrec, outPrec, moment=moment,
+                            checkMinMonotonic=checkMinMonotonic, checkStability=checkStability, 
+                            checkReliablity=checkReliablity, checkPositive=checkPositive, checkLSB=checkLSB,
+                            dumpPath=dumpPath, convergence=convergence)
+        else:
+            start = time.perf_counter()
+            try:
+                ret, n = Taylor._taylor1d(input, name, s1dTaylor, inPrec, outPrec, moment=moment,
+                                checkMinMonotonic=checkMinMonotonic, checkStability=checkStability, 
+                                checkReliablity=checkReliablity, checkPositive=checkPositive, checkLSB=checkLSB,
+                                dumpPath=dumpPath, convergence=convergence)
+            except BaseException as ex:
+                profile.record(name, time.perf_counter() - start, 
+                               ex.n if isinstance(ex, Taylor1dException) else None, ex)
+                raise ex
+            profile.record(name, time.perf_counter() - start, n)
+        if convergence:
+            convergence.orders = n
+        return ret
+
+    @staticmethod
+    def _taylor1d(input:VarDbl, name:str, s1dTaylor:tuple[typing.Union[float, VarDbl]], 
+                  inPrec:bool, outPrec:bool, moment,
+                  checkMinMonotonic:bool, checkStability:bool, checkReliablity:bool, checkPositive:bool, checkLSB:bool,
+                  dumpPath:str, convergence:Convergence) -> tuple[VarDbl, int]:
+        '''
+        Taylor1d() returning the result and the max expansion order used.
         '''
         for n in range(len(s1dTaylor)):
             if isinstance(s1dTaylor[n], VarDbl):
@@ -163,16 +482,20 @@ class Taylor:
                 raise ValueError(f'Taylor [{n}]={s1dTaylor[n]}')
             
         if (type(input) != VarDbl) or (not input.variance()):
-            return VarDbl(s1dTaylor[0])
+            return VarDbl(s1dTaylor[0]), 0
         fw = None
         if dumpPath:
-            fw = open(dumpPath, "w")
-            fw.write(Taylor.DUMP_PATH_INPUT_HEADER)
-            fw.write(f"{s1dTaylor[0]}\t{input.value()}\t{input.uncertainty()}\t{inPrec}\t{outPrec}"
-                     f"\t{moment.bounding}\t{moment.maxOrder}\t{Taylor.MIN_MONOTONIC_COUNT}"
-                     f"\t{checkMinMonotonic}\t{checkStability}\t{checkReliablity}\t{checkPositive}"
-                     f"\t{name}\n")
-            fw.write(Taylor.DUMP_PATH_EXPANSION_HEADER)
+            sInput = [f"{s1dTaylor[0]}", f"{input.value()}", f"{input.uncertainty()}", f"{inPrec}", f"{outPrec}",
+                      f"{moment.bounding}", f"{moment.maxOrder}", f"{Taylor.MIN_MONOTONIC_COUNT}",
+                      f"{checkMinMonotonic}", f"{checkStability}", f"{checkReliablity}", f"{checkPositive}",
+                      f"{name}"]
+            if TaylorDump.isBinary(dumpPath):
+                fw = TaylorDump(dumpPath, sInput, moment.maxOrder)
+            else:
+                fw = open(dumpPath, "w")
+                fw.write(Taylor.DUMP_PATH_INPUT_HEADER)
+                fw.write('\t'.join(sInput) + '\n')
+                fw.write(Taylor.DUMP_PATH_EXPANSION_HEADER)
 
         monotonics = 0
         monotonicPrev = True
@@ -185,6 +508,8 @@ class Taylor:
         uncN = 1
         prevVariance = VarDbl()
         infinite = None
+        converged = 0
+        n = 0
         for n in range(1, min(len(s1dTaylor), moment.maxOrder)):
             uncN *= unc
             if not math.isfinite(uncN):
@@ -223,26 +548,30 @@ class Taylor:
                     infinite = 'NotFiniteException\tvariance'
 
                 if (not infinite) and ((n & 1) == 0):
-                    if abs(newVariance.value()) <= abs(prevVariance.value()):
-                        monotonics += 1
-                    elif (monotonics >= Taylor.MIN_MONOTONIC_COUNT) and monotonicPrev:
-                        monotonicPrev = False
-                    else:
-                        monotonics = 0
+                    monotonics, monotonicPrev = Taylor._monotonic(newVariance.value(), prevVariance.value(),
+                                                                  monotonics, monotonicPrev)
+                    monotonics, monotonicPrev = int(monotonics), bool(monotonicPrev)
                     prevVariance = newVariance
 
                 if fw:
                     tyVal = s1dTaylor[n].value() if type(s1dTaylor[n]) == VarDbl else s1dTaylor[n]
                     tyVar = s1dTaylor[n].uncertainty() if type(s1dTaylor[n]) == VarDbl else 0
-                    fw.write(f"{n}\t{tyVal}\t{tyVar}\t{uncN}\t{moment[n]}\t{monotonics}"
-                             f"\t{value.value()}\t{value.uncertainty()}\t{variance.value()}\t{variance.uncertainty()}"
-                             f"\t{newValue.value()}\t{newValue.variance()}\t{newVariance.value()}\t{newVariance.uncertainty()}"
-                             f"\n")
+                    if isinstance(fw, TaylorDump):
+                        fw.append(n, tyVal, tyVar, uncN, moment[n], monotonics,
+                                  value.value(), value.uncertainty(), variance.value(), variance.uncertainty(),
+                                  newValue.value(), newValue.variance(), newVariance.value(), newVariance.uncertainty())
+                    else:
+                        fw.write(f"{n}\t{tyVal}\t{tyVar}\t{uncN}\t{moment[n]}\t{monotonics}"
+                                 f"\t{value.value()}\t{value.uncertainty()}\t{variance.value()}\t{variance.uncertainty()}"
+                                 f"\t{newValue.value()}\t{newValue.variance()}\t{newVariance.value()}\t{newVariance.uncertainty()}"
+                                 f"\n")
             except (OverflowError, InitException) as ex:
                 infinite = 'NotFiniteException\tnewValue'
             except BaseException as ex:
                 infinite = f'NotFiniteException\t{ex}'
-                if fw:
+                if isinstance(fw, TaylorDump):
+                    Taylor._writeResult(fw, value, variance, f'{ex}')
+                elif fw:
                     fw.write(f"{value.value()}\t{value.uncertainty()}\t{variance.value()}\t{variance.uncertainty()}\t{ex}\n")
                 raise ex
             if infinite:
@@ -255,7 +584,17 @@ class Taylor:
                 raise NotPositiveException(input, name, s1dTaylor, inPrec, outPrec,
                         value, variance, n, newValue, newVariance, monotonics)
 
-        if checkMinMonotonic and (uncN > 0) and (monotonics < Taylor.MIN_MONOTONIC_COUNT):
+            if convergence:
+                if (abs(newValue.value()) < math.ulp(value.value())) and \
+                        (abs(newVariance.value()) < math.ulp(variance.value())):
+                    converged += 1
+                else:
+                    converged = 0
+                if (converged >= convergence.consecutive) and \
+                        ((not checkMinMonotonic) or (monotonics >= Taylor.MIN_MONOTONIC_COUNT)):
+                    break
+
+        if checkMinMonotonic and Taylor._notMonotonic(uncN, monotonics):
             Taylor._writeResult(fw, value, variance, 'NotMonotonicException')
             raise NotMonotonicException(input, name, s1dTaylor, inPrec, outPrec,
                     value, variance, n, newValue, newVariance, monotonics)
@@ -265,8 +604,7 @@ class Taylor:
                 raise NotStableException(input, name, s1dTaylor, inPrec, outPrec,
                         value, variance, n, newValue, newVariance, monotonics)
         if checkStability:
-            unc = math.sqrt(value.variance() + variance.value()) * moment.leakage
-            if unc > 0 and abs(newValue.value()) >= unc:
+            if Taylor._notStable(newValue.value(), value.variance(), variance.value(), moment.leakage):
                 Taylor._writeResult(fw, value, variance, 'NotStableException\tuncertainty')
                 raise NotStableException(input, name, s1dTaylor, inPrec, outPrec,
                         value, variance, n, newValue, newVariance, monotonics)
@@ -284,7 +622,7 @@ class Taylor:
                 Taylor._writeResult(fw, value, variance, f'NotFiniteException\toutPrec variance\t{s1dTaylor[0]}')
                 raise NotFiniteException(input, name, s1dTaylor, inPrec, outPrec,
                         value, variance, n, newValue, newVariance, monotonics)
-        if checkReliablity and (variance.value() * moment.bounding < variance.uncertainty()):
+        if checkReliablity and Taylor._notReliable(variance.value(), variance.uncertainty(), moment.bounding):
             Taylor._writeResult(fw, value, variance, f'NotReliableException')
             raise NotReliableException(input, name, s1dTaylor, inPrec, outPrec,
                     value, variance, n, newValue, newVariance, monotonics)
@@ -295,7 +633,7 @@ class Taylor:
             raise NotFiniteException(input, name, s1dTaylor, inPrec, outPrec,
                     value, variance, n, newValue, newVariance)
         Taylor._writeResult(fw, value, variance, '')
-        return ret
+        return ret, n
 
 
     @staticmethod   
@@ -303,8 +641,9 @@ class Taylor:
             -> tuple[VarDbl, list[Expansion], typing.Union[VarDbl, str]]:
         '''
         When input uncertainty is rounding error, checkExp=False
+        A binary {dumpPath} is verified through its text lines by TaylorDump.lines().
         '''
-        with open(dumpPath) as f:
+        with (contextlib.closing(TaylorDump.lines(dumpPath)) if TaylorDump.isBinary(dumpPath) else open(dumpPath)) as f:
             testcase.assertEqual(next(f), Taylor.DUMP_PATH_INPUT_HEADER)
             sHdr = Taylor.DUMP_PATH_INPUT_HEADER.split('\t')
             sWord = next(f).strip().split('\t')
@@ -395,26 +734,44 @@ class Taylor:
                 dumpPath = dumpPath, checkMinMonotonic = False, checkStability = False)
 
     @staticmethod
-    def exp(input:VarDbl, moment=moment.NORMAL, dumpPath:str=None) -> VarDbl:
-        sTaylor = [math.exp(input.value()), 1.0]
+    @_traceable
+    @_cacheable
+    def exp(input:VarDbl, moment=moment.NORMAL, dumpPath:str=None, convergence:Convergence=None) -> VarDbl:
+        return Taylor.taylor1d(input, f"exp({input})", Taylor.expTaylor(input.value(), moment), False, True, 
+                               moment=moment, dumpPath=dumpPath, convergence=convergence)
+
+    @staticmethod
+    def expTaylor(x:float, moment=moment.NORMAL) -> list[float]:
+        sTaylor = [math.exp(x), 1.0]
         for i in range(2, moment.maxOrder):
             sTaylor.append(sTaylor[-1]/i)
-        return Taylor.taylor1d(input, f"exp({input})", sTaylor, False, True, 
-                               moment=moment, dumpPath=dumpPath)
+        return sTaylor
     
     @staticmethod
-    def log(input:VarDbl, moment=moment.NORMAL, dumpPath:str=None) -> VarDbl:
+    @_traceable
+    @_cacheable
+    def log(input:VarDbl, moment=moment.NORMAL, dumpPath:str=None, convergence:Convergence=None) -> VarDbl:
+        return Taylor.taylor1d(input, f"log({input})", Taylor.logTaylor(input.value(), moment), True, False, 
+                               moment=moment, dumpPath=dumpPath, convergence=convergence)
+
+    @staticmethod
+    def logTaylor(x:float, moment=moment.NORMAL) -> list[float]:
         sTaylor = []
-        sTaylor.append(math.log(input.value()))
+        sTaylor.append(math.log(x))
         for i in range(1, moment.maxOrder):
             sTaylor.append(1/i if ((i%2) == 1) else -1/i)
-        return Taylor.taylor1d(input, f"log({input})", sTaylor, True, False, 
-                               moment=moment, dumpPath=dumpPath)
+        return sTaylor
+
+    @staticmethod
+    @_traceable
+    @_cacheable
+    def sin(input:VarDbl, moment=moment.NORMAL, dumpPath:str=None, convergence:Convergence=None) -> VarDbl:
+        return Taylor.taylor1d(input, f"sin({input})", Taylor.sinTaylor(input.value(), moment), False, False, 
+                               moment=moment, dumpPath=dumpPath, convergence=convergence)
 
     @staticmethod
-    def sin(input:VarDbl, moment=moment.NORMAL, dumpPath:str=None) -> VarDbl:
+    def sinTaylor(x:float, moment=moment.NORMAL) -> list[float]:
         sTaylor = []
-        x = input.value()
         sTaylor.append( math.sin(x) )
         fac = 1.0
         for i in range(1, moment.maxOrder):
@@ -428,11 +785,12 @@ class Taylor:
                     sTaylor.append(-math.sin(x) *fac)
                 case 3:
                     sTaylor.append(-math.cos(x) *fac)
-        return Taylor.taylor1d(input, f"sin({input})", sTaylor, False, False, 
-                               moment=moment, dumpPath=dumpPath)
+        return sTaylor
     
     @staticmethod
-    def pow(input:VarDbl, exp:float, moment=moment.NORMAL, dumpPath:str=None) -> VarDbl:
+    @_traceable
+    @_cacheable
+    def pow(input:VarDbl, exp:float, moment=moment.NORMAL, dumpPath:str=None, convergence:Convergence=None) -> VarDbl:
         match exp:
             case 0:
                 return VarDbl(1, 0)
@@ -442,10 +800,229 @@ class Taylor:
             sCoeff = [0] * int(exp)
             sCoeff.append(1)
             return Taylor.polynominal1d(input, sCoeff, moment=moment, dumpPath=dumpPath)
-        sTaylor = [math.pow(input.value(), exp), VarDbl(exp)]
+        return Taylor.taylor1d(input, f"({input})**{exp}", Taylor.powTaylor(input.value(), exp, moment), True, True, 
+                               moment=moment, dumpPath=dumpPath, convergence=convergence)
+
+    @staticmethod
+    def powTaylor(x:float, exp:float, moment=moment.NORMAL) -> list[typing.Union[float, VarDbl]]:
+        sTaylor = [math.pow(x, exp), VarDbl(exp)]
         for i in range(2, moment.maxOrder):
             sTaylor.append( sTaylor[-1] * ((exp + 1 - i)/i) )
-        return Taylor.taylor1d(input, f"({input})**{exp}", sTaylor, True, True, 
-                               moment=moment, dumpPath=dumpPath)
+        return sTaylor
+
+    @staticmethod
+    def sqrt(input:VarDbl, moment=moment.NORMAL) -> VarDbl:
+        '''
+        The same as pow({input}, 0.5) within rounding, by the cached PowKernel.
+        '''
+        return PowKernel.get(0.5, moment).pow(input)
+
+    EDGE_HEADER = 'X\tEdge\tBias\tValue\tUncertainty\tException\n'
+
+    @staticmethod
+    def convergeEdge(func:str, sX:typing.Iterable[float], dxMin:float, dxMax:float, dxRes:int, path:str,
+                     moment=moment.NORMAL, maxWorkers:int=None):
+        '''
+        For each x of {sX}, bisect the largest input uncertainty dx in [{dxMin}, {dxMax}] at the resolution of 1/{dxRes}
+            so that {func} still converges, in which {func} is:
+         *) "exp": exp(VarDbl(x, dx))
+         *) "log": log(VarDbl(x, x*dx))
+         *) "sin": sin(VarDbl(x, dx))
+         *) "pow": VarDbl(1, dx)**x
+        The bisections are run in a process pool of {maxWorkers}, and each reuses the Taylor coefficients for its x.
+        The records are written to {path} in the order of {sX} as soon as they are available, 
+            with the columns of {EDGE_HEADER}, in which "Bias" is the difference of the result value from the exact value,
+            and "Exception" is the last exception during the bisection.
+        '''
+        if func not in ('exp', 'log', 'sin', 'pow'):
+            raise ValueError(f'Invalid function {func} for convergence edge')
+        with open(path, 'w') as fw, concurrent.futures.ProcessPoolExecutor(maxWorkers) as executor:
+            fw.write(Taylor.EDGE_HEADER)
+            for x, edge, bias, value, uncertainty, exception in executor.map(functools.partial(_convergeEdge, func, 
+                    dxMin=dxMin, dxMax=dxMax, dxRes=dxRes, moment=moment), sX):
+                fw.write(f'{x}\t{edge}\t{bias}\t{value}\t{uncertainty}\t{exception}\n')
+                fw.flush()
+
+
+def _convergeEdge(func:str, x:float, dxMin:float, dxMax:float, dxRes:int, moment) \
+        -> tuple[float, float, float, float, float, str]:
+    '''
+    The bisection of Taylor.convergeEdge() for {x}, 
+        which returns the record of x, edge, bias, value, uncertainty and exception.
+    '''
+    match func:
+        case 'exp':
+            sTaylor = Taylor.expTaylor(x, moment)
+            calc = lambda dx: Taylor.taylor1d(input := VarDbl(x, dx), f"exp({input})", sTaylor, False, True, moment=moment)
+            exact = math.exp(x)
+        case 'log':
+            sTaylor = Taylor.logTaylor(x, moment)
+            calc = lambda dx: Taylor.taylor1d(input := VarDbl(x, x*dx), f"log({input})", sTaylor, True, False, moment=moment)
+            exact = math.log(x)
+        case 'sin':
+            sTaylor = Taylor.sinTaylor(x, moment)
+            calc = lambda dx: Taylor.taylor1d(input := VarDbl(x, dx), f"sin({input})", sTaylor, False, False, moment=moment)
+            exact = math.sin(x)
+        case 'pow':
+            if (x > 0) and (math.ceil(x) == math.floor(x)):
+                calc = lambda dx: Taylor.pow(VarDbl(1, dx), x, moment=moment)
+            else:
+                sTaylor = Taylor.powTaylor(1, x, moment)
+                calc = lambda dx: Taylor.taylor1d(input := VarDbl(1, dx), f"({input})**{x}", sTaylor, True, True, moment=moment)
+            exact = 1
+    excpt = None
+    res = None
+    iMin = int(dxMin * dxRes)
+    iMax = int(dxMax * dxRes)
+    while iMin + 1 < iMax:
+        iMid = int((iMin + iMax)/2)
+        try:
+            res = calc(iMid / dxRes)
+            iMin = iMid
+        except BaseException as ex:
+            excpt = ex
+            iMax = iMid
+    if res is None:
+        raise ValueError(f'No result for {func} at x={x}, dxMin={dxMin}, dxMax={dxMax}, exception={excpt}')
+    if excpt is None:
+        raise ValueError(f'No exception for {func} at x={x}, dxMin={dxMin}, dxMax={dxMax}')
+    return x, iMin/dxRes, res.value() - exact, res.value(), res.uncertainty(), f'{excpt}'
     
 
+
+
+class PowKernel:
+    '''
+    The Taylor expansion of Taylor.pow() for a non-integer {exp} and {moment}, for many inputs.
+    The expansion is on the precision of the input, so that except for the 0th order,
+        the binomial coefficients of powTaylor() do not depend on the input value.
+    Thus the coefficients of each order for both the value and the variance are tabulated only once,
+        in which the variance coefficients are divided by the moment to avoid overflow,
+        and the orders of all the inputs are evaluated together as numpy arrays by powMany().
+    The results are the same as Taylor.pow() within the rounding errors, 
+        and the rounding uncertainties are accumulated in the same way as VarDbl.
+    Any input failing a check of Taylor.taylor1d() is recalculated by Taylor.pow() for its exception.
+    '''
+    MAX_KERNELS = 64
+        # the most kernels kept by get(), in the same bounded LRU as {Taylor.cache}
+    _cache = TaylorCache(MAX_KERNELS)
+
+    @staticmethod
+    def get(exp:float, moment=moment.NORMAL) -> 'PowKernel':
+        '''
+        The cached kernel for {exp} and {moment}
+        '''
+        return PowKernel._cache.lookup((exp, moment), lambda: PowKernel(exp, moment))
+
+    @staticmethod
+    def ulp(sValue:numpy.ndarray) -> numpy.ndarray:
+        '''
+        The rounding uncertainty of {sValue} as VarDbl(float)
+        '''
+        with numpy.errstate(invalid='ignore'):
+            sSig, _ = numpy.frexp(sValue)
+            sExact = (numpy.int64(sSig * (VarDbl.DOUBLE_MAX_SIGNIFICAND + 1)) & VarDbl.DOUBLE_MAX_PRECISE_FILTER) == 0
+        return numpy.where(sExact, 0.0, numpy.spacing(numpy.abs(sValue)) * VarDbl.DEVIATION_OF_LSB)
+
+    @staticmethod
+    def _ulpVariance(sValue:numpy.ndarray) -> numpy.ndarray:
+        return numpy.square(PowKernel.ulp(sValue))
+
+    def __init__(self, exp:float, moment=moment.NORMAL) -> None:
+        if (exp > 0) and (math.ceil(exp) == math.floor(exp)):
+            raise ValueError(f'Invalid integer exp={exp} for PowKernel')
+        self._exp = exp
+        self._moment = moment
+        sTaylor = Taylor.powTaylor(1, exp, moment)
+        self._maxOrder = min(len(sTaylor), moment.maxOrder)
+        self._sMoment = numpy.array([moment[n] for n in range(self._maxOrder)])
+        self._sTaylor = numpy.array([0.0] + [t.value() for t in sTaylor[1:self._maxOrder]])
+        self._sTaylorVar = numpy.array([0.0] + [t.variance() for t in sTaylor[1:self._maxOrder]])
+        sVariance = [VarDbl()] * self._maxOrder
+        for n in range(2, self._maxOrder, 2):
+            variance = VarDbl()
+            for j in range(1, n):
+                variance += sTaylor[j] * sTaylor[n - j] * ((moment[n] - moment[j] * moment[n - j]) / moment[n])
+            sVariance[n] = variance
+        self._sVariance = numpy.array([v.value() for v in sVariance])
+        self._sVarianceVar = numpy.array([v.variance() for v in sVariance])
+
+    def pow(self, input:VarDbl) -> VarDbl:
+        return self.powMany((input,))[0]
+
+    def powMany(self, sInput:typing.Sequence[VarDbl]) -> list[VarDbl]:
+        '''
+        {sInput} ** {exp} as Taylor.pow() of each input, with all the inputs expanded together order by order.
+        '''
+        sValue, sUncertainty, sFailed = self.powArray(numpy.array([input.value() for input in sInput], dtype=float),
+                                                      numpy.array([input.uncertainty() for input in sInput], dtype=float))
+        return [Taylor.pow(input, self._exp, moment=self._moment) if sFailed[i] else VarDbl(sValue[i], sUncertainty[i])
+                for i, input in enumerate(sInput)]
+
+    def powArray(self, sX:numpy.ndarray, sUnc:numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        '''
+        The values and the uncertainties of VarDbl({sX}, {sUnc}) ** {exp}, 
+            with a mask of the inputs which fail any check of Taylor.taylor1d(), whose results are undefined.
+        '''
+        sX = numpy.asarray(sX, dtype=float)
+        sUnc = numpy.abs(numpy.asarray(sUnc, dtype=float))
+        sFailed = ~((sX > 0) & numpy.isfinite(sX) & numpy.isfinite(sUnc))
+        sUnc = numpy.where(sFailed, 0.0, sUnc / numpy.where(sFailed, 1.0, sX))
+        sFailed |= sUnc >= 1
+        sActive = (sUnc > 0) & ~sFailed
+
+        count = len(sX)
+        sUncN = numpy.where(sUnc > 0, 1.0, 0.0)
+        sValue, sValueVar = numpy.ones(count), numpy.zeros(count)
+        sVariance, sVarianceVar = numpy.zeros(count), numpy.zeros(count)
+        sNewValue, sPrevVariance = numpy.zeros(count), numpy.zeros(count)
+        sMonotonics = numpy.zeros(count, dtype=int)
+        sMonotonicPrev = numpy.ones(count, dtype=bool)
+        with numpy.errstate(under='ignore', over='ignore', invalid='ignore'):
+            for n in range(1, self._maxOrder):
+                if not sActive.any():
+                    break
+                sUncN = numpy.where(sActive, sUncN * sUnc, sUncN)
+                sActive &= sUncN != 0
+                if (n & 1):
+                    continue
+                sTerm = sUncN * self._sMoment[n]
+                sTermVar = PowKernel._ulpVariance(sTerm)
+                sNew = self._sTaylor[n] * sTerm
+                sNewVar = self._sTaylorVar[n] * (sTerm * sTerm + sTermVar) + sTermVar * self._sTaylor[n] **2
+                sNewVariance = self._sVariance[n] * sTerm
+                sNewVarianceVar = self._sVarianceVar[n] * (sTerm * sTerm + sTermVar) + sTermVar * self._sVariance[n] **2
+                sValue = numpy.where(sActive, sValue + sNew, sValue)
+                sValueVar = numpy.where(sActive, sValueVar + sNewVar, sValueVar)
+                sVariance = numpy.where(sActive, sVariance + sNewVariance, sVariance)
+                sVarianceVar = numpy.where(sActive, sVarianceVar + sNewVarianceVar, sVarianceVar)
+                sNewValue = numpy.where(sActive, sNew, sNewValue)
+
+                sNewMonotonics, sNewMonotonicPrev = Taylor._monotonic(sNewVariance, sPrevVariance, 
+                                                                      sMonotonics, sMonotonicPrev)
+                sMonotonics = numpy.where(sActive, sNewMonotonics, sMonotonics)
+                sMonotonicPrev = numpy.where(sActive, sNewMonotonicPrev, sMonotonicPrev)
+                sPrevVariance = numpy.where(sActive, sNewVariance, sPrevVariance)
+
+                sFailed |= sActive & ~(numpy.isfinite(sValue) & numpy.isfinite(sVariance) & 
+                                       numpy.isfinite(sValueVar) & numpy.isfinite(sVarianceVar))
+                sFailed |= sActive & (sVariance < 0)
+                sActive &= ~sFailed
+
+            sFailed |= Taylor._notMonotonic(sUncN, sMonotonics)
+            sFailed |= Taylor._notStable(sNewValue, sValueVar, sVariance, self._moment.leakage)
+            sPow = numpy.array([math.pow(x, self._exp) if x > 0 else 0.0 for x in sX])
+            sPowVar = PowKernel._ulpVariance(sPow)
+            sPow2 = sPow * sPow
+            sPow2Var = PowKernel._ulpVariance(sPow2)
+            sValueVar = sValueVar * (sPow2 + sPowVar) + sPowVar * sValue * sValue
+            sValue = sValue * sPow
+            sVarianceVar = sVarianceVar * (sPow2 * sPow2 + sPow2Var) + sPow2Var * sVariance * sVariance
+            sVariance = sVariance * sPow2
+            sFailed |= Taylor._notReliable(sVariance, numpy.sqrt(sVarianceVar), self._moment.bounding)
+            sUncertainty = numpy.sqrt(sVariance + sValueVar)
+            sExact = sUnc == 0
+            sValue = numpy.where(sExact, sPow, sValue)
+            sUncertainty = numpy.where(sExact, PowKernel.ulp(sPow), sUncertainty)
+            sFailed |= ~(numpy.isfinite(sValue) & numpy.isfinite(sUncertainty))
+        return sValue, sUncertainty, sFailed
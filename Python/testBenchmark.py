@@ -0,0 +1,63 @@
+"""Smoke tests for benchmark.py — runs every benchmark once, and verifies the
+JSON baseline round trip and the regression flags of the comparison command.
+"""
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import benchmark
+
+
+class TestBenchmark (unittest.TestCase):
+
+    def testRun(self):
+        self.assertIn('VarDbl.add', benchmark.cases())
+        self.assertListEqual(['matrix.adjugate size=3', 'matrix.adjugate size=4'],
+                             benchmark.cases('^matrix.adjugate size=[34]$'))
+        results = benchmark.run(minSeconds=0, repeat=1)
+        self.assertListEqual(benchmark.cases(), list(results['cases']))
+        for record in results['cases'].values():
+            self.assertGreater(record['seconds'], 0)
+            self.assertEqual((1, 1), (record['number'], record['repeat']))
+        with self.assertRaises(ValueError):
+            benchmark.case('VarDbl.add')(lambda: None)
+
+    def testCompare(self):
+        baseline = {'cases': {'a': {'seconds': 1.0}, 'b': {'seconds': 1.0}, 'c': {'seconds': 1.0}, 'd': {'seconds': 1.0}}}
+        current = {'cases': {'a': {'seconds': 1.1}, 'b': {'seconds': 1.5}, 'c': {'seconds': 0.5}, 'e': {'seconds': 1.0}}}
+        sRow, sRegression = benchmark.compare(baseline, current)
+        self.assertListEqual(['b'], sRegression)
+        self.assertListEqual(['ok', 'regression', 'improvement', 'missing', 'new'], [row[-1] for row in sRow])
+        self.assertListEqual(['a', 'b', 'c', 'd', 'e'], [row[0] for row in sRow])
+        self.assertEqual(6, len(benchmark.report(sRow).splitlines()))
+        self.assertListEqual([], benchmark.compare(baseline, current, threshold=0.6)[1])
+
+    def testCommand(self):
+        with tempfile.TemporaryDirectory() as outDir:
+            baselinePath = f'{outDir}/baseline.json'
+            currentPath = f'{outDir}/current.json'
+            self.assertEqual(0, benchmark.main(['run', '--filter', '^VarDbl.add$', '--min-seconds', '0.01',
+                                                '--repeat', '2', '--output', baselinePath]))
+            self.assertTrue(os.path.isfile(baselinePath))
+            baseline = benchmark.load(baselinePath)
+            self.assertListEqual(['VarDbl.add'], list(baseline['cases']))
+            self.assertEqual(2, baseline['cases']['VarDbl.add']['repeat'])
+
+            baseline['cases']['VarDbl.add']['seconds'] *= 1e-3
+            benchmark.save(baseline, currentPath)
+            self.assertEqual(0, benchmark.main(['compare', currentPath, '--baseline', baselinePath]))
+            self.assertEqual(1, benchmark.main(['compare', baselinePath, '--baseline', currentPath]))
+            self.assertEqual(1, benchmark.main(['run', '--filter', '^VarDbl.add$', '--min-seconds', '0.01',
+                                                '--repeat', '1', '--baseline', currentPath]))
+
+            defaultPath = f'{outDir}/default.json'
+            with unittest.mock.patch('benchmark.BASELINE_PATH', defaultPath):
+                self.assertEqual(0, benchmark.main(['run', '--filter', '^VarDbl.add$', '--min-seconds', '0.01',
+                                                    '--repeat', '1']))
+                self.assertTrue(os.path.isfile(defaultPath))
+                self.assertEqual(0, benchmark.main(['compare', currentPath]))
+
+
+if __name__ == '__main__':
+    unittest.main()
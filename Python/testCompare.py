@@ -8,7 +8,7 @@ import unittest
 import re
 import sys
 
-from fft import SinSource, SignalType, TestType, FFT_Order, FFT_Step
+from fft import SinSource, SignalType, TestType, FFT_Order, FFT_Step, FFT_Timing
 from histo import Histo, Stat
 from indexSin import OUTDIR
 from taylor import Taylor
@@ -351,7 +351,7 @@ class Test_FFT_Order (unittest.TestCase):
                     print(f'{sinSource}\t{test}\t{context}\tmin={stat.min()}, {stat.minAt()}\tmax={stat.max()}, {stat.maxAt()}\tmean={stat.mean()}\tdev{stat.dev()}')
 
     def test_Cpp_Aggr(self):
-        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Cpp/Output/FFT_2_19.txt')
+        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Cpp/Output/FFT_2_19.txt', columnar=True)
         try:
             for sinSource in (SinSource.Quart, SinSource.Lib):
                 for test in TestType:
@@ -365,7 +365,7 @@ class Test_FFT_Order (unittest.TestCase):
             raise ex
 
     def test_Python_Aggr(self):
-        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Python/Output/FFT_2_19.txt')
+        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Python/Output/FFT_2_19.txt', columnar=True)
         try:
             for sinSource in (SinSource.Quart, SinSource.Lib):
                 for test in TestType:
@@ -379,7 +379,7 @@ class Test_FFT_Order (unittest.TestCase):
             raise ex
 
     def test_Cpp_Linear(self):
-        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Cpp/Output/FFT_2_19.txt', SignalType.Linear)
+        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Cpp/Output/FFT_2_19.txt', SignalType.Linear, columnar=True)
         try:
             for sinSource in (SinSource.Quart, SinSource.Lib):
                 for test in TestType:
@@ -393,7 +393,7 @@ class Test_FFT_Order (unittest.TestCase):
             raise ex
 
     def test_Python_Linear(self):
-        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Python/Output/FFT_2_19.txt', SignalType.Linear)
+        sssDiff = FFT_Order.compare(self, f'{OUTDIR}/Java/Output/FFT_2_19.txt', f'{OUTDIR}/Python/Output/FFT_2_19.txt', SignalType.Linear, columnar=True)
         try:
             for sinSource in (SinSource.Quart, SinSource.Lib):
                 for test in TestType:
@@ -477,6 +477,24 @@ class Test_Exe_Time (unittest.TestCase):
                           '^Start calulation order=(\d+), sinSource=(Prec|Quart|Lib), noiseType=(Gaussian|White), noise=(\d+e-\d+|\d+.\d+|\d+)$',
                           1, 4, 2)
 
+    def test_FFT_Order_Python_Phase(self):
+        '''
+        Summarize the structured timing records of each phase by order
+        '''
+        timingPath = FFT_Timing.path(f'{OUTDIR}/Python/Output/FFT_2_19.txt')
+        ssExeTime:dict[int, dict[str, Stat]] = {}
+        for rec in FFT_Timing.read(timingPath):
+            sExeTime = ssExeTime.setdefault(rec['order'], {phase: Stat() for phase in FFT_Timing.PHASES + ('total',)})
+            for phase in FFT_Timing.PHASES:
+                sExeTime[phase].accum(rec['seconds'][phase], (rec['noise'], rec['sinSource']))
+            sExeTime['total'].accum(rec['total'], (rec['noise'], rec['sinSource']))
+        with open(timingPath + '.txt', 'w') as f:
+            f.write('Order\tPhase\tCount\tMean\tDev\tMin\tMin At\tMax\tMax At\n')
+            for order in sorted(ssExeTime.keys()):
+                for phase, stat in ssExeTime[order].items():
+                    self.assertGreaterEqual(stat.min(), 0)
+                    f.write(f'{order}\t{phase}\t{stat.count()}\t{stat.mean()}\t{stat.dev()}\t{stat.min()}\t{stat.minAt()}\t{stat.max()}\t{stat.maxAt()}\n')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,12 +2,19 @@
 FFT correctness across orders and signal types, and exercises noise injection
 and uncertainty propagation through the variance-arithmetic FFT.
 """
+import io
 import math
 import os
+import random
+import shutil
 import unittest
+import unittest.mock
 
-from fft import FFT, FFT_Signal, FFT_Order, FFT_Step, SinSource, SignalType, NoiseType, TestType
+import numpy
+
+from fft import FFT, FFT_Signal, FFT_Order, FFT_Order_Aggr, Measure, FFT_Order_Index, FFT_Timing, FFT_Step, FFT_Step_Trace, FFT_Trace, FFT_TraceWriter, SinSource, SignalType, NoiseType, TestType
 from indexSin import IndexSin
+from interval import Interval
 from varDbl import VarDbl
 
 class TestFFT (unittest.TestCase):
@@ -39,6 +46,50 @@ class TestFFT (unittest.TestCase):
                     with self.assertRaises(RuntimeError):
                         FFT_Signal(sinSource, signalType, order, 2**(order - 1) + 1)
 
+    def testTransformReal(self):
+        for sinSource in (SinSource.Quart, SinSource.Prec, SinSource.Lib):
+            fft = FFT(sinSource)
+            for order in (1, 2, 3, 6):
+                sData = []
+                for i in range(1 << order):
+                    sData += [VarDbl(random.random(), 1e-3), VarDbl(0)]
+                sInterval = [Interval.from_varDbl(var) if not (i & 1) else Interval(0.0) for i, var in enumerate(sData)]
+                for forward in (True, False):
+                    for expected, actual in zip(fft.transform(sData, forward), fft.transformReal(sData, forward)):
+                        self.assertAlmostEqual(expected.value(), actual.value(), delta=1e-14)
+                        self.assertAlmostEqual(expected.uncertainty(), actual.uncertainty(), delta=1e-15 * expected.uncertainty())
+                    for expected, actual in zip(fft.transform(sInterval, forward), fft.transformReal(sInterval, forward)):
+                        self.assertTrue(actual.contains(expected.mid()))
+
+    def testTraceSink(self):
+        order = 4
+        fft = FFT(SinSource.Quart)
+        sData = [VarDbl(random.random(), 1e-3) for i in range(2 << order)]
+        sFull = fft.transform(sData, True, traceSteps=True)
+        ssFull = fft.ssStep
+        self.assertEqual(len(ssFull), order + 3)
+
+        trace = FFT_Trace(sStep=range(2, 4), sIndex=(2, 3))
+        sRes = fft.transform(sData, True, traceSteps=trace)
+        self.assertEqual(fft.ssStep, [])
+        self.assertListEqual([var.value() for var in sRes], [var.value() for var in sFull])
+        self.assertSetEqual(set(trace.ssStep.keys()), {2, 3})
+        for step, sStep in trace.ssStep.items():
+            self.assertEqual(len(sStep), 2)
+            for i, var in zip((2, 3), sStep):
+                self.assertEqual(var.value(), ssFull[step][i].value())
+                self.assertEqual(var.uncertainty(), ssFull[step][i].uncertainty())
+
+        sIndex = (0, 5)
+        fw = io.StringIO()
+        fw.write(FFT_TraceWriter.header(sIndex))
+        fft.transform(sData, False, traceSteps=FFT_TraceWriter(fw, sStep=(order + 2,), sIndex=sIndex))
+        sLine = fw.getvalue().split('\n')
+        self.assertEqual(sLine[0], 'Step\t0 Value\t0 Uncertainty\t5 Value\t5 Uncertainty')
+        self.assertEqual(sLine[1].split('\t')[0], f'{order + 2}')
+        self.assertEqual(len(sLine[1].split('\t')), 1 + 2 * len(sIndex))
+        self.assertEqual(sLine[2], '')
+
 
 class Test_FFT_Prec (unittest.TestCase):
     fft = FFT(SinSource.Prec)
@@ -205,6 +256,40 @@ class Test_FFT_Step (unittest.TestCase):
             for sinSource in (SinSource.Prec, SinSource.Quart, SinSource.Lib):
                 FFT_Step.dump(order, sinSource)
 
+    def test_trace(self):
+        order = 3
+        sinSource = SinSource.Quart
+        textPath = FFT_Step.dumpPath(order, sinSource)
+        tracePath = FFT_Step.dumpPath(order, sinSource, binary=True)
+        convertPath = tracePath.replace('.bin', '_convert.bin')
+        FFT_Step.dump(order, sinSource, sNoise=(0, 1e-3))
+        FFT_Step.dump(order, sinSource, sNoise=(0, 1e-3), binary=True)
+        FFT_Step.convert(self, order, sinSource, textPath, convertPath)
+
+        with open(textPath) as f, FFT_Step_Trace(tracePath) as trace, FFT_Step_Trace(convertPath) as convert:
+            next(f)
+            sCosSin = FFT_Step.readCosSin(self, order, sinSource, f)
+            FFT_Step.assertStep(self, 'CosSin', order, 'CosSin', sCosSin,
+                                FFT_Step.readCosSin(self, order, sinSource, trace), precDiff=0)
+            self.assertEqual(len(trace), 1 + 2 * 3 * (3 + 3 + 1))
+            self.assertEqual(len(trace), len(convert))
+            self.assertEqual(trace.sOffset, convert.sOffset)
+            for i in range(1, len(trace)):
+                self.assertEqual(trace.sSteps[i], order + FFT.EXTRA_STEPS)
+                self.assertEqual(trace.steps(i).shape, (order + FFT.EXTRA_STEPS, 2 << order, 2))
+                if not float(trace.ssWord[i][2]):
+                    self.assertTrue((trace.steps(i) == convert.steps(i)).all())
+
+        FFT_Step.compare(self, sinSource, order, tracePath, convertPath, precDiff=0)
+        with FFT_Step_Trace(convertPath) as convert:
+            sBlock = numpy.array(convert.steps(1))
+        sBlock[2, 0, 0] += 1
+        with open(convertPath, 'r+b') as f:
+            f.seek(convert.sOffset[1])
+            f.write(sBlock.tobytes())
+        with self.assertRaises(AssertionError):
+            FFT_Step.compare(self, sinSource, order, tracePath, convertPath, precDiff=0)
+
     def test_order3_sin1_Prec(self):
         '''
         SinSource.Prec does not mean more precision
@@ -345,6 +430,197 @@ class Test_FFT_Order (unittest.TestCase):
         self.assertErrDev((8,), forwardPrec=5e-2, reversePrec=5e-2, roundtripPrec=5e-4,
                           sNoise = [0, 1e-15, 1e-12])
         
+    def test_realInput(self):
+        for signalType, freq in ((SignalType.Sin, 1), (SignalType.Cos, 2), (SignalType.Linear, 0)):
+            signal = FFT_Signal(SinSource.Quart, signalType, 4, freq)
+            fftOrder = FFT_Order(signal, NoiseType.Gaussian, 1e-3, realInput=True)
+            for i in range(1, 2 << 4, 2):
+                self.assertEqual(fftOrder.sFrwd[i].uncertainty(), 0)
+            for test in (TestType.Forward, TestType.Reverse):
+                stat = fftOrder.measure.sHisto[test].stat()
+                self.assertLess(abs(stat.mean()), 0.5)
+                self.assertLess(abs(stat.dev() - 1), 0.5)
+            self.assertLess(fftOrder.measure.sHisto[TestType.Roundtrip].stat().dev(), 1e-10)
+        with self.assertRaises(ValueError):
+            FFT_Order(signal, NoiseType.Gaussian, 1e-3, traceSteps=True, realInput=True)
+
+    def test_accumMany(self):
+        signal = FFT_Signal(SinSource.Quart, SignalType.Sin, 4, 1)
+        fftOrder = FFT_Order(signal, NoiseType.Gaussian, 1e-3)
+        fftOrder.aggr = None
+        sRange = [intv.rad() for intv in fftOrder.sSpec_intv]
+        fftOrder.measure = Measure(FFT_Order.DIVIDS, FFT_Order.DEVS)
+        for i in range(2 << 4):
+            fftOrder.accum(TestType.Forward, i, fftOrder.sSpec[i], fftOrder.sFreq[i], sRange[i])
+        expected = fftOrder.measure
+        fftOrder.measure = Measure(FFT_Order.DIVIDS, FFT_Order.DEVS)
+        fftOrder.accumMany(TestType.Forward, fftOrder.sSpec, fftOrder.sFreq, sRange)
+        actual = fftOrder.measure
+        for sStat in ('sUncStat', 'sValStat', 'sRangeStat', 'sUncRatioStat', 'sRangeRatioStat'):
+            this = getattr(expected, sStat)[TestType.Forward]
+            that = getattr(actual, sStat)[TestType.Forward]
+            self.assertEqual(this.count(), that.count())
+            self.assertEqual((this.min(), this.minAt()), (that.min(), that.minAt()))
+            self.assertEqual((this.max(), this.maxAt()), (that.max(), that.maxAt()))
+            self.assertAlmostEqual(this.mean(), that.mean(), delta=abs(this.mean()) * 1e-12)
+            self.assertAlmostEqual(this.dev(), that.dev(), delta=this.dev() * 1e-12)
+        self.assertListEqual(expected.sHisto[TestType.Forward].histogram(), 
+                             actual.sHisto[TestType.Forward].histogram())
+        self.assertEqual(expected.sHisto[TestType.Forward].stat().count(), 
+                         actual.sHisto[TestType.Forward].stat().count())
+
+    def test_aggr(self):
+        aggrCtx = FFT_Order_Aggr(FFT_Order.DIVIDS, FFT_Order.DEVS)
+        for signalType, freq in ((SignalType.Sin, 1), (SignalType.Cos, 2), (SignalType.Linear, 0)):
+            signal = FFT_Signal(SinSource.Quart, signalType, 4, freq)
+            fftOrder = FFT_Order(signal, NoiseType.Gaussian, 1e-3, aggrCtx=aggrCtx)
+            self.assertEqual(signalType == SignalType.Linear, fftOrder.aggr is None)
+            self.assertIsNone(FFT_Order(signal, NoiseType.Gaussian, 0).aggr)
+        self.assertEqual(1, len(aggrCtx))
+        self.assertIn((4, SinSource.Quart, NoiseType.Gaussian, 1e-3), aggrCtx)
+        aggr = aggrCtx.pop(4, SinSource.Quart, NoiseType.Gaussian, 1e-3)
+        self.assertEqual(2 * (2 << 4) * (FFT_Order.MIN_COUNT // (2 << 4)), aggr.sUncStat[TestType.Forward].count())
+        self.assertEqual(0, len(aggrCtx))
+        with self.assertRaises(RuntimeError):
+            aggrCtx.pop(4, SinSource.Quart, NoiseType.Gaussian, 1e-3)
+
+    def test_bitReversedCache(self):
+        for order in range(2, 10):
+            self.assertEqual(1 << order, len(FFT.bitReversedIndices(order)))
+            self.assertLessEqual(len(FFT._bitReversedIndex), FFT.MAX_BIT_REVERSED_ORDERS)
+        self.assertIs(FFT.bitReversedIndices(9), FFT.bitReversedIndices(9))
+        self.assertNotIn(2, FFT._bitReversedIndex)
+        self.assertTupleEqual((0, 2, 1, 3), FFT.bitReversedIndices(2))
+
+    def test_index(self):
+        sOrder = (3,)
+        sNoise = [0, 1e-12]
+        path = FFT_Order.dumpPath(sOrder=sOrder)
+        for p in (path, FFT_Order_Index.path(path)):
+            if os.path.isfile(p):
+                os.remove(p)
+        FFT_Order.dump(sOrder, sNoise=sNoise, sNoiseType=(NoiseType.Gaussian,))
+        self.assertTrue(os.path.isfile(FFT_Order_Index.path(path)))
+        with open(path) as f:
+            lines = f.readlines()[1:]
+        with FFT_Order_Index(path) as index:
+            self.assertEqual(len(index), len(lines))
+            for sinSource in (SinSource.Quart, SinSource.Lib, SinSource.Prec):
+                for noise in sNoise:
+                    self.assertTrue(index.hasAggr(3, sinSource, NoiseType.Gaussian, noise))
+                    self.assertFalse(index.hasAggr(3, sinSource, NoiseType.White, noise))
+            for line in lines:
+                key = FFT_Order_Index.key(line, 0, path)
+                self.assertEqual(index.readLine(key), line)
+
+        # resume without any new calculation
+        FFT_Order.dump(sOrder, sNoise=sNoise, sNoiseType=(NoiseType.Gaussian,))
+        with open(path) as f:
+            self.assertEqual(len(f.readlines()) - 1, len(lines))
+
+        # rebuild a missing index, which is only saved for writing
+        os.remove(FFT_Order_Index.path(path))
+        with FFT_Order_Index(path) as index:
+            self.assertEqual(len(index), len(lines))
+            with self.assertRaises(RuntimeError):
+                index.append(key, 0)
+        self.assertFalse(os.path.isfile(FFT_Order_Index.path(path)))
+        with FFT_Order_Index(path, write=True) as index:
+            self.assertEqual(len(index), len(lines))
+        self.assertTrue(os.path.isfile(FFT_Order_Index.path(path)))
+
+        # rebuild an index which does not match the dump file
+        FFT_Order.dump(sOrder, sNoise=sNoise + [1e-9], sNoiseType=(NoiseType.Gaussian,))
+        with open(FFT_Order_Index.path(path), 'w') as f:
+            f.write(FFT_Order_Index.HEADER)
+        with FFT_Order_Index(path) as index:
+            self.assertEqual(len(index), len(lines) + 3 * 3 * (3 + 3 + 1 + 1))
+
+        sssDiff = FFT_Order.compare(self, path, path, minNoise=1e-12, minOrder=2, minCount=0)
+        with open(FFT_Order_Index.path(path)) as f:
+            self.assertEqual(FFT_Order_Index.HEADER, f.read())
+        for sinSource in (SinSource.Quart, SinSource.Lib, SinSource.Prec):
+            for test in TestType:
+                self.assertEqual(sssDiff[sinSource][test][0].count(), 2)
+                self.assertEqual(sssDiff[sinSource][test][0].max(), 0)
+
+    def test_timing(self):
+        sOrder = (3,)
+        sNoise = [0, 1e-12]
+        path = FFT_Order.dumpPath(sOrder=sOrder)
+        for p in (path, FFT_Order_Index.path(path)):
+            if os.path.isfile(p):
+                os.remove(p)
+        FFT_Order.dump(sOrder, sNoise=sNoise, sNoiseType=(NoiseType.Gaussian,))
+        sRecord = FFT_Timing.read(FFT_Timing.path(path))
+        self.assertListEqual([(3, sinSource, 'Gaussian', noise) for sinSource in ('Quart', 'Lib', 'Prec') for noise in sNoise],
+                             [(rec['order'], rec['sinSource'], rec['noiseType'], rec['noise']) for rec in sRecord])
+        for rec in sRecord:
+            self.assertTupleEqual(FFT_Timing.PHASES, tuple(rec['seconds']))
+            for phase in FFT_Timing.PHASES:
+                self.assertGreater(rec['seconds'][phase], 0)
+            self.assertAlmostEqual(sum(rec['seconds'].values()), rec['total'])
+            # 3 sin, 3 cos and 1 linear signals of 16 values, repeated for noise until FFT_Order.MIN_COUNT
+            self.assertEqual(7 if rec['noise'] == 0 else 7 * FFT_Order.MIN_COUNT // 16, rec['calcs'])
+            self.assertGreater(rec['rss'], 0)
+            self.assertGreater(rec['maxRss'], 0)
+
+        # resume without any new record
+        FFT_Order.dump(sOrder, sNoise=sNoise + [1e-9], sNoiseType=(NoiseType.Gaussian,))
+        sResume = FFT_Timing.read(FFT_Timing.path(path))
+        self.assertListEqual(sRecord, sResume[:len(sRecord)])
+        self.assertListEqual([1e-9] * 3, [rec['noise'] for rec in sResume[len(sRecord):]])
+
+    def test_reportDiffKeys(self):
+        sThis = {(5, 'Quart', 'Gaussian', 0.1, 'Forward'), (5, 'Quart', 'Gaussian', 0.1, 'Reverse'),
+                 (5, 'Lib', 'Gaussian', 0.1, 'Forward'), (6, 'Quart', 'White', 0.1, 'Forward'), (3, 'Quart', 'White', 0.1, 'Forward')}
+        sThat = {(5, 'Quart', 'Gaussian', 0.1, 'Forward'), (6, 'Quart', 'White', 0.2, 'Forward'), (7, 'Quart', 'White', 0.1, 'Forward')}
+        with unittest.mock.patch('sys.stdout', new_callable=io.StringIO) as out:
+            FFT_Order.reportDiffKeys(sThis, sThat, 'this', 'that')
+        self.assertListEqual([
+            "Diff order: [3] only in this, [7] only in that",
+            "Diff sinSource for order=5: ['Lib'] only in this, [] only in that",
+            "Diff test for order=5 sinSource=Quart noiseType=Gaussian noise=0.1: ['Reverse'] only in this, [] only in that",
+            "Diff noise for order=6 sinSource=Quart noiseType=White: [0.1] only in this, [0.2] only in that",
+        ], out.getvalue().splitlines())
+
+    def test_compare_columnar(self):
+        sOrder = (3,)
+        sNoise = [1e-12, 1e-9, 1e-6]
+        path = FFT_Order.dumpPath(sOrder=sOrder)
+        thatPath = path.replace('.txt', '_that.txt')
+        for p in (path, FFT_Order_Index.path(path)):
+            if os.path.isfile(p):
+                os.remove(p)
+        FFT_Order.dump(sOrder, sNoise=sNoise, sNoiseType=(NoiseType.Gaussian,))
+        shutil.move(path, thatPath)
+        FFT_Order_Index.remove(path)
+        FFT_Order_Index.remove(thatPath)
+        FFT_Order.dump(sOrder, sNoise=sNoise, sNoiseType=(NoiseType.Gaussian,))
+
+        sssDiff = FFT_Order.compare(self, path, thatPath, minOrder=2, minCount=0, columnar=True)
+        sssExpected = FFT_Order.compare(self, path, thatPath, minOrder=2, minCount=0)
+        for sinSource in (SinSource.Quart, SinSource.Lib, SinSource.Prec):
+            for test in TestType:
+                for i in range(3):
+                    stat = sssDiff[sinSource][test][i]
+                    expected = sssExpected[sinSource][test][i]
+                    self.assertEqual(stat.count(), expected.count())
+                    self.assertEqual(stat.min(), expected.min())
+                    self.assertEqual(stat.max(), expected.max())
+                    self.assertEqual(stat.minAt(), expected.minAt())
+                    self.assertEqual(stat.maxAt(), expected.maxAt())
+                    self.assertAlmostEqual(stat.mean(), expected.mean())
+                    self.assertAlmostEqual(stat.dev(), expected.dev())
+                self.assertEqual(sssDiff[sinSource][test][0].count(), len(sNoise))
+
+        missingPath = path.replace('.txt', '_missing.txt')
+        for columnar in (True, False):
+            with self.assertRaisesRegex(AssertionError, missingPath):
+                FFT_Order.compare(self, path, missingPath, columnar=columnar)
+        with self.assertRaisesRegex(FileNotFoundError, missingPath):
+            FFT_Order.compareColumns(missingPath, path)
+
     @unittest.skip("Only for rerun")
     def test_sort(self):
         '''
@@ -3,8 +3,13 @@
 input sequences.
 """
 import math
+import pickle
+import random
+import statistics
 import unittest
 
+import numpy
+
 from histo import Stat, Histo
 
 class TestStat (unittest.TestCase):
@@ -48,6 +53,63 @@ class TestStat (unittest.TestCase):
         self.assertEqual(math.sqrt(2/3), stat.dev())
         self.assertEqual('"Stat: 3, 0.0+/-0.816496580927726"', str(stat))
 
+    def testFromSummary(self):
+        self.assertEmpty(Stat.fromSummary(0, 1, 2, 3, 4))
+        stat = Stat()
+        for value, at in ((0, 'a'), (1, 'b'), (-1, 'c')):
+            stat.accum(value, at)
+        summary = Stat.fromSummary(3, -1, 1, 0, 2, 'c', 'b')
+        self.assertEqual(str(stat), str(summary))
+        self.assertEqual(stat.minAt(), summary.minAt())
+        self.assertEqual(stat.maxAt(), summary.maxAt())
+        self.assertTrue(summary.accum(2))
+        self.assertEqual(2, summary.max())
+        self.assertEqual(4, summary.count())
+
+
+    def testMerge(self):
+        sValue = [random.normalvariate(1e8, 1) for i in range(1000)]
+        expected = Stat()
+        for i, value in enumerate(sValue):
+            expected.accum(value, i)
+        sStat = [Stat() for i in range(7)]
+        for i, value in enumerate(sValue):
+            sStat[i % 7].accum(value, i)
+        sStat.append(Stat())
+        while len(sStat) > 1:
+            sStat = [sStat[i].merge(sStat[i + 1]) if i + 1 < len(sStat) else sStat[i] 
+                     for i in range(0, len(sStat), 2)]
+        stat = pickle.loads(pickle.dumps(sStat[0]))
+        self.assertEqual(expected.count(), stat.count())
+        self.assertEqual(expected.min(), stat.min())
+        self.assertEqual(expected.max(), stat.max())
+        self.assertEqual(expected.minAt(), stat.minAt())
+        self.assertEqual(expected.maxAt(), stat.maxAt())
+        self.assertAlmostEqual(expected.mean(), stat.mean(), delta=1e-6)
+        self.assertAlmostEqual(statistics.pstdev(sValue), expected.dev(), delta=1e-8)
+        self.assertAlmostEqual(statistics.pstdev(sValue), stat.dev(), delta=1e-8)
+
+        stat = Stat()
+        stat += Stat()
+        self.assertEmpty(stat)
+        stat += expected
+        self.assertEqual(str(expected), str(stat))
+
+    def testAccumMany(self):
+        sValue = [0.5, float('nan'), -2, 3, float('inf'), -2, 3, 1]
+        expected = Stat()
+        for i, value in enumerate(sValue):
+            expected.accum(value, i)
+        stat = Stat()
+        self.assertEqual(6, stat.accum_many(numpy.array(sValue)))
+        self.assertEqual(expected.count(), stat.count())
+        self.assertEqual((-2, 2), (stat.min(), stat.minAt()))
+        self.assertEqual((3, 3), (stat.max(), stat.maxAt()))
+        self.assertAlmostEqual(expected.mean(), stat.mean())
+        self.assertAlmostEqual(expected.dev(), stat.dev())
+        self.assertEqual(0, stat.accum_many([float('nan')]))
+        self.assertEqual(1, stat.accum_many([-3], at=['a']))
+        self.assertEqual((-3, 'a'), (stat.min(), stat.minAt()))
 
 class TestHisto (unittest.TestCase):
 
@@ -74,6 +136,36 @@ class TestHisto (unittest.TestCase):
         self.assertListEqual([1]*7, histo.histogram())
         self.assertEqual('"Stat: 9, 0.0+/-1.2909944487358056"', str(histo))
 
+    def testMerge(self):
+        histo = Histo(2, 1.5)
+        other = Histo(2, 1.5)
+        for i in range(-4,5):
+            (histo if i % 2 else other).accum(i/2, i)
+        histo += pickle.loads(pickle.dumps(other))
+        self.assertEqual(9, histo.stat().count())
+        self.assertEqual(-4, histo.stat().minAt())
+        self.assertEqual(4, histo.stat().maxAt())
+        self.assertAlmostEqual(math.sqrt(5/3),  histo.stat().dev())
+        self.assertEqual(1,  histo.less())
+        self.assertEqual(1,  histo.more())
+        self.assertListEqual([1]*7, histo.histogram())
+        with self.assertRaises(ValueError):
+            histo.merge(Histo(3, 1.5))
+
+    def testAccumMany(self):
+        sValue = [i/2 for i in range(-4,5)] + [float('nan'), 0.74, -0.76]
+        expected = Histo(2, 1.5)
+        for i, value in enumerate(sValue):
+            expected.accum(value, i)
+        histo = Histo(2, 1.5)
+        self.assertEqual(11, histo.accum_many(sValue))
+        self.assertEqual(expected.less(), histo.less())
+        self.assertEqual(expected.more(), histo.more())
+        self.assertListEqual(expected.histogram(), histo.histogram())
+        self.assertEqual(expected.stat().minAt(), histo.stat().minAt())
+        self.assertEqual(expected.stat().maxAt(), histo.stat().maxAt())
+        self.assertAlmostEqual(expected.stat().dev(), histo.stat().dev())
+
 
 
 
@@ -4,7 +4,6 @@ Unit test that needs more than one minutes to finish.
 To run a particular test:
     VarianceArithmetic\Python> python -m unittest testManual.<class>.<method>
 '''
-from collections.abc import Callable
 import datetime
 import functools
 import logging
@@ -20,6 +19,7 @@ from matrix import createHilbertMatrix, addNoise
 from matrix import adjugate
 import moment
 from recursiveSin import RecursiveSin
+import samplingStudy
 from taylor import Taylor, NotMonotonicException, NotStableException
 import taylor
 from varDbl import VarDbl
@@ -46,21 +46,14 @@ class TestNormal (unittest.TestCase):
     boundingPath = f"{OUTDIR}/Python/Output/BoundingLeakage.txt"
     linearPath = f"{OUTDIR}/Python/Output/NormalSamples.txt"
 
-    sSample = None
-
     @staticmethod
-    def calcStat(sSample:numpy.array, samples:int) -> tuple[tuple[float, float]]:
+    def calcStat(samples:int) -> tuple[numpy.ndarray, numpy.ndarray]:
         '''
-        Reuse the random sampling array {sSample} to calculate the sample mean and standard deviation
+        The sample means and standard deviations of {samples}, 
+            with the same counts as from {MIN_COUNT} * {SAMPLES[-1]} samples
         '''
-        return tuple([(sSample[i: i+samples].mean(), sSample[i: i+samples].std())
-                    for i in range(0, min(len(sSample), MAX_COUNT*samples), samples)])
-    
-    @staticmethod
-    def initSamples():
-        if not TestNormal.sSample:
-            print(f'Start generating {TestNormal.MIN_COUNT} * {TestNormal.SAMPLES[-1]} samples for normal distribution at {datetime.datetime.now()}')
-            TestNormal.sSample = scipy.stats.norm.rvs(size = TestNormal.MIN_COUNT * TestNormal.SAMPLES[-1])
+        return samplingStudy.chunkedGroupStat(samples, 
+                    min(MAX_COUNT, TestNormal.MIN_COUNT * TestNormal.SAMPLES[-1] // samples))
 
 
     @staticmethod
@@ -78,7 +71,6 @@ class TestNormal (unittest.TestCase):
             
     @unittest.skipIf(SKIP_TEST, 'Ran 1 tests in 83s')
     def test_boundingOutput(self):
-        TestNormal.initSamples()
         sPrev = {}
         with open(TestNormal.boundingPath, 'w') as f:
             f.write(TestNormal.header)
@@ -91,10 +83,9 @@ class TestNormal (unittest.TestCase):
             f.flush()
             for samples in reversed(TestNormal.SAMPLES):
                 print(f'Start calculate samples={samples} for Normal distribution at {datetime.datetime.now()}')
-                sStat = TestNormal.calcStat(TestNormal.sSample, samples)
+                sMean, sDev = TestNormal.calcStat(samples)
                 prev = 1
-                for k in TestNormal.KAPPAS:
-                    sLeak = [TestNormal.boundingLeakage(mu, sigma, k) for mu, sigma in sStat]
+                for k, sLeak in zip(TestNormal.KAPPAS, samplingStudy.boundingLeakage(sMean, sDev, TestNormal.KAPPAS)):
                     mean = numpy.mean(sLeak)
                     self.assertGreater(mean, sPrev[k])
                     self.assertLess(mean, prev)
@@ -133,7 +124,6 @@ class TestNormal (unittest.TestCase):
         '''
         extract the sample count from 1/kappa.
         '''
-        TestNormal.initSamples()
         RESOLUTION = 1000
         MIN_KAPPA = 1.5
         sPrev = {}
@@ -150,33 +140,19 @@ class TestNormal (unittest.TestCase):
             f.flush()
             for samples in reversed(TestNormal.SAMPLES):
                 print(f'Start calculate samples={samples} for Normal distribution at {datetime.datetime.now()}')
-                sStat = TestNormal.calcStat(TestNormal.sSample, samples)
+                sMean, sDev = TestNormal.calcStat(samples)
                 prev = 1
-                for k in TestNormal.KAPPAS:
-                    if k <= MIN_KAPPA:
-                        continue
-                    sLeak = [TestNormal.linearLeakage(mu, sigma, k) for mu, sigma in sStat]
+                sKappa = [k for k in TestNormal.KAPPAS if k > MIN_KAPPA]
+                for k, sLeak in zip(sKappa, samplingStudy.linearLeakage(sMean, sDev, sKappa)):
                     mean = numpy.mean(sLeak)
                     self.assertGreater(mean, 0)
                     self.assertLess(mean, 1)
                     self.assertGreater(mean, sPrev[k])
                     self.assertLess(mean, prev)
                     prev = sPrev[k] = mean
-                    left = leftest = int(MIN_KAPPA * RESOLUTION)
-                    right = rightest = int(k * RESOLUTION)
-                    while (left + 1) < right:
-                        mid = (left + right) // 2
-                        testLeak = TestNormal.linearLeakage(0, 1, mid/RESOLUTION)
-                        if testLeak > mean:
-                            left = mid
-                        else:
-                            right = mid
-                    if left == leftest:
-                        continue
-                    if right == rightest:
+                    kappa = samplingStudy.linearKappa(mean, k, MIN_KAPPA, RESOLUTION)
+                    if kappa is None:
                         continue
-                    kappa = left / RESOLUTION
-                    right /= RESOLUTION
                     self.assertGreater(k, kappa)
                     f.write(f'{samples}\t{k}\t{len(sLeak)}\t{mean}\t{numpy.std(sLeak)}\t{kappa}\n')
                     f.flush()
@@ -274,8 +250,10 @@ class TestBoundingRange (unittest.TestCase):
                             continue
                         sBounding = ssBounding.setdefault(k, {})
                         sBounding[int(n)] = bounding
-                        if bounding not in sMoment:
-                            sMoment[bounding] = moment.Normal(bounding=bounding)
+                # bounding 6 is always swept, because sMoment[6] is the stable reference of the variance ratio below,
+                #   while the sampled boundings are not guaranteed to contain exactly 6
+                sBounding = sorted({6} | {b for sBounding in ssBounding.values() for b in sBounding.values()})
+                sMoment.update(zip(sBounding, moment.Normal.sweep(sBounding)))
             case 'Uniform':
                 sMoment[1] = moment.UNIFORM
                 sBounding = ssBounding.setdefault(1, {})
@@ -413,44 +391,16 @@ class TestRecursiveSin (unittest.TestCase):
 
 
 class TestConvergence (unittest.TestCase):
-    HEADER = 'X\tEdge\tBias\tValue\tUncertainty\tException\n'
-
-    @staticmethod
-    def _search(dxMin: float, dxMax: float, dxRes:int, sX: list[float], 
-                varFunc:Callable[[float, float], VarDbl], valFunc:Callable[[float], float],
-                path: str):
-        with open(path, 'w') as f:
-            f.write(TestConvergence.HEADER)
-            for x in sX:
-                excpt = None
-                res = None
-                iMin = int(dxMin * dxRes)
-                iMax = int(dxMax * dxRes)
-                while iMin + 1 < iMax:
-                    iMid = int((iMin + iMax)/2)
-                    try:
-                        dx = iMid / dxRes
-                        res = varFunc(x, dx)
-                        iMin = iMid
-                    except BaseException as ex:
-                        excpt = ex
-                        iMax = iMid
-                if res is None:
-                    raise ValueError(f'No result for x={x}, dxMin={dxMin}, dxMax={dxMax}, exception={excpt}')
-                if excpt is None:
-                    raise ValueError(f'Noexception for x={x}, dxMin={dxMin}, dxMax={dxMax}')
-                f.write(f'{x}\t{iMin/dxRes}\t{res.value() - valFunc(x)}\t{res.value()}\t{res.uncertainty()}\t{excpt}\n')
-                f.flush()
+    HEADER = Taylor.EDGE_HEADER
 
     @unittest.skipIf(SKIP_TEST, 'Ran 1 test in 2088s')
     def test_pow(self):
         Taylor.pow(VarDbl(1, 0.19929), -1.75, dumpPath=f'{OUTDIR}/Python/Output/Pow_1_0.19929_-1.75.txt')
 
         DIVIDS = 20
-        TestConvergence._search(0.19, 0.21, 100000,
+        Taylor.convergeEdge('pow', 
                 [i/20 for i in range(-3*DIVIDS, 4*DIVIDS + 1) if (i < 0) or ((i % DIVIDS) != 0)],
-                lambda x, dx: Taylor.pow(VarDbl(1, dx), x), lambda x: 1,
-                f'{OUTDIR}/Python/Output/PowEdge.txt')
+                0.19, 0.21, 100000, f'{OUTDIR}/Python/Output/PowEdge.txt')
 
     @unittest.skipIf(SKIP_TEST, 'Ran 1 test in 4187s')
     def test_pow_uniform(self):
@@ -460,26 +410,19 @@ class TestConvergence (unittest.TestCase):
                    dumpPath=f'{OUTDIR}/Python/Output/Pow_1_0.58_2.9.Uniform.txt')
 
         DIVIDS = 20
-        TestConvergence._search(0.57, 0.59, 100000,
+        Taylor.convergeEdge('pow', 
                 [i/20 for i in range(-3*DIVIDS, 4*DIVIDS + 1) if (i < 0) or ((i % DIVIDS) != 0)],
-                lambda x, dx: Taylor.pow(VarDbl(1, dx), x, moment=moment.UNIFORM), lambda x: 1,
-                f'{OUTDIR}/Python/Output/PowEdge.Uniform.txt')
+                0.57, 0.59, 100000, f'{OUTDIR}/Python/Output/PowEdge.Uniform.txt', moment=moment.UNIFORM)
 
     def test_sin(self):
         DIVIDS = 64
-        TestConvergence._search(0.3, 5.0, 1000,
-                [math.pi*i/DIVIDS for i in range(-1*DIVIDS, 1*DIVIDS + 1)],
-                lambda x, dx: Taylor.sin(VarDbl(x, dx)), 
-                lambda x: math.sin(x),
-                f'{OUTDIR}/Python/Output/SinEdge.txt')
+        Taylor.convergeEdge('sin', [math.pi*i/DIVIDS for i in range(-1*DIVIDS, 1*DIVIDS + 1)],
+                0.3, 5.0, 1000, f'{OUTDIR}/Python/Output/SinEdge.txt')
         
     def test_sin_uniform(self):
         DIVIDS = 64
-        TestConvergence._search(0.3, 5.0, 1000,
-                [math.pi*i/DIVIDS for i in range(-1*DIVIDS, 1*DIVIDS + 1)],
-                lambda x, dx: Taylor.sin(VarDbl(x, dx), moment=moment.UNIFORM), 
-                lambda x: math.sin(x),
-                f'{OUTDIR}/Python/Output/SinEdge.Uniform.txt')
+        Taylor.convergeEdge('sin', [math.pi*i/DIVIDS for i in range(-1*DIVIDS, 1*DIVIDS + 1)],
+                0.3, 5.0, 1000, f'{OUTDIR}/Python/Output/SinEdge.Uniform.txt', moment=moment.UNIFORM)
         
 
     def test_exp(self):
@@ -488,11 +431,8 @@ class TestConvergence (unittest.TestCase):
             Taylor.exp(VarDbl(0, 20), dumpPath=f'{OUTDIR}/Python/Output/Exp_0_17.txt')
 
         dumpPath = f'{OUTDIR}/Python/Output/ExpEdge.txt'
-        TestConvergence._search(19, 20, 1000,
-                (0, 1, -1, 2, -2, 5, -5, 10, -10, 20, -20, 50, -50, 100, -100),
-                lambda x, dx: Taylor.exp(VarDbl(x, dx)), 
-                lambda x: math.exp(x),
-                dumpPath)
+        Taylor.convergeEdge('exp', (0, 1, -1, 2, -2, 5, -5, 10, -10, 20, -20, 50, -50, 100, -100),
+                19, 20, 1000, dumpPath)
         with open(dumpPath) as f:
             hdr = next(f)
             self.assertEqual(hdr, TestConvergence.HEADER)  
@@ -508,11 +448,9 @@ class TestConvergence (unittest.TestCase):
 
     def test_log(self):
         dumpPath = f'{OUTDIR}/Python/Output/LogEdge.txt'
-        TestConvergence._search(0.20, 0.21, 100000,
+        Taylor.convergeEdge('log', 
                 (1, 2, 0.5, 5, 0.2, 10, 0.1, 20, 0.05, 50, 0.02, 100, 0.01, 200, 0.005, 500, 0.002, 1000, 0.001),
-                lambda x, dx: Taylor.log(VarDbl(x, x*dx)), 
-                lambda x: math.log(x),
-                dumpPath)
+                0.20, 0.21, 100000, dumpPath)
         with open(dumpPath) as f:
             hdr = next(f)
             self.assertEqual(hdr, TestConvergence.HEADER)  
@@ -526,11 +464,9 @@ class TestConvergence (unittest.TestCase):
         
     def test_log_uniform(self):
         dumpPath = f'{OUTDIR}/Python/Output/LogEdge.uniform.txt'
-        TestConvergence._search(0.57, 0.59, 100000,
+        Taylor.convergeEdge('log', 
                 (1, 2, 0.5, 5, 0.2, 10, 0.1, 20, 0.05, 50, 0.02, 100, 0.01, 200, 0.005, 500, 0.002, 1000, 0.001),
-                lambda x, dx: Taylor.log(VarDbl(x, x*dx), moment=moment.UNIFORM), 
-                lambda x: math.log(x),
-                dumpPath)
+                0.57, 0.59, 100000, dumpPath, moment=moment.UNIFORM)
         with open(dumpPath) as f:
             hdr = next(f)
             self.assertEqual(hdr, TestConvergence.HEADER)  
@@ -3,8 +3,11 @@ high-precision reference table, checks bounding/leakage, and writes the
 generated moment table for cross-implementation comparison.
 """
 import os
+import tempfile
 import unittest
 
+import mpmath
+
 from indexSin import OUTDIR
 import moment
 
@@ -28,6 +31,34 @@ class TestNormal (unittest.TestCase):
         moment.Normal.calcPreciseNorm(maxOrder=24)
         self.assertTrue(os.path.isfile(TestNormal.filePath))
 
+    def testCalcRecur(self):
+        with tempfile.TemporaryDirectory() as outDir:
+            filePath = f'{outDir}/NormalMoment_5.0.txt'
+            sPrecise = moment.Normal.calcRecurNorm(5.0, filePath=filePath)
+            self.assertEqual(len(sPrecise), 226)
+            with mpmath.workdps(30):
+                norm = mpmath.erf(5 / mpmath.sqrt(2))
+                for n in (2, 10, 40, 100, 298, 450):
+                    expected = mpmath.quad(lambda x: x**n * mpmath.npdf(x), [-5, 0, 5]) / norm
+                    self.assertAlmostEqual(float(sPrecise[n//2] / expected), 1, delta=1e-15)
+
+            bounding, sMoment = moment.Normal.readPreciseNorm(filePath)
+            self.assertEqual(bounding, 5)
+            self.assertEqual(len(sMoment), 226)
+            for m, precise in zip(sMoment, TestNormal.preciseNormalMoment5()):
+                self.assertAlmostEqual(m, precise)
+            mmt = moment.Normal(5.0)
+            for i in range(mmt.maxOrder // 2):
+                self.assertAlmostEqual(sMoment[i] / mmt[i*2], 1, delta=1e-14)
+
+            with open(filePath) as f:
+                sLine = f.readlines()
+            with open(filePath, 'w') as f:
+                f.writelines(sLine[:20])
+            moment.Normal.calcRecurNorm(5.0, filePath=filePath)
+            with open(filePath) as f:
+                self.assertListEqual(f.readlines(), sLine)
+
     @unittest.skip('file may not exist')
     def testReadPrecice(self):
         bounding, sMoment = moment.Normal.readPreciseNorm(TestNormal.filePath)
@@ -50,6 +81,22 @@ class TestNormal (unittest.TestCase):
             self.assertEqual(mmt[i*2 + 1], 0)
 
 
+    def testSweep(self):
+        sBounding = (2, 3.5, 5, 6)
+        sMoment = moment.Normal.sweep(sBounding)
+        self.assertEqual(len(sBounding), len(sMoment))
+        for bounding, mmt in zip(sBounding, sMoment):
+            expected = moment.Normal(bounding=bounding)
+            self.assertIsInstance(mmt, moment.Normal)
+            self.assertEqual(bounding, mmt.bounding)
+            self.assertEqual(expected.leakage, mmt.leakage)
+            self.assertEqual(expected.maxOrder, mmt.maxOrder)
+            for n in range(expected.maxOrder):
+                self.assertEqual(expected[n], mmt[n])
+            self.assertIs(type(mmt[2]), float)
+            self.assertIs(sMoment[0]._sMoment.base, mmt._sMoment.base)
+
+
 class TestUniform (unittest.TestCase):
 
     def testUniform(self):
@@ -6,10 +6,13 @@ import math
 import os
 import random
 import unittest
+import unittest.mock
+
+import numpy
 
 from histo import Stat
 from indexSin import OUTDIR
-from movingLineFit import FitType, movingLineFit
+from movingLineFit import FitType, MovingLineFit, movingLineFit, movingLineFitArray
 from varDbl import VarDbl
 
 
@@ -142,6 +145,69 @@ class TestMovingLineFitImprecise (unittest.TestCase):
                 movingLineFit(sInput, half, FitType.MOVING)
         self.verify(sExpect, noise, ssFit)
 
+    def testVarianceDrift(self):
+        half = 20
+        sInput = [VarDbl(random.normalvariate(), random.uniform(0.1, 10)) if i % 7 else float(i) 
+                  for i in range(3000)]
+        sLocal = movingLineFit(sInput, half, FitType.LOCAL)
+        for resync, prec in ((3, 1e-14), (1 << 10, 1e-10)):
+            with unittest.mock.patch('movingLineFit.RESYNC_STEPS', resync):
+                sMoving = movingLineFit(sInput, half, FitType.MOVING)
+            self.assertEqual(len(sLocal), len(sMoving))
+            for local, moving in zip(sLocal, sMoving):
+                for k in range(2):
+                    self.assertAlmostEqual(local[k].value(), moving[k].value(), 
+                                           delta=1e-10 * max(1, abs(local[k].value())))
+                    self.assertAlmostEqual(local[k].uncertainty(), moving[k].uncertainty(), 
+                                           delta=prec * local[k].uncertainty())
+
+    def testStream(self):
+        half = 5
+        sInput = [VarDbl(i + random.normalvariate(), random.uniform(0.1, 1)) if i % 5 else float(i) 
+                  for i in range(2000)]
+        for fitType in FitType:
+            sExpect = movingLineFit(sInput, half, fitType)
+            stream = MovingLineFit(half, fitType)
+            self.assertIsNone(stream.add(sInput[0]))
+            sFit = list(stream.fit(iter(sInput[1:100]))) + list(stream.fit(iter(sInput[100:])))
+            self.assertEqual(len(stream.sBuffer), 2 * half + 1)
+            self.assertEqual(len(sExpect), len(sFit))
+            for expect, fit in zip(sExpect, sFit):
+                for k in range(2):
+                    self.assertEqual(expect[k].value(), fit[k].value())
+                    self.assertEqual(expect[k].uncertainty(), fit[k].uncertainty())
+
+            sFloat = [i * 0.5 for i in range(50)]
+            for expect, fit in zip(movingLineFit(sFloat, half, fitType), MovingLineFit(half, fitType).fit(sFloat)):
+                self.assertEqual(VarDbl(expect[0]).value(), VarDbl(fit[0]).value())
+                self.assertEqual(VarDbl(expect[1]).value(), VarDbl(fit[1]).value())
+
+    def testArray(self):
+        for half, length in ((2, 5), (3, 20), (7, 1000)):
+            sValue = numpy.random.normal(size=(4, length)) + numpy.arange(length)
+            sVariance = numpy.random.uniform(0.01, 1, size=(4, length))
+            scale = numpy.max(numpy.abs(sValue))
+            for fitType in (FitType.LOCAL, FitType.MOVING):
+                ssFit = movingLineFitArray(sValue, sVariance, half, fitType)
+                sFit1d = movingLineFitArray(sValue[1], sVariance[1], half, fitType)
+                for i in range(4):
+                    self.assertEqual(ssFit[i].shape, (4, length - 2 * half))
+                    self.assertTrue(numpy.array_equal(ssFit[i][1], sFit1d[i]))
+                for channel in range(4):
+                    sExpect = movingLineFit([VarDbl(float(value), math.sqrt(variance)) 
+                                             for value, variance in zip(sValue[channel], sVariance[channel])], 
+                                            half, FitType.LOCAL)
+                    for j, expect in enumerate(sExpect):
+                        for k in range(2):
+                            self.assertAlmostEqual(expect[k].value(), ssFit[2 * k][channel][j], 
+                                                   delta=math.ulp(scale) * 4 * (2 * half + 1))
+                            self.assertAlmostEqual(expect[k].uncertainty(), ssFit[2 * k + 1][channel][j], 
+                                                   delta=1e-13 * expect[k].uncertainty())
+        with self.assertRaises(ValueError):
+            movingLineFitArray(sValue, sVariance[:2], half, FitType.LOCAL)
+        with self.assertRaises(ValueError):
+            movingLineFitArray(sValue, sVariance, half, FitType.MOVING_NO_VAR_ADJ)
+
     def testDump(self):
         half = 2
         noise = 0.2
@@ -2,6 +2,7 @@
 generation of sin/cos values from sin(0)=0 and sin(pi/2)=1 and validates
 self-consistency of summation identities.
 """
+import os
 import unittest
 
 from recursiveSin import RecursiveSin
@@ -39,6 +40,17 @@ class TestRecursiveSin (unittest.TestCase):
             self.assertAlmostEqual(regr4._sSin[i].value(), regr5._sSin[i << 1].value())
             self.assertAlmostEqual(regr4._sSin[i].uncertainty(), regr5._sSin[i << 1].uncertainty())
 
+    def test_byLevel(self):
+        dirPath = './Output' if os.getcwd().endswith('Python') else './Python/Output'
+        sLines = []
+        for byLevel in (False, True):
+            regr = RecursiveSin(6)
+            regr.calc(byLevel=byLevel)
+            for suffix in ('.txt', '.err.txt'):
+                with open(f'{dirPath}/RegrSin_6{suffix}') as f:
+                    sLines.append(sorted(f.readlines()))
+        self.assertListEqual(sLines[:2], sLines[2:])
+
 
 
 
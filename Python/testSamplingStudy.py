@@ -0,0 +1,69 @@
+"""Unit tests for samplingStudy.py — verifies the grouped sample statistics
+against per-group slicing, the chunked sample generation, and the broadcast
+bounding/linear leakage against their scalar formulas.
+"""
+import math
+import unittest
+
+import numpy
+import scipy
+
+import samplingStudy
+
+
+class TestGroupStat (unittest.TestCase):
+
+    def testView(self):
+        sSample = numpy.random.default_rng(1).standard_normal(10 * 7 + 3)
+        sMean, sDev = samplingStudy.groupStat(sSample, 7)
+        self.assertEqual(10, len(sMean))
+        for i in range(10):
+            self.assertEqual(sSample[i*7: i*7 + 7].mean(), sMean[i])
+            self.assertEqual(sSample[i*7: i*7 + 7].std(), sDev[i])
+        self.assertTrue(numpy.shares_memory(sSample, sSample[:70].reshape(10, 7)))
+
+        sMean, sDev = samplingStudy.groupStat(sSample, 7, maxCount=3)
+        self.assertEqual(3, len(sMean))
+
+    def testChunked(self):
+        sMean, sDev = samplingStudy.chunkedGroupStat(5, 100, rng=numpy.random.default_rng(2))
+        sChunkMean, sChunkDev = samplingStudy.chunkedGroupStat(5, 100, chunkSize=12, rng=numpy.random.default_rng(2))
+        numpy.testing.assert_array_equal(sMean, sChunkMean)
+        numpy.testing.assert_array_equal(sDev, sChunkDev)
+        self.assertEqual(100, len(sMean))
+
+        sMean, sDev = samplingStudy.chunkedGroupStat(50, 10000, chunkSize=1000, rng=numpy.random.default_rng(3))
+        self.assertAlmostEqual(0, numpy.mean(sMean), delta=0.01)
+        self.assertAlmostEqual(1, numpy.mean(sDev), delta=0.02)
+
+
+class TestLeakage (unittest.TestCase):
+
+    def testBounding(self):
+        ssLeak = samplingStudy.boundingLeakage((0,), (1,), range(1, 7))
+        for k in range(1, 7):
+            self.assertAlmostEqual(k, scipy.special.erfinv(1 - ssLeak[k - 1, 0]) * math.sqrt(2))
+        sMean, sDev = (0.1, -0.2), (1.1, 0.9)
+        ssLeak = samplingStudy.boundingLeakage(sMean, sDev, (2, 3))
+        self.assertEqual((2, 2), ssLeak.shape)
+        for i, k in enumerate((2, 3)):
+            for j, (mu, sigma) in enumerate(zip(sMean, sDev)):
+                self.assertAlmostEqual(1 - scipy.special.erf(abs(k*sigma - mu) * samplingStudy.INV_SQRT2)*0.5 \
+                                         - scipy.special.erf(abs(k*sigma + mu) * samplingStudy.INV_SQRT2)*0.5,
+                                       ssLeak[i, j])
+
+    def testLinear(self):
+        self.assertAlmostEqual(samplingStudy.linearLeakage((0,), (1,), (5,))[0, 0], 1.4867204e-5)
+        ssLeak = samplingStudy.linearLeakage((0, 0.1), (1, 1), (2, 3, 4))
+        for i in range(3):
+            self.assertLess(ssLeak[i, 0], ssLeak[i, 1])
+
+    def testLinearKappa(self):
+        leak = samplingStudy.linearLeakage((0,), (1,), (2.5,))[0, 0]
+        self.assertEqual(2.499, samplingStudy.linearKappa(leak, 3, 1.5, 1000))
+        self.assertIsNone(samplingStudy.linearKappa(leak, 2.5, 1.5, 1000))
+        self.assertIsNone(samplingStudy.linearKappa(1, 3, 1.5, 1000))
+
+
+if __name__ == '__main__':
+    unittest.main()
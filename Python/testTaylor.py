@@ -16,7 +16,7 @@ import analytic
 from histo import Stat, Histo
 from indexSin import OUTDIR
 import moment
-from taylor import Taylor, Taylor1dException, NotFiniteException, NotPositiveException, NotMonotonicException
+from taylor import Taylor, PowKernel, TaylorCache, TaylorDump, TaylorProfile, Convergence, Taylor1dException, NotFiniteException, NotPositiveException, NotMonotonicException
 from varDbl import VarDbl, InitException
 
 logger = logging.getLogger(__name__)
@@ -612,11 +612,169 @@ class TestDumpFile (unittest.TestCase):
         self.assertEqual(len(sExpansion), 429)
         self.assertEqual(sExpansion[-1].monotonics, 0)
 
+    def test_binary(self):
+        textPath = f'{OUTDIR}/Python/Output/Pow_1_0.2_-1.txt'
+        dumpPath = f'{OUTDIR}/Python/Output/Pow_1_0.2_-1.npz'
+        res = Taylor.pow(VarDbl(1, 0.2), -1, dumpPath=dumpPath)
+        self.assertEqual(res, Taylor.pow(VarDbl(1, 0.2), -1, dumpPath=textPath))
+        sInput, sExpansion, out = Taylor.verifyDumpFile(self, dumpPath)
+        sTextInput, sTextExpansion, textOut = Taylor.verifyDumpFile(self, textPath)
+        self.assertEqual(sTextInput, sInput)
+        self.assertEqual(len(sExpansion), moment.NORMAL.maxOrder)
+        self.assertEqual(str(sTextExpansion), str(sExpansion))
+        self.assertEqual(textOut, out)
 
+        sWord, sBinExpansion, sOutput = TaylorDump.read(dumpPath)
+        self.assertEqual(str(sTextExpansion), str(sBinExpansion))
+        self.assertEqual('True', sWord[3])
+        self.assertEqual('', sOutput[-1])
 
+        convertPath = f'{OUTDIR}/Python/Output/Pow_1_0.2_-1.npz.txt'
+        TaylorDump.toText(dumpPath, convertPath)
+        sInput, sExpansion, out = Taylor.verifyDumpFile(self, convertPath)
+        self.assertEqual(str(sTextExpansion), str(sExpansion))
+        self.assertEqual(textOut, out)
+
+        dumpPath = f'{OUTDIR}/Python/Output/Pow_1_0.2_-2.npz'
+        with self.assertRaises(NotMonotonicException):
+            Taylor.pow(VarDbl(1, 0.2), -2, dumpPath=dumpPath)
+        sInput, sExpansion, out = Taylor.verifyDumpFile(self, dumpPath)
+        self.assertEqual(out, "NotMonotonicException")
+        self.assertEqual(len(sExpansion), moment.NORMAL.maxOrder)
 
 
 
+
+
+
+class TestConvergencePolicy (unittest.TestCase):
+
+    def test_converged(self):
+        for func, sArg in ((Taylor.exp, (VarDbl(1, 0.1),)), (Taylor.sin, (VarDbl(1, 0.1),)), 
+                           (Taylor.log, (VarDbl(2, 0.1),)), (Taylor.pow, (VarDbl(2, 0.1), -1.5))):
+            convergence = Convergence()
+            expected = func(*sArg)
+            res = func(*sArg, convergence=convergence)
+            self.assertAlmostEqual(expected.value(), res.value(), delta=math.ulp(expected.value()))
+            self.assertAlmostEqual(expected.uncertainty(), res.uncertainty(), delta=math.ulp(expected.uncertainty()))
+            self.assertLessEqual(Taylor.MIN_MONOTONIC_COUNT * 2, convergence.orders)
+            self.assertLess(convergence.orders, moment.NORMAL.maxOrder // 4)
+
+    def test_exception(self):
+        with self.assertRaises(NotMonotonicException):
+            Taylor.pow(VarDbl(1, 0.2), -2, convergence=Convergence())
+        with self.assertRaises(ValueError):
+            Convergence(0)
+
+
+class TestProfile (unittest.TestCase):
+
+    def tearDown(self):
+        Taylor.profile = None
+
+    def test_profile(self):
+        Taylor.profile = TaylorProfile()
+        Taylor.exp(VarDbl(1, 0.1))
+        Taylor.exp(VarDbl(2, 0.1))
+        Taylor.exp(VarDbl(2))
+        with self.assertRaises(NotMonotonicException):
+            Taylor.pow(VarDbl(1, 0.2), -2)
+        sCounter = Taylor.profile.asDict()
+        self.assertSetEqual({'exp()', '()**-2'}, set(sCounter))
+        self.assertEqual(3, sCounter['exp()']['calls'])
+        self.assertEqual({}, sCounter['exp()']['exceptions'])
+        self.assertEqual(3, sum(sCounter['exp()']['timeHisto'].values()))
+        self.assertLess(0, sCounter['exp()']['orders']['mean'])
+        self.assertEqual({'NotMonotonicException': 1}, sCounter['()**-2']['exceptions'])
+        self.assertEqual(moment.NORMAL.maxOrder - 1, sCounter['()**-2']['orders']['max'])
+        sLine = Taylor.profile.table().split('\n')
+        self.assertEqual(TaylorProfile.HEADER, sLine[0] + '\n')
+        self.assertEqual(len(TaylorProfile.HEADER.split('\t')), len(sLine[1].split('\t')))
+        Taylor.profile.clear()
+        self.assertEqual({}, Taylor.profile.asDict())
+
+
+class TestCache (unittest.TestCase):
+
+    def tearDown(self):
+        Taylor.cache = None
+
+    def test_cache(self):
+        Taylor.cache = TaylorCache(2)
+        res = Taylor.exp(VarDbl(1, 0.1))
+        self.assertIs(res, Taylor.exp(VarDbl(1, 0.1), moment.NORMAL))
+        self.assertEqual((1, 1), (Taylor.cache.hits, Taylor.cache.misses))
+        self.assertIsNot(res, Taylor.exp(VarDbl(1, 0.1), dumpPath=f'{OUTDIR}/Python/Output/Exp_1_0.1.npz'))
+        self.assertIsNot(res, Taylor.exp(VarDbl(1, 0.1), convergence=Convergence()))
+        self.assertEqual((1, 1), (Taylor.cache.hits, Taylor.cache.misses))
+
+        Taylor.pow(VarDbl(1, 0.1), -1.5)
+        Taylor.pow(VarDbl(1, 0.1), 1.5)
+        self.assertEqual((2, (1, 3)), (len(Taylor.cache), (Taylor.cache.hits, Taylor.cache.misses)))
+        self.assertIsNot(res, Taylor.exp(VarDbl(1, 0.1)))
+        with self.assertRaises(NotMonotonicException):
+            Taylor.pow(VarDbl(1, 0.2), -2)
+        with self.assertRaises(NotMonotonicException):
+            Taylor.pow(VarDbl(1, 0.2), -2)
+        self.assertEqual((1, 6), (Taylor.cache.hits, Taylor.cache.misses))
+
+        Taylor.cache.clear()
+        self.assertEqual((0, (0, 0)), (len(Taylor.cache), (Taylor.cache.hits, Taylor.cache.misses)))
+        with self.assertRaises(ValueError):
+            TaylorCache(0)
+
+
+class TestPowKernel (unittest.TestCase):
+
+    def test_pow(self):
+        rng = random.Random(1)
+        sInput = [VarDbl(x := 10**rng.uniform(-3, 3), x * 10**rng.uniform(-17, -1)) for i in range(50)]
+        sInput += [VarDbl(2.0), VarDbl(0.5, 1e-17), VarDbl(1, 0.1)]
+        for exp in (0.5, -1.5):
+            kernel = PowKernel.get(exp)
+            self.assertIs(kernel, PowKernel.get(exp))
+            for input, res in zip(sInput, kernel.powMany(sInput)):
+                expected = Taylor.pow(input, exp)
+                self.assertAlmostEqual(res.value() / expected.value(), 1, delta=1e-15)
+                self.assertAlmostEqual(res.uncertainty(), expected.uncertainty(), delta=expected.uncertainty()*1e-12)
+        self.assertEqual(repr(Taylor.sqrt(VarDbl(2, 0.01))), repr(Taylor.pow(VarDbl(2, 0.01), 0.5)))
+
+    def test_cache(self):
+        kernel = PowKernel.get(0.5)
+        for i in range(PowKernel.MAX_KERNELS):
+            PowKernel.get(i + 0.25)
+            self.assertLessEqual(len(PowKernel._cache), PowKernel.MAX_KERNELS)
+        self.assertIsNot(kernel, PowKernel.get(0.5))
+
+    def test_exception(self):
+        with self.assertRaises(NotMonotonicException):
+            Taylor.sqrt(VarDbl(1, 0.3))
+        with self.assertRaises(NotMonotonicException):
+            PowKernel.get(0.5).powMany((VarDbl(1, 0.1), VarDbl(1, 0.3)))
+        with self.assertRaises(ValueError):
+            PowKernel(2)
+
+
+class TestConvergeEdge (unittest.TestCase):
+
+    def test_exp(self):
+        path = f'{OUTDIR}/Python/Output/ExpEdge.test.txt'
+        Taylor.convergeEdge('exp', (0, 1, -1), 19, 20, 100, path, maxWorkers=2)
+        with open(path) as f:
+            self.assertEqual(next(f), Taylor.EDGE_HEADER)
+            sX = []
+            for line in f:
+                sWords = line.split('\t')
+                x, edge, bias, val, unc = map(float, sWords[:-1])
+                sX.append(x)
+                self.assertEqual(edge, 19.86)
+                self.assertAlmostEqual(bias, val - math.exp(x))
+                self.assertTrue(sWords[-1].startswith('NotMonotonicException'))
+            self.assertListEqual(sX, [0, 1, -1])
+        with self.assertRaises(ValueError):
+            Taylor.convergeEdge('cos', (0,), 0.3, 5.0, 1000, path)
+
+
 class TestStat (unittest.TestCase):
     @staticmethod
     def writePowerHeader(f, divids:int=5, devs:int=3):
@@ -4,11 +4,12 @@ propagation.
 """
 import math
 import pickle
+import random
 import unittest
 import sys
 
 from indexSin import OUTDIR
-from varDbl import VarDbl, InitException, InitException, validate, assertVarDblEqual
+from varDbl import VarDbl, InitException, InitException, validate, assertVarDblEqual, ulpByBit
 from taylor import NotFiniteException, NotMonotonicException, NotPositiveException
 
 
@@ -96,6 +97,25 @@ class TestInit (unittest.TestCase):
     def testUlp(self):
         self.assertAlmostEqual(VarDbl.ulp(4.69569871120438e-319), 4.94065645841247e-324)
 
+    def testUlpLargeInt(self):
+        for value in (0, 1, VarDbl.DOUBLE_MAX_SIGNIFICAND, 1 << 53, (1 << 53) + 1, (1 << 54) + 1, (1 << 54) + 3, 
+                      -((1 << 54) + 3), (1 << 2000) + 1, (1 << 2000) + (1 << 1000)):
+            self.assertEqual(ulpByBit(value), VarDbl.ulp(value))
+        rand = random.Random(1)
+        for bits in (54, 55, 60, 100, 107, 108, 200, 1100, 4000):
+            for i in range(100):
+                value = rand.getrandbits(bits) | (1 << (bits - 1))
+                expected = ulpByBit(value)
+                self.assertAlmostEqual(expected, VarDbl.ulp(value), delta=math.ulp(expected))
+
+    def testUlpHugeInt(self):
+        rand = random.Random(1)
+        for bits in (1024, 4096, 16384):
+            for i in range(5):
+                value = rand.getrandbits(bits)
+                expected = ulpByBit(value)
+                self.assertAlmostEqual(expected, VarDbl.ulp(value), delta=math.ulp(expected))
+
 
 class TestRepresentation (unittest.TestCase):
     def testStr(self):
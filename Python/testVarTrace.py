@@ -0,0 +1,110 @@
+"""Unit tests for varTrace.py — verifies the recording of VarDbl operations
+and Taylor calls into an expression graph, and its replay over numpy arrays
+against calling the same function with VarDbl element by element.
+"""
+import math
+import unittest
+
+import numpy
+
+from taylor import Taylor
+from varDbl import VarDbl
+from varTrace import TraceVar, VarTrace, tracing
+
+ONE = VarDbl(1, 0)
+HALF = VarDbl(1/2, 0)
+
+def halfAngle(sin1, cos1, sin2, cos2):
+    x = cos1 * cos2 - sin1 * sin2
+    return ((ONE - x) *HALF) ** 0.5
+
+def poly(x, y):
+    return x**2 + y**3 - 1 + 0.1 * x * y - ONE / y + x / 3
+
+
+class TestTrace (unittest.TestCase):
+
+    def testRecord(self):
+        trace = VarTrace(lambda x, y: ONE - x * y / 2, 2)
+        sOp = [node[0] for node in trace.nodes()]
+        self.assertListEqual(['input', 'input', 'mul', 'const', 'mul', 'const', 'add', 'neg'], sOp)
+        self.assertEqual(len(sOp), len(trace))
+        self.assertEqual(0.5, trace.nodes()[3][1].value())
+
+        trace = VarTrace(lambda x, y: 2 / (x - y), 2)
+        self.assertEqual(('taylor', 3, 'pow', -1), trace.nodes()[4][:4])
+
+        trace = VarTrace(lambda x: Taylor.exp(x) + Taylor.log(x, dumpPath=None), 1)
+        self.assertListEqual(['exp', 'log'], [node[2] for node in trace.nodes() if node[0] == 'taylor'])
+
+    def testInvalid(self):
+        with self.assertRaises(TypeError):
+            VarTrace(lambda x: x if x > 0 else -x, 1)
+        with self.assertRaises(TypeError):
+            VarTrace(lambda x, y: x == y, 2)
+        with self.assertRaises(ValueError):
+            VarTrace(lambda x: Taylor.sin(x, dumpPath='sin.txt'), 1)
+        other = VarTrace(lambda x: x, 1)
+        with self.assertRaises(ValueError):
+            VarTrace(lambda x: x + TraceVar(other, 0), 1)
+
+    def testTracing(self):
+        self.assertIsNone(Taylor.tracer)
+        with self.assertRaises(TypeError):
+            VarTrace(lambda x: Taylor.exp(x) if x > 0 else x, 1)
+        self.assertIsNone(Taylor.tracer)
+        with tracing():
+            self.assertIs(TraceVar, Taylor.tracer)
+        self.assertIsNone(Taylor.tracer)
+
+
+class TestReplay (unittest.TestCase):
+
+    def assertReplay(self, func, ssInput):
+        value, uncertainty = VarTrace(func, len(ssInput)).replay(*ssInput)
+        for i in range(len(value)):
+            try:
+                expected = func(*[VarDbl(sValue[i], sUncertainty[i]) for sValue, sUncertainty in ssInput])
+            except Exception:
+                self.assertTrue(math.isnan(value[i]))
+                self.assertTrue(math.isnan(uncertainty[i]))
+                continue
+            self.assertEqual(expected.value(), value[i])
+            self.assertAlmostEqual(expected.uncertainty(), uncertainty[i], delta=expected.uncertainty()*1e-15)
+
+    def testHalfAngle(self):
+        rng = numpy.random.default_rng(1)
+        self.assertReplay(halfAngle, [(rng.uniform(0, 1, 20), 10.0**rng.uniform(-17, -3, 20)) for i in range(4)])
+
+    def testPoly(self):
+        rng = numpy.random.default_rng(2)
+        ssInput = [(rng.uniform(0.1, 3, 20), 10.0**rng.uniform(-17, -1, 20)) for i in range(2)]
+        ssInput[0][1][0] = 0
+        self.assertReplay(poly, ssInput)
+
+    def testVariance(self):
+        '''
+        1.3807886563758665e-16 **2 is not rounded the same as 1.3807886563758665e-16 * 1.3807886563758665e-16
+        '''
+        value, uncertainty = VarTrace(lambda x, y: x + y, 2).replay(
+                (numpy.array([0.9101129912847172]), numpy.array([1.3807886563758665e-16])),
+                (numpy.array([0.08988700871528267]), numpy.array([2.082081846999179e-17])))
+        expected = VarDbl(0.9101129912847172, 1.3807886563758665e-16) + VarDbl(0.08988700871528267, 2.082081846999179e-17)
+        self.assertEqual((expected.value(), expected.uncertainty()), (value[0], uncertainty[0]))
+
+    def testTaylor(self):
+        func = lambda x: Taylor.exp(x) * 2 - Taylor.log(x) + Taylor.sin(x) / x ** 1.5
+        self.assertReplay(func, [(numpy.array([0.5, 1, 2, 1, -1]), numpy.array([0.01, 0, 1e-10, 0.5, 0.1]))])
+
+    def testBroadcast(self):
+        trace = VarTrace(lambda x, y: x * y + 1, 2)
+        value, uncertainty = trace.replay((numpy.ones((2, 3)), 0.1), (2, 0))
+        self.assertEqual((2, 3), value.shape)
+        numpy.testing.assert_array_equal(value, 3)
+        numpy.testing.assert_array_equal(uncertainty, 0.2)
+        value, uncertainty = VarTrace(lambda: ONE, 0).replay()
+        self.assertEqual((1, 0), (value, uncertainty))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,23 +39,31 @@ class VarDbl (numbers.Number):
         # rounding error is uniformly distrubuted within LSB of float
     @staticmethod
     def ulp(value:typing.Union[float, int]) -> float:
+        '''
+        The rounding uncertainty of {value} when it is converted to float.
+        For an int beyond DOUBLE_MAX_SIGNIFICAND, the result is the same as ulpByBit() up to its final rounding,
+            in O(log(bits)) big-int operations, which is not O(1) but much faster than O(bits) Python steps.
+        '''
         if type(value) == float:
             return math.ulp(value) * VarDbl.DEVIATION_OF_LSB
         if type(value) == int:
-            round = 0.0
-            posi = True
+            # The {shift} low bits are discarded to fit DOUBLE_MAX_SIGNIFICAND.
+            # From the lowest, the discarded 1 bits are alternately added and subtracted, 
+            #   so a 1 bit is added when the parity of the 1 bits up to it is odd.
+            # The prefix parity is found by XOR with shifting in doubling steps,
+            #   which takes O(log(bits)) big-int operations instead of the O(bits) steps of ulpByBit().
             val = abs(value)
-            while VarDbl.DOUBLE_MAX_SIGNIFICAND < val:
-                round *= 0.5
-                if val & 1:
-                    if posi:
-                        round += 1
-                        posi = False
-                    else:
-                        round -= 1
-                        posi = True
-                val >>= 1
-            return round
+            shift = val.bit_length() - VarDbl.DOUBLE_MAX_SIGNIFICAND.bit_length()
+            if shift <= 0:
+                return 0.0
+            low = val & ((1 << shift) - 1)
+            parity = low
+            step = 1
+            while step < shift:
+                parity ^= parity << step
+                step <<= 1
+            posi = low & parity
+            return (posi - (low ^ posi)) / (1 << (shift - 1))
         return VarDbl.ulp(float(value))
             
     __slots__ = ('_value', '_uncertainty')
@@ -240,6 +248,26 @@ class VarDbl (numbers.Number):
   
 
 
+def ulpByBit(value:int) -> float:
+    '''
+    The reference of VarDbl.ulp() for an int {value}, which rounds at each discarded bit in O(bits) steps.
+    '''
+    round = 0.0
+    posi = True
+    val = abs(value)
+    while VarDbl.DOUBLE_MAX_SIGNIFICAND < val:
+        round *= 0.5
+        if val & 1:
+            if posi:
+                round += 1
+                posi = False
+            else:
+                round -= 1
+                posi = True
+        val >>= 1
+    return round
+
+
 def assertVarDblEqual(self:unittest.TestCase, l:VarDbl, r:VarDbl, valPrec=1e-6, uncPrec=1e-6):
     try:
         if (r.value() == 0):
@@ -0,0 +1,293 @@
+"""Expression-graph tracing of VarDbl formulas: a function written against
+VarDbl is called once with TraceVar arguments, which record its VarDbl
+operations and Taylor calls into a VarTrace.  The VarTrace is then replayed
+over numpy arrays of values and uncertainties with the same propagation rules
+as VarDbl.__add__()/__mul__() and Taylor.pow(), so that a formula evaluated
+over many input tuples is dispatched once per node instead of once per tuple.
+"""
+import contextlib
+import math
+import typing
+
+import numpy
+
+import moment
+from taylor import PowKernel, Taylor
+from varDbl import VarDbl
+
+
+class TraceVar (VarDbl):
+    '''
+    The placeholder of a VarDbl as the node {node} of {trace} during recording.
+    As a subclass of VarDbl, its reflected operators take precedence over the operators of VarDbl,
+        so that VarDbl constants can be on either side.
+    A TraceVar has no value, so that comparing it raises TypeError.
+    '''
+    __slots__ = ('_trace', '_node')
+
+    def __init__(self, trace:'VarTrace', node:int) -> None:
+        self._trace = trace
+        self._node = node
+
+    def __str__(self) -> str:
+        return f'TraceVar: {self._trace._sNode[self._node]}'
+
+    __repr__ = __str__
+
+    def _operand(self, other) -> int:
+        if isinstance(other, TraceVar):
+            if other._trace is not self._trace:
+                raise ValueError(f'Invalid {other} from another trace')
+            return other._node
+        return self._trace._constant(other if type(other) == VarDbl else VarDbl(value=other))
+
+    def __add__(self, other):
+        return self._trace._append(('add', self._node, self._operand(other)))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __neg__(self):
+        return self._trace._append(('neg', self._node))
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return -(self - other)
+
+    def __mul__(self, other):
+        return self._trace._append(('mul', self._node, self._operand(other)))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        if not isinstance(other, VarDbl):
+            other = VarDbl(other)
+        return self * (other ** -1)
+
+    def __rtruediv__(self, other):
+        return VarDbl(value=other) * (self ** -1)
+
+    def taylor(self, name:str, sArg:dict) -> 'TraceVar':
+        '''
+        Record the call of Taylor.{name}() with the bound arguments {sArg}.
+        '''
+        if sArg['dumpPath'] or sArg['convergence']:
+            raise ValueError(f'Invalid tracing of Taylor.{name}() with dumpPath or convergence')
+        exp = sArg.get('exp')
+        if isinstance(exp, VarDbl):
+            raise TypeError(f'Invalid tracing of Taylor.{name}() with VarDbl exponent {exp}')
+        return self._trace._append(('taylor', self._node, name, exp, sArg['moment']))
+
+    def _compare(self, other):
+        raise TypeError(f'Invalid comparison of {self} during tracing')
+
+    __eq__ = __lt__ = __gt__ = __le__ = __ge__ = _compare
+
+    def __bool__(self):
+        raise TypeError(f'Invalid truth value of {self} during tracing')
+
+
+@contextlib.contextmanager
+def tracing():
+    '''
+    Install TraceVar as Taylor.tracer within the context, and restore the previous Taylor.tracer afterwards.
+    '''
+    previous = Taylor.tracer
+    Taylor.tracer = TraceVar
+    try:
+        yield
+    finally:
+        Taylor.tracer = previous
+
+
+class VarTrace:
+    '''
+    The expression graph of {func} with {inputs} VarDbl arguments, recorded by calling {func} once with TraceVar
+        within tracing().
+    Each node is a tuple of its operation and operands, in which a node operand is the index of an earlier node:
+     *) ('input', i): the i-th argument
+     *) ('const', value): a VarDbl constant, such as a float operand converted by VarDbl
+     *) ('add', a, b), ('neg', a), ('mul', a, b): the VarDbl operations, to which "-" and "/" are reduced
+     *) ('taylor', a, name, exp, moment): Taylor.exp(), log(), sin() or pow()
+    {func} can not branch on the values of its arguments.
+
+    replay() evaluates the nodes over numpy arrays:
+     *) The VarDbl operations follow VarDbl exactly, including the rounding uncertainty of float constants.
+     *) Taylor.pow() is by PowKernel for a non-integer exponent,
+            and by the expansion of Taylor.polynominal1d() for a positive integer exponent.
+     *) Taylor.exp(), log() and sin() are called per element.
+    An element failing any node, such as an exception of Taylor or an uncommon VarDbl path,
+        is recalculated by calling {func} with VarDbl, and its result is NaN if {func} raises any exception.
+    '''
+
+    def __init__(self, func:typing.Callable[..., VarDbl], inputs:int) -> None:
+        self._func = func
+        self._inputs = inputs
+        self._sNode = []
+        with tracing():
+            ret = func(*[self._append(('input', i)) for i in range(inputs)])
+        if isinstance(ret, TraceVar):
+            if ret._trace is not self:
+                raise ValueError(f'Invalid result {ret} from another trace')
+            self._output = ret._node
+        else:
+            self._output = self._constant(VarDbl(ret))
+
+    def __len__(self) -> int:
+        return len(self._sNode)
+
+    def nodes(self) -> list[tuple]:
+        return list(self._sNode)
+
+    def _append(self, node:tuple) -> TraceVar:
+        self._sNode.append(node)
+        return TraceVar(self, len(self._sNode) - 1)
+
+    def _constant(self, value:VarDbl) -> int:
+        return self._append(('const', value))._node
+
+    def replay(self, *sInput:tuple[numpy.ndarray, numpy.ndarray]) -> tuple[numpy.ndarray, numpy.ndarray]:
+        '''
+        The values and the uncertainties of {func} for the arguments {sInput},
+            each of which is a pair of arrays of values and uncertainties, broadcast to the same shape.
+        '''
+        if len(sInput) != self._inputs:
+            raise ValueError(f'Invalid {len(sInput)} inputs for {self._inputs} arguments')
+        sArray = numpy.broadcast_arrays(*[numpy.asarray(a, dtype=float) for pair in sInput for a in pair])
+        shape = sArray[0].shape if sArray else ()
+        sArray = [a.ravel() for a in sArray]
+        count = len(sArray[0]) if sArray else 1
+        sFailed = numpy.zeros(count, dtype=bool)
+        sValue, sUncertainty = [], []
+        with numpy.errstate(all='ignore'):
+            for node in self._sNode:
+                match node:
+                    case ('input', i):
+                        value, uncertainty = sArray[2*i], numpy.abs(sArray[2*i + 1])
+                    case ('const', const):
+                        value, uncertainty = numpy.full(count, const.value()), numpy.full(count, const.uncertainty())
+                    case ('add', a, b):
+                        value, uncertainty = _add(sValue[a], sUncertainty[a], sValue[b], sUncertainty[b])
+                    case ('neg', a):
+                        value, uncertainty = -sValue[a], sUncertainty[a]
+                    case ('mul', a, b):
+                        value, uncertainty, failed = _mul(sValue[a], sUncertainty[a], sValue[b], sUncertainty[b])
+                        sFailed |= failed
+                    case ('taylor', a, name, exp, mmt):
+                        value, uncertainty, failed = _taylor(sValue[a], sUncertainty[a], name, exp, mmt, sFailed)
+                        sFailed |= failed
+                sFailed |= ~(numpy.isfinite(value) & numpy.isfinite(uncertainty))
+                sValue.append(value)
+                sUncertainty.append(uncertainty)
+        value = numpy.array(sValue[self._output], dtype=float)
+        uncertainty = numpy.array(sUncertainty[self._output], dtype=float)
+        for i in numpy.flatnonzero(sFailed):
+            try:
+                ret = self._func(*[VarDbl(sArray[2*k][i], sArray[2*k + 1][i]) for k in range(self._inputs)])
+                ret = VarDbl(ret)
+                value[i], uncertainty[i] = ret.value(), ret.uncertainty()
+            except Exception:
+                value[i], uncertainty[i] = math.nan, math.nan
+        return value.reshape(shape), uncertainty.reshape(shape)
+
+
+def _variance(sUnc) -> numpy.ndarray:
+    '''
+    VarDbl.variance() of arrays, whose float ** 2 is not always rounded the same as {sUnc} * {sUnc}
+    '''
+    return numpy.float_power(sUnc, 2)
+
+
+def _add(sA, sAUnc, sB, sBUnc) -> tuple[numpy.ndarray, numpy.ndarray]:
+    '''
+    VarDbl.__add__() of arrays
+    '''
+    return sA + sB, numpy.where(sAUnc == 0, sBUnc,
+                                numpy.where(sBUnc == 0, sAUnc, numpy.sqrt(_variance(sAUnc) + _variance(sBUnc))))
+
+
+def _mul(sA, sAUnc, sB, sBUnc) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    '''
+    VarDbl.__mul__() of arrays, failing the products of integers beyond the significand of float.
+    '''
+    sAVar, sBVar = _variance(sAUnc), _variance(sBUnc)
+    value = sA * sB
+    variance = sAVar * sB * sB + sBVar * sA * sA + sAVar * sBVar
+    failed = (variance == 0) & (numpy.abs(sA) < VarDbl.DOUBLE_MAX_SIGNIFICAND) \
+                             & (numpy.abs(sB) < VarDbl.DOUBLE_MAX_SIGNIFICAND) \
+                             & (VarDbl.DOUBLE_MAX_SIGNIFICAND <= numpy.abs(value))
+    return value, numpy.sqrt(variance), failed
+
+
+def _taylor(sX, sUnc, name:str, exp, mmt, sFailed) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    '''
+    Taylor.{name}() of arrays, with the mask of the failed elements, in which {sFailed} are skipped.
+    '''
+    if name == 'pow':
+        match exp:
+            case 0:
+                return numpy.ones_like(sX), numpy.zeros_like(sX), numpy.zeros_like(sFailed)
+            case 1:
+                return sX, sUnc, numpy.zeros_like(sFailed)
+        if (exp > 0) and ((type(exp) == int) or (math.ceil(exp) == math.floor(exp))):
+            return _intPow(sX, sUnc, int(exp), mmt)
+        return PowKernel.get(exp, mmt).powArray(sX, sUnc)
+    value, uncertainty = numpy.full_like(sX, math.nan), numpy.full_like(sX, math.nan)
+    failed = sFailed.copy()
+    func = getattr(Taylor, name)
+    for i in numpy.flatnonzero(~sFailed):
+        try:
+            ret = func(VarDbl(sX[i], sUnc[i]), moment=mmt)
+            value[i], uncertainty[i] = ret.value(), ret.uncertainty()
+        except Exception:
+            failed[i] = True
+    return value, uncertainty, failed
+
+
+def _intPow(sX, sUnc, exp:int, mmt=moment.NORMAL) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    '''
+    Taylor.pow() of arrays for a positive integer {exp},
+        as the Taylor expansion of Taylor.polynominal1d() for all the elements together order by order.
+    '''
+    sFailed = numpy.zeros(len(sX), dtype=bool)
+    if exp + 1 > (mmt.maxOrder // 2):
+        return sX, sUnc, ~sFailed
+    sBinomial = [1, exp]
+    for k in range(2, exp + 1):
+        sBinomial.append(sBinomial[-1] * (exp + 1 - k)//k)
+    sPow = [numpy.ones_like(sX), sX]
+    while len(sPow) <= exp:
+        sPow.append(sPow[-1] * sX)
+    ssTaylor = [sBinomial[k] * sPow[exp - k] for k in range(exp + 1)] + [numpy.zeros_like(sX)] * exp
+
+    value, valueUnc = ssTaylor[0], PowKernel.ulp(ssTaylor[0])
+    variance, varianceUnc = numpy.zeros_like(sX), numpy.zeros_like(sX)
+    sUncN = numpy.ones_like(sX)
+    sActive = sUnc > 0
+    for n in range(1, min(len(ssTaylor), mmt.maxOrder)):
+        sUncN = numpy.where(sActive, sUncN * sUnc, sUncN)
+        sActive &= numpy.isfinite(sUncN) & (sUncN != 0)
+        if not sActive.any():
+            break
+        sSmall = numpy.abs(sUncN) < 1
+        newValue = numpy.where(sSmall, ssTaylor[n] * (sUncN * mmt[n]), ssTaylor[n] * sUncN * mmt[n])
+        newVariance = numpy.zeros_like(sX)
+        for j in range(1, n):
+            diff = mmt[n] - mmt[j] * mmt[n - j]
+            newVariance = newVariance + numpy.where(sSmall, ssTaylor[j] * ssTaylor[n - j] * (sUncN * diff),
+                                                            ssTaylor[j] * ssTaylor[n - j] * sUncN * diff)
+        newValue, newValueUnc = _add(value, valueUnc, newValue, PowKernel.ulp(newValue))
+        value = numpy.where(sActive, newValue, value)
+        valueUnc = numpy.where(sActive, newValueUnc, valueUnc)
+        newVariance, newVarianceUnc = _add(variance, varianceUnc, newVariance, PowKernel.ulp(newVariance))
+        variance = numpy.where(sActive, newVariance, variance)
+        varianceUnc = numpy.where(sActive, newVarianceUnc, varianceUnc)
+        sFailed |= sActive & ~(numpy.isfinite(value) & numpy.isfinite(valueUnc) &
+                               numpy.isfinite(variance) & numpy.isfinite(varianceUnc))
+        sFailed |= sActive & (variance < 0)
+    sFailed |= (sUnc > 0) & Taylor._notReliable(variance, varianceUnc, mmt.bounding)
+    uncertainty = numpy.where(sUnc > 0, numpy.sqrt(variance + _variance(valueUnc)), valueUnc)
+    return value, uncertainty, sFailed